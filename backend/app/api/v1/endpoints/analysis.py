@@ -1,26 +1,30 @@
 from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.database import SessionLocal
+from app.database import get_async_db, get_db
 from app.models.analysis import AnalysisResult
+from app.models.conversation import Conversation
 from app.models.cv import CV
 from app.models.job import Job
-from app.schemas.analysis import AnalysisInitiate, AnalysisResponse
-from app.services.analysis_service import analyze_cv
+from app.models.trace import TraceSpan
+from app.schemas.analysis import (
+    AnalysisInitiate,
+    AnalysisResponse,
+    QuickScoreResponse,
+    SimilarJobResponse,
+)
+from app.schemas.trace import TraceSpanResponse
+from app.services.analysis_service import analysis_trace_id, analyze_cv
+from app.services.precompute_service import similar_job_scores, stored_quick_scores
+from app.services.quick_score_service import quick_scores
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/start", response_model=AnalysisResponse, status_code=201)
 def start_analysis(analysis_request: AnalysisInitiate, db: Session = Depends(get_db)):
     # Verify CV exists
@@ -33,47 +37,54 @@ def start_analysis(analysis_request: AnalysisInitiate, db: Session = Depends(get
     if not job_entry:
         raise HTTPException(status_code=404, detail="Job not found.")
 
-    # Check if analysis already exists
+    # The latest analysis of the pair, else the latest conversation about it
     existing_analysis = (
         db.query(AnalysisResult)
         .filter(
             AnalysisResult.cv_id == analysis_request.cv_id,
             AnalysisResult.job_id == analysis_request.job_id,
         )
+        .order_by(AnalysisResult.id.desc())
         .first()
     )
     if existing_analysis:
-        return existing_analysis
-
-    try:
-        # Perform analysis
-        analyze_cv(analysis_request.cv_id, analysis_request.job_id)  # No need to fix
-
-        # Retrieve the newly created analysis
-        analysis = (
-            db.query(AnalysisResult)
+        conversation = existing_analysis.conversation
+    else:
+        conversation = (
+            db.query(Conversation)
             .filter(
-                AnalysisResult.cv_id == analysis_request.cv_id,
-                AnalysisResult.job_id == analysis_request.job_id,
+                Conversation.job_id == analysis_request.job_id,
+                Conversation.cv_id == analysis_request.cv_id,
             )
+            .order_by(Conversation.started_at.desc())
             .first()
         )
+    if not conversation:
+        raise HTTPException(
+            status_code=404, detail="No conversation found for this CV and job."
+        )
 
-        return analysis
+    try:
+        # Returned as stored while its fingerprint matches, otherwise only the
+        # stale metrics are computed again
+        return analyze_cv(
+            analysis_request.cv_id, analysis_request.job_id, conversation, session=db
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/results/list/{cv_id}/{job_id}", response_model=List[int])
-def get_analysis_results(cv_id: int, job_id: int, db: Session = Depends(get_db)):
-    analysis_ids = [
-        result[0]
-        for result in (
-            db.query(AnalysisResult.id)
-            .filter(AnalysisResult.cv_id == cv_id, AnalysisResult.job_id == job_id)
-            .all()
+async def get_analysis_results(
+    cv_id: int, job_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    analysis_ids = (
+        await db.scalars(
+            select(AnalysisResult.id).where(
+                AnalysisResult.cv_id == cv_id, AnalysisResult.job_id == job_id
+            )
         )
-    ]
+    ).all()
 
     if not analysis_ids:
         raise HTTPException(status_code=404, detail="Analysis not found.")
@@ -81,18 +92,93 @@ def get_analysis_results(cv_id: int, job_id: int, db: Session = Depends(get_db))
 
 
 @router.get("/results/{cv_id}/{job_id}/{analysis_id}", response_model=AnalysisResponse)
-def get_analysis(
-    cv_id: int, job_id: int, analysis_id: int, db: Session = Depends(get_db)
+async def get_analysis(
+    cv_id: int, job_id: int, analysis_id: int, db: AsyncSession = Depends(get_async_db)
 ):
-    analysis = (
-        db.query(AnalysisResult)
-        .filter(
+    # Namespaced per CV/job pair, analyze_cv drops it when it writes a result
+    namespace = f"analysis:{cv_id}:{job_id}"
+    cached = response_cache.get(namespace, analysis_id)
+    if cached is not None:
+        return cached
+    analysis = await db.scalar(
+        select(AnalysisResult).where(
             AnalysisResult.cv_id == cv_id,
             AnalysisResult.job_id == job_id,
             AnalysisResult.id == analysis_id,
         )
-        .first()
     )
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found.")
-    return analysis
+    payload = AnalysisResponse.model_validate(analysis).model_dump(mode="json")
+    response_cache.set(namespace, analysis_id, payload)
+    return payload
+
+
+@router.get(
+    "/results/{cv_id}/{job_id}/{analysis_id}/trace",
+    response_model=List[TraceSpanResponse],
+)
+async def get_analysis_trace(
+    cv_id: int, job_id: int, analysis_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    analysis = (
+        await db.execute(
+            select(
+                AnalysisResult.conversation_id,
+                AnalysisResult.trace_id,
+                AnalysisResult.trace_span_id,
+            ).where(
+                AnalysisResult.cv_id == cv_id,
+                AnalysisResult.job_id == job_id,
+                AnalysisResult.id == analysis_id,
+            )
+        )
+    ).first()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found.")
+    spans = (
+        await db.scalars(
+            select(TraceSpan)
+            .where(
+                TraceSpan.trace_id
+                == (
+                    analysis.trace_id
+                    or analysis_trace_id(cv_id, job_id, analysis.conversation_id)
+                )
+            )
+            .order_by(TraceSpan.started_at, TraceSpan.id)
+        )
+    ).all()
+    if not analysis.trace_span_id:
+        return spans
+    # Inside an assistant run's trace, only the analyze_cv span and its children
+    subtree = {analysis.trace_span_id}
+    for trace_span in spans:
+        if trace_span.parent_id in subtree:
+            subtree.add(trace_span.span_id)
+    return [trace_span for trace_span in spans if trace_span.span_id in subtree]
+
+
+@router.get("/quick/{cv_id}", response_model=List[QuickScoreResponse])
+def get_quick_scores(cv_id: int, db: Session = Depends(get_db)):
+    cv_entry = db.query(CV).filter(CV.id == cv_id).first()
+    if not cv_entry:
+        raise HTTPException(status_code=404, detail="CV not found.")
+    stored = stored_quick_scores(db, cv_id)
+    if stored is not None:
+        return stored
+    try:
+        return quick_scores(db, cv_entry)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/similar/{cv_id}", response_model=List[SimilarJobResponse])
+def get_similar_jobs(cv_id: int, limit: int = 20, db: Session = Depends(get_db)):
+    cv_entry = db.query(CV).filter(CV.id == cv_id).first()
+    if not cv_entry:
+        raise HTTPException(status_code=404, detail="CV not found.")
+    try:
+        return similar_job_scores(db, cv_entry, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,21 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.database import get_db
 from app.models.assessment import Assessment
 from app.schemas.assessment import AssessmentCreate
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/submit", status_code=201)
 def submit_assessment(
     assessment_request: AssessmentCreate, db: Session = Depends(get_db)
@@ -1,31 +1,30 @@
 import json
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from sqlalchemy import true, String, cast, case
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import SessionLocal
+from sqlalchemy.orm import Session, load_only, selectinload
+from typing import List, Optional
+from app.database import get_db
 from app.models.assistant import Assistant as AssistantModel
 from app.models.tool import Tool as ToolModel
 from app.schemas.assistant import AssistantCreate, AssistantResponse
+from app.services.assistant_cache import invalidate_assistant_cache
 from app.services.openai_assistant_service import OpenAIAssistantService
 from app.core.config import settings
+from app.utils.listing import (
+    decode_cursor,
+    encode_cursor,
+    etag_response,
+    parse_fields,
+    project,
+)
 
 router = APIRouter()
 ai_service = OpenAIAssistantService()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/initiate")
 def initiate_assistant(db: Session = Depends(get_db)):
     try:
@@ -554,6 +553,7 @@ def initiate_assistant(db: Session = Depends(get_db)):
                 raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    invalidate_assistant_cache()
     return {"message": "Assistant(s) created successfully"}
 
 
@@ -579,14 +579,25 @@ def create_assistant(assistant: AssistantCreate, db: Session = Depends(get_db)):
         db.add(db_assistant)
         db.commit()
         db.refresh(db_assistant)
+        invalidate_assistant_cache()
 
         return db_assistant
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+ASSISTANT_LIST_FIELDS = ("id", "name", "instructions", "model")
+
+
 @router.get("/", response_model=List[AssistantResponse])
-def list_assistants(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def list_assistants(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     assistants = ai_service.list_assistants()
     if assistants:
         for assistant in assistants:
@@ -672,9 +683,37 @@ def list_assistants(skip: int = 0, limit: int = 100, db: Session = Depends(get_d
                 except Exception as e:
                     db.rollback()
                     raise
+        invalidate_assistant_cache()
     # Fetch and return paginated list of assistants
-    assistants = db.query(AssistantModel).offset(skip).limit(limit).all()
-    return assistants
+    selected = parse_fields(fields, ASSISTANT_LIST_FIELDS)
+    query = db.query(AssistantModel)
+    if selected:
+        query = query.options(
+            load_only(*[getattr(AssistantModel, field) for field in selected])
+        )
+    else:
+        query = query.options(selectinload(AssistantModel.tools))
+    query = query.order_by(AssistantModel.id)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, str)
+        query = query.filter(AssistantModel.id > last_id)
+    else:
+        query = query.offset(skip)
+    assistants = query.limit(limit).all()
+
+    if selected:
+        payload = [project(assistant, selected) for assistant in assistants]
+    else:
+        payload = [
+            AssistantResponse.model_validate(assistant, from_attributes=True)
+            for assistant in assistants
+        ]
+    headers = (
+        {"X-Next-Cursor": encode_cursor(assistants[-1].id)}
+        if len(assistants) == limit
+        else {}
+    )
+    return etag_response(request, payload, headers)
 
 
 @router.get("/{assistant_id}", response_model=AssistantResponse)
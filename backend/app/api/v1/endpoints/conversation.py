@@ -1,9 +1,12 @@
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from app.database import SessionLocal
+from app.database import AsyncUnitOfWork, get_async_db, get_db
 from app.models.conversation import Conversation as ConversationModel
 from app.models.cv import CV
 from app.schemas.conversation import ConversationCreate, ConversationResponse
@@ -16,15 +19,6 @@ router = APIRouter()
 ai_service = OpenAIAssistantService()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=ConversationResponse)
 def create_conversation(
     conversation: ConversationCreate, db: Session = Depends(get_db)
@@ -97,36 +91,40 @@ def add_message(
 
 
 @router.get("/{conversation_id}/messages", response_model=List[MessageResponse])
-def list_messages(conversation_id: str, db: Session = Depends(get_db)):
-    messages = ai_service.list_messages_in_thread(conversation_id)
+async def list_messages(conversation_id: str, db: AsyncSession = Depends(get_async_db)):
+    # The OpenAI client is blocking, keep it off the event loop
+    messages = await run_in_threadpool(
+        ai_service.list_messages_in_thread, conversation_id
+    )
     if messages:
-        for message in messages:
-            message_entry = (
-                db.query(Message)
-                .filter(
-                    Message.id == message.id,
+        # One primary-key lookup for the whole page instead of one per message
+        known_ids = set(
+            await db.scalars(
+                select(Message.id).where(
                     Message.conversation_id == conversation_id,
-                    Message.role == message.role,
+                    Message.id.in_([message.id for message in messages]),
                 )
-                .first()
             )
-            if not message_entry:
-                db_message = Message(
-                    id=message.id,
-                    conversation_id=conversation_id,
-                    role=message.role,
-                    content=message.content[0].text.value,
-                    timestamp=datetime.fromtimestamp(message.created_at),
-                )
-                db.add(db_message)
-                db.commit()
-                db.refresh(db_message)
+        )
+        async with AsyncUnitOfWork(db) as uow:
+            for message in messages:
+                if message.id not in known_ids:
+                    uow.add(
+                        Message(
+                            id=message.id,
+                            conversation_id=conversation_id,
+                            role=message.role,
+                            content=message.content[0].text.value,
+                            timestamp=datetime.fromtimestamp(message.created_at),
+                        )
+                    )
     messages = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation_id)
-        .order_by(Message.timestamp)
-        .all()
-    )
+        await db.scalars(
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.timestamp)
+        )
+    ).all()
     if not messages:
         raise HTTPException(
             status_code=404, detail="No messages found for this conversation"
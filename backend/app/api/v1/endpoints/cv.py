@@ -1,27 +1,29 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from app.database import get_async_db, get_db
 from app.models.cv import CV, CVVersion
 from app.schemas.cv import CVCreating, CVResponse, CVListItem
 from app.utils.file_management import save_cv_file, generate_unique_filename, UPLOAD_DIR
+from app.utils.listing import (
+    decode_cursor,
+    encode_cursor,
+    etag_response,
+    parse_fields,
+    project,
+)
 import shutil
 import os
 from app.services.cv_service import process_cv
+from app.services.precompute_service import enqueue_cv
 
 router = APIRouter()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/upload", response_model=CVResponse)
 async def upload_cv(file: UploadFile = File(...), db: Session = Depends(get_db)):
     if file.content_type != "text/x-tex" and file.content_type != "application/pdf":
@@ -58,6 +60,7 @@ async def upload_cv(file: UploadFile = File(...), db: Session = Depends(get_db))
             process_cv(cv_entry.id)  # Note: Replace job_id with appropriate logic
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+        enqueue_cv(cv_entry.id)
         return CVResponse(
             id=cv_entry.id, filename=cv_entry.filename, uploaded_at=cv_entry.uploaded_at
         )
@@ -66,7 +69,39 @@ async def upload_cv(file: UploadFile = File(...), db: Session = Depends(get_db))
         raise HTTPException(status_code=500, detail=str(e))
 
 
+CV_LIST_FIELDS = ("id", "filename", "uploaded_at")
+
+
 @router.get("/list", response_model=List[CVListItem])
-def list_cvs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    cvs = db.query(CV).order_by(CV.uploaded_at.desc()).offset(skip).limit(limit).all()
-    return cvs
+async def list_cvs(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    selected = parse_fields(fields, CV_LIST_FIELDS, required=("id", "uploaded_at"))
+    query = select(CV).options(
+        load_only(*[getattr(CV, field) for field in selected or CV_LIST_FIELDS])
+    )
+    query = query.order_by(CV.uploaded_at.desc(), CV.id.desc())
+    if cursor:
+        uploaded_at, last_id = decode_cursor(cursor, datetime, int)
+        query = query.where(
+            or_(
+                CV.uploaded_at < uploaded_at,
+                and_(CV.uploaded_at == uploaded_at, CV.id < last_id),
+            )
+        )
+    else:
+        query = query.offset(skip)
+    cvs = (await db.scalars(query.limit(limit))).all()
+
+    payload = [project(cv, selected or CV_LIST_FIELDS) for cv in cvs]
+    headers = (
+        {"X-Next-Cursor": encode_cursor(cvs[-1].uploaded_at, cvs[-1].id)}
+        if len(cvs) == limit
+        else {}
+    )
+    return etag_response(request, payload, headers)
@@ -1,32 +1,40 @@
-import json
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-
-from app.database import SessionLocal
-from app.models.assistant import Assistant
-from app.models.conversation import Conversation as ConversationModel
+from app.database import UnitOfWork, get_async_db, get_db
 from app.models.job import Job
-from app.models.message import Message
-from app.models.run import Run as RunModel
-from app.services.analysis_service import handle_run
+from app.services.job_import_service import (
+    BulkImportItem,
+    create_bulk_import,
+    get_bulk_import,
+    run_bulk_import,
+)
+from app.services.job_service import fill_job_from_url
 from app.services.openai_assistant_service import OpenAIAssistantService
-from app.schemas.job import JobCreate, JobUpdate, JobResponse
+from app.services.precompute_service import enqueue_job, forget_job, unindex_job
+from app.schemas.job import (
+    JobBulkCreate,
+    JobBulkResponse,
+    JobCreate,
+    JobUpdate,
+    JobResponse,
+)
+from app.utils.listing import (
+    decode_cursor,
+    encode_cursor,
+    etag_response,
+    parse_fields,
+    project,
+)
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 ai_service = OpenAIAssistantService()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=JobResponse, status_code=201)
 def create_job(job: JobCreate, db: Session = Depends(get_db)):
     if job.url is None:
@@ -44,9 +52,8 @@ def create_job(job: JobCreate, db: Session = Depends(get_db)):
             company=job.company,
             location=job.location,
         )
-        db.add(db_job)
-        db.commit()
-        db.refresh(db_job)
+        with UnitOfWork(db) as uow:
+            uow.add(db_job)
     else:
         db_job = Job(
             url=job.url,
@@ -56,107 +63,118 @@ def create_job(job: JobCreate, db: Session = Depends(get_db)):
             location="temp",
             title="temp",
         )
-        db.add(db_job)
-        db.commit()
-        db.refresh(db_job)
+        with UnitOfWork(db) as uow:
+            uow.add(db_job)
 
         try:
-            assistant = (
-                db.query(Assistant).filter(Assistant.name == "Job Assistant").first()
-            )
-            if not assistant:
-                raise HTTPException(status_code=404, detail="Assistant not found")
-
-            thread = ai_service.create_thread()
-
-            db_conversation = ConversationModel(
-                id=thread.id,
-                job_id=db_job.id,
-                assistant_id=assistant.id,
-            )
-            db.add(db_conversation)
-            db.commit()
-            db.refresh(db_conversation)
-
-            openai_message = ai_service.add_message_to_thread(
-                thread_id=thread.id, role="user", content="Follow your instructions."
-            )
-
-            db_message = Message(
-                id=openai_message.id,
-                conversation_id=db_conversation.id,
-                role="user",
-                content="Follow your instructions.",
-            )
-            db.add(db_message)
-            db.commit()
-            db.refresh(db_message)
-
-            run = ai_service.run_assistant_on_thread(
-                thread_id=thread.id,
-                assistant_id=str(assistant.id),
-            )
-
-            db_run = RunModel(
-                id=run.id,
-                conversation_id=db_conversation.id,
-                status=run.status,
-            )
-            db.add(db_run)
-            db.commit()
-            db.refresh(db_run)
-
-            run = handle_run(
-                run=run,
-                ai_service=ai_service,
-                db=db,
-                conversation_id=db_conversation.id,
-            )
-
-            if run.status == "completed":
-                message_result = ai_service.list_messages_in_thread(
-                    thread_id=thread.id
-                )[0]
-                job_output = json.loads(
-                    ai_service.list_messages_in_thread(thread_id=thread.id)[0]
-                    .content[0]
-                    .text.value
-                )
-
-                db_message_result = Message(
-                    id=message_result.id,
-                    conversation_id=db_conversation.id,
-                    role=message_result.role,
-                    content=message_result.content[0].text.value,
-                )
-                db.add(db_message_result)
-                db.commit()
-                db.refresh(db_message_result)
-
-                db_job.title = job_output["job_title"]
-                db_job.description = job_output["job_description"]
-                db_job.company = job_output["job_company"]
-                db_job.location = job_output["job_location"]
-
-                db.commit()
-                db.refresh(db_job)
+            fill_job_from_url(db, ai_service, db_job)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+    enqueue_job(db_job.id)
     return db_job
 
 
+@router.post("/bulk", response_model=JobBulkResponse, status_code=202)
+def create_jobs_bulk(
+    bulk_request: JobBulkCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    urls = list(dict.fromkeys(url.strip() for url in bulk_request.urls if url.strip()))
+    if not urls:
+        raise HTTPException(status_code=400, detail="At least one url is required.")
+
+    job_fields = {"status": bulk_request.status} if bulk_request.status else {}
+    db_jobs = [
+        Job(
+            url=url,
+            description="temp",
+            company="temp",
+            location="temp",
+            title="temp",
+            **job_fields,
+        )
+        for url in urls
+    ]
+    with UnitOfWork(db) as uow:
+        uow.add(*db_jobs)
+        # Flush for the ids so they need not be reloaded one by one after commit
+        db.flush()
+        items = [BulkImportItem(url=job.url, job_id=job.id) for job in db_jobs]
+
+    bulk_import = create_bulk_import(items)
+    background_tasks.add_task(run_bulk_import, bulk_import)
+    return JobBulkResponse.model_validate(bulk_import)
+
+
+@router.get("/bulk/{import_id}", response_model=JobBulkResponse)
+def get_jobs_bulk(import_id: str):
+    bulk_import = get_bulk_import(import_id)
+    if not bulk_import:
+        raise HTTPException(status_code=404, detail="Bulk import not found.")
+    return JobBulkResponse.model_validate(bulk_import)
+
+
+JOB_LIST_FIELDS = (
+    "id",
+    "title",
+    "status",
+    "description",
+    "company",
+    "location",
+    "posted_at",
+    "url",
+)
+
+
 @router.get("/", response_model=List[JobResponse])
-def read_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    jobs = db.query(Job).offset(skip).limit(limit).all()
-    return jobs
+async def read_jobs(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # `cursor` continues after the previous page (see X-Next-Cursor) and takes
+    # precedence over `skip`; `fields` returns only the listed columns.
+    selected = parse_fields(fields, JOB_LIST_FIELDS)
+    query = select(Job)
+    if selected:
+        query = query.options(load_only(*[getattr(Job, field) for field in selected]))
+    query = query.order_by(Job.id)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.where(Job.id > last_id)
+    else:
+        query = query.offset(skip)
+    jobs = (await db.scalars(query.limit(limit))).all()
+
+    if selected:
+        payload = [project(job, selected) for job in jobs]
+    else:
+        payload = [
+            JobResponse.model_validate(job, from_attributes=True) for job in jobs
+        ]
+    headers = (
+        {"X-Next-Cursor": encode_cursor(jobs[-1].id)} if len(jobs) == limit else {}
+    )
+    return etag_response(request, payload, headers)
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-def read_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(Job).filter(Job.id == job_id).first()
+async def read_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    cached = response_cache.get("job", job_id)
+    if cached is not None:
+        return cached
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found.")
-    return job
+    payload = JobResponse.model_validate(job, from_attributes=True).model_dump(
+        mode="json"
+    )
+    response_cache.set("job", job_id, payload)
+    return payload
 
 
 @router.put("/{job_id}", response_model=JobResponse)
@@ -170,6 +188,8 @@ def update_job(job_id: int, job_update: JobUpdate, db: Session = Depends(get_db)
 
     db.commit()
     db.refresh(job)
+    response_cache.invalidate("job", job_id)
+    enqueue_job(job_id)
     return job
 
 
@@ -179,5 +199,8 @@ def delete_job(job_id: int, db: Session = Depends(get_db)):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found.")
     db.delete(job)
+    forget_job(db, job_id)
     db.commit()
+    unindex_job(job_id)
+    response_cache.invalidate("job", job_id)
     return
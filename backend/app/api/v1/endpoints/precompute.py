@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.precompute import PrecomputeStatusResponse
+from app.services.precompute_service import precompute_status
+
+router = APIRouter()
+
+
+@router.get("/status", response_model=PrecomputeStatusResponse)
+def get_precompute_status(db: Session = Depends(get_db)):
+    return precompute_status(db)
@@ -2,27 +2,27 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.database import SessionLocal
+from app.database import get_db
 from app.models.profile import Profile
 from app.schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/", response_model=ProfileResponse, status_code=200)
 def get_profile(db: Session = Depends(get_db)):
+    cached = response_cache.get("profile")
+    if cached is not None:
+        return cached
     profile = db.query(Profile).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found.")
-    return profile
+    payload = ProfileResponse.model_validate(profile, from_attributes=True).model_dump(
+        mode="json"
+    )
+    response_cache.set("profile", "", payload)
+    return payload
 
 
 @router.post("/", response_model=ProfileResponse, status_code=201)
@@ -34,6 +34,7 @@ def create_profile(profile_request: ProfileCreate, db: Session = Depends(get_db)
     db.add(db_profile)
     db.commit()
     db.refresh(db_profile)
+    response_cache.invalidate("profile")
 
     return db_profile
 
@@ -50,6 +51,7 @@ def update_profile(profile_request: ProfileUpdate, db: Session = Depends(get_db)
 
     db.commit()
     db.refresh(profile)
+    response_cache.invalidate("profile")
     return profile
 
 
@@ -61,4 +63,5 @@ def delete_profile(db: Session = Depends(get_db)):
 
     db.delete(profile)
     db.commit()
+    response_cache.invalidate("profile")
     return
@@ -2,12 +2,16 @@
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import SessionLocal
+from app.database import get_async_db, get_db
 from app.models.conversation import Conversation as ConversationModel
 from app.models.run import Run as RunModel
+from app.models.trace import TraceSpan
 from app.schemas.run import RunResponse
+from app.schemas.trace import TraceSpanResponse
 from app.services.openai_assistant_service import OpenAIAssistantService
 from app.services.analysis_service import handle_run
 
@@ -15,15 +19,6 @@ router = APIRouter()
 ai_service = OpenAIAssistantService()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/{conversation_id}/run", response_model=RunResponse)
 def run_assistant(
     conversation_id: str,
@@ -75,12 +70,37 @@ def run_assistant(
 
 
 @router.get("/{conversation_id}/run/{run_id}", response_model=RunResponse)
-def get_run(conversation_id: str, run_id: str, db: Session = Depends(get_db)):
-    run = (
-        db.query(RunModel)
-        .filter(RunModel.id == run_id, RunModel.conversation_id == conversation_id)
-        .first()
+async def get_run(
+    conversation_id: str, run_id: str, db: AsyncSession = Depends(get_async_db)
+):
+    run = await db.scalar(
+        select(RunModel).where(
+            RunModel.id == run_id, RunModel.conversation_id == conversation_id
+        )
     )
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     return run
+
+
+@router.get(
+    "/{conversation_id}/run/{run_id}/trace", response_model=List[TraceSpanResponse]
+)
+async def get_run_trace(
+    conversation_id: str, run_id: str, db: AsyncSession = Depends(get_async_db)
+):
+    run = await db.scalar(
+        select(RunModel.id).where(
+            RunModel.id == run_id, RunModel.conversation_id == conversation_id
+        )
+    )
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    # Written by handle_run once the tool-call loop finishes
+    return (
+        await db.scalars(
+            select(TraceSpan)
+            .where(TraceSpan.trace_id == run_id)
+            .order_by(TraceSpan.started_at, TraceSpan.id)
+        )
+    ).all()
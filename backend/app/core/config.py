@@ -1,4 +1,6 @@
 import os
+from typing import Dict, List, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -6,6 +8,88 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     DATABASE_URL: str = "postgresql://ats_user:ats_password@db:5432/ats_applicant"
     OPEN_AI_API_KEY: str = None
+    # Derived from DATABASE_URL (asyncpg / aiosqlite) when not set
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Connection pool, ignored for SQLite
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Cached GET payloads (job, analysis, profile); set the Redis URL to share
+    # them between workers, otherwise an in-process LRU is used
+    RESPONSE_CACHE_TTL: float = 300
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+    # Bulk job import: page fetching and the Job Assistant worker pool
+    JOB_IMPORT_WORKERS: int = 4
+    JOB_FETCH_TIMEOUT: float = 20.0
+    JOB_FETCH_MAX_CONNECTIONS: int = 20
+    JOB_FETCH_PER_HOST_LIMIT: int = 2
+    # Minimum delay in seconds between two requests to the same host
+    JOB_FETCH_HOST_INTERVAL: float = 0.5
+    # Fetched job pages: revalidated after JOB_PAGE_FRESH_SECONDS, bodies
+    # beyond JOB_PAGE_MAX_BYTES are cut off
+    JOB_PAGE_CACHE_SIZE: int = 512
+    JOB_PAGE_FRESH_SECONDS: float = 600
+    JOB_PAGE_MAX_BYTES: int = 2_000_000
+    # Per-stage spans of analyses and assistant runs, stored in trace_spans;
+    # the OpenTelemetry mirror needs opentelemetry-api and a configured SDK
+    TRACING_ENABLED: bool = True
+    TRACING_OTEL_ENABLED: bool = False
+    # Standalone NLP worker (python -m app.services.nlp_worker) holding the
+    # models for every API worker; "host:port" or a Unix socket path, unset
+    # runs inference in-process. Requests are pickled, so the authkey guards
+    # code execution in the worker: no default, set a random secret in .env
+    # (python -c "import secrets; print(secrets.token_hex(32))").
+    NLP_WORKER_ADDRESS: Optional[str] = None
+    NLP_WORKER_AUTHKEY: Optional[str] = None
+    NLP_WORKER_TIMEOUT: float = 120.0
+    # Concurrent NER requests merged into one nlp.pipe call by the worker
+    NLP_WORKER_BATCH_MAX_ITEMS: int = 64
+    NLP_WORKER_BATCH_MAX_WAIT_MS: float = 5.0
+    # Background precomputation after job and CV writes: text, embeddings and
+    # entities go to document_features, the quick scores of the active CV
+    # (PRECOMPUTE_ACTIVE_CV_ID, else the latest upload) to match_scores
+    PRECOMPUTE_ON_WRITE: bool = False
+    PRECOMPUTE_WORKERS: int = 2
+    PRECOMPUTE_ACTIVE_CV_ID: Optional[int] = None
+    # Job embeddings indexed by the precompute tasks for corpus-wide search:
+    # a memory-mapped matrix ({path}.json + {path}.<n>.bin) every worker maps
+    # read-only. float16 halves the file at ~1e-3 cosine error but searches
+    # slower (no float16 BLAS); dead rows are compacted away once they exceed
+    # COMPACT_RATIO of the file.
+    JOB_EMBEDDING_MATRIX_PATH: str = "files/embeddings/jobs"
+    JOB_EMBEDDING_MATRIX_DTYPE: str = "float32"
+    JOB_EMBEDDING_MATRIX_COMPACT_RATIO: float = 0.25
+    EMBEDDING_MODEL: str = "bert-base-nli-mean-tokens"
+    # "torch" (sentence-transformers) or "onnx" (onnxruntime, CPU)
+    EMBEDDING_BACKEND: str = "torch"
+    EMBEDDING_ONNX_DIR: str = "files/models/onnx"
+    EMBEDDING_ONNX_QUANTIZE: bool = False
+    EMBEDDING_BATCH_SIZE: int = 32
+    # Micro-batching of concurrent embedding calls (in the API process or the
+    # NLP worker): wait up to MAX_WAIT_MS for up to MAX_ITEMS documents; 0
+    # disables it
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_BATCH_MAX_ITEMS: int = 64
+    # Sliding-window chunking, in words, for texts longer than the model's
+    # max sequence length (128 tokens for bert-base-nli-mean-tokens)
+    EMBEDDING_CHUNK_WORDS: int = 96
+    EMBEDDING_CHUNK_OVERLAP: int = 24
+    EMBEDDING_MAX_CHUNKS: int = 16
+    SPACY_MODEL: str = "en_core_web_sm"
+    NER_BATCH_SIZE: int = 64
+    # Worker processes for nlp.pipe; forking only pays off for large batches
+    NER_N_PROCESS: int = 1
+    NER_CACHE_SIZE: int = 1024
+    # Overrides of the registry weights, e.g. {"bert_similarity": 0.3}
+    ANALYSIS_METRIC_WEIGHTS: Dict[str, float] = {}
+    # None enables every registered metric
+    ANALYSIS_ENABLED_METRICS: Optional[List[str]] = None
+    # Skip moderate/expensive metrics once the cheap ones score below threshold
+    ANALYSIS_FAST_MODE: bool = False
+    ANALYSIS_EARLY_EXIT_THRESHOLD: float = 20.0
     INSTRUCTION: str = """Analyze CVs from a database in comparison to job descriptions, incorporating different analysis functions to enhance insights with data-driven metrics.
 
 ### Steps
@@ -0,0 +1,118 @@
+import time
+
+from fastapi import Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from app.core.tracing import SpanRecord, add_span_listener
+from app.database import pool_status
+from app.utils.cache import CACHE_REGISTRY
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests currently being served.", ["method"]
+)
+MODEL_INFERENCE = Histogram(
+    "model_inference_duration_seconds",
+    "Embedding and NER inference time, model loading excluded.",
+    ["model"],
+)
+OPENAI_CALLS = Counter(
+    "openai_requests_total", "OpenAI Assistants API calls.", ["method", "status"]
+)
+OPENAI_LATENCY = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI Assistants API call latency, polling included.",
+    ["method"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+TOOL_CALLS = Counter(
+    "assistant_tool_calls_total",
+    "Assistant tool calls handled by handle_run.",
+    ["function", "status"],
+)
+
+
+def observe_span(record: SpanRecord) -> None:
+    kind, _, name = record.name.partition(".")
+    seconds = record.duration_ms / 1000
+    if kind == "openai":
+        OPENAI_CALLS.labels(name, record.status).inc()
+        OPENAI_LATENCY.labels(name).observe(seconds)
+    elif kind == "tool":
+        TOOL_CALLS.labels(name, record.status).inc()
+    elif kind == "inference":
+        MODEL_INFERENCE.labels(name).observe(seconds)
+
+
+class StateCollector:
+    """Pool and cache figures, read from their owners at scrape time."""
+
+    def collect(self):
+        pool_gauges = {
+            name: GaugeMetricFamily(
+                f"db_pool_{name}", f"Connection pool {name}.", labels=["pool"]
+            )
+            for name in ("checked_out", "peak_checked_out", "size", "overflow")
+        }
+        pool_connects = CounterMetricFamily(
+            "db_pool_connects", "New DBAPI connections opened.", labels=["pool"]
+        )
+        for pool, status in pool_status().items():
+            for name, gauge in pool_gauges.items():
+                if name in status:
+                    gauge.add_metric([pool], status[name])
+            pool_connects.add_metric([pool], status["connects"])
+        yield from pool_gauges.values()
+        yield pool_connects
+
+        hits = CounterMetricFamily("cache_hits", "Cache hits.", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses.", labels=["cache"])
+        ratio = GaugeMetricFamily(
+            "cache_hit_ratio", "Hits over lookups since start.", labels=["cache"]
+        )
+        for name, cache in CACHE_REGISTRY.items():
+            lookups = cache.hits + cache.misses
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            ratio.add_metric([name], cache.hits / lookups if lookups else 0.0)
+        yield hits
+        yield misses
+        yield ratio
+
+
+add_span_listener(observe_span)
+REGISTRY.register(StateCollector())
+
+
+async def track_requests(request: Request, call_next) -> Response:
+    method = request.method
+    REQUESTS_IN_PROGRESS.labels(method).inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_PROGRESS.labels(method).dec()
+        # The route template keeps the label set bounded (/jobs/{job_id})
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(
+            method, route.path if route else "unmatched", str(status)
+        ).observe(time.perf_counter() - started)
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
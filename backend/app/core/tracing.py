@@ -0,0 +1,170 @@
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+from app.database import session_scope
+from app.models.trace import TraceSpan
+
+
+@dataclass
+class SpanRecord:
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    started_at: datetime
+    duration_ms: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    spans: List[SpanRecord] = field(default_factory=list)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[SpanRecord]] = ContextVar("span", default=None)
+
+# Called with every finished span, traced or not (see app.core.metrics)
+SPAN_LISTENERS: List[Callable[[SpanRecord], None]] = []
+
+
+def add_span_listener(listener: Callable[[SpanRecord], None]) -> None:
+    SPAN_LISTENERS.append(listener)
+
+
+@lru_cache(maxsize=None)
+def _otel_tracer():
+    if not settings.TRACING_OTEL_ENABLED:
+        return None
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError:
+        print("TRACING_OTEL_ENABLED is set but opentelemetry is not installed")
+        return None
+    return otel_trace.get_tracer("ats")
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in attributes.items()
+        if isinstance(value, (str, bool, int, float))
+    }
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_span() -> Optional[SpanRecord]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[SpanRecord]:
+    """Time a block as a child of the current span.
+
+    Outside of a trace the span is only mirrored to OpenTelemetry (when
+    enabled), so instrumented code costs next to nothing on other paths.
+    """
+    parent = _current_span.get()
+    record = SpanRecord(
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        started_at=datetime.utcnow(),
+        attributes=attributes,
+    )
+    tracer = _otel_tracer()
+    otel_span = (
+        tracer.start_as_current_span(name, attributes=_otel_attributes(attributes))
+        if tracer
+        else nullcontext()
+    )
+    token = _current_span.set(record)
+    started = time.perf_counter()
+    try:
+        with otel_span:
+            yield record
+    except BaseException as e:
+        record.status = "error"
+        record.error = f"{type(e).__name__}: {e}"[:500]
+        raise
+    finally:
+        record.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        _current_span.reset(token)
+        for listener in SPAN_LISTENERS:
+            listener(record)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.spans.append(record)
+
+
+def traced(name: str):
+    """Decorator form of :func:`span`."""
+
+    def decorator(func: Callable):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def start_trace(trace_id: str, name: str, **attributes: Any) -> Iterator[Trace]:
+    """Collect every span opened inside the block and persist them on exit.
+
+    Nested calls (an analysis started from an assistant run) join the outer
+    trace instead of starting their own.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        with span(name, **attributes):
+            yield trace
+        return
+
+    trace = Trace(trace_id=trace_id)
+    token = _current_trace.set(trace)
+    try:
+        with span(name, **attributes):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        if settings.TRACING_ENABLED:
+            save_trace(trace)
+
+
+def save_trace(trace: Trace) -> None:
+    # Own session: the traced code may have rolled its session back
+    try:
+        with session_scope() as db:
+            db.add_all(
+                TraceSpan(
+                    trace_id=trace.trace_id,
+                    span_id=record.span_id,
+                    parent_id=record.parent_id,
+                    name=record.name,
+                    started_at=record.started_at,
+                    duration_ms=record.duration_ms,
+                    status=record.status,
+                    error=record.error,
+                    attributes=record.attributes or None,
+                )
+                for record in trace.spans
+            )
+            db.commit()
+    except Exception as e:
+        print(f"Could not save trace {trace.trace_id}: {e}")
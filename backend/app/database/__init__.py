@@ -1,12 +1,11 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=(
-        {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-    ),
+from app.database.session import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_engine,
+    engine,
+    get_async_db,
+    get_db,
+    pool_status,
+    session_scope,
 )
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.database.unit_of_work import AsyncUnitOfWork, UnitOfWork
@@ -0,0 +1,119 @@
+import threading
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Iterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver of ``url`` for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return parsed.set(
+        drivername=f"{backend}+{ASYNC_DRIVERS[backend]}"
+    ).render_as_string(hide_password=False)
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    if "sqlite" in url:
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(
+    settings.DATABASE_URL
+)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True)
+)
+
+# Objects stay usable after commit, attribute access must not trigger lazy IO
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+_pool_counters: Dict[str, Dict[str, int]] = {}
+_pools: Dict[str, Engine] = {}
+_pool_lock = threading.Lock()
+
+
+def _track_pool(name: str, target: Engine) -> None:
+    counters = {"connects": 0, "checkouts": 0, "checkins": 0, "peak_checked_out": 0}
+    _pool_counters[name] = counters
+    _pools[name] = target
+
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        with _pool_lock:
+            counters["connects"] += 1
+
+    @event.listens_for(target, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with _pool_lock:
+            counters["checkouts"] += 1
+            checked_out = counters["checkouts"] - counters["checkins"]
+            if checked_out > counters["peak_checked_out"]:
+                counters["peak_checked_out"] = checked_out
+
+    @event.listens_for(target, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        with _pool_lock:
+            counters["checkins"] += 1
+
+
+_track_pool("sync", engine)
+_track_pool("async", async_engine.sync_engine)
+
+
+def pool_status() -> Dict[str, Dict[str, int]]:
+    statuses = {}
+    for name, target in _pools.items():
+        with _pool_lock:
+            status = dict(_pool_counters[name])
+        status["checked_out"] = status["checkouts"] - status["checkins"]
+        # Only QueuePool (the non-SQLite default) reports size and overflow
+        for attribute in ("size", "overflow", "checkedin"):
+            if hasattr(target.pool, attribute):
+                status[attribute] = getattr(target.pool, attribute)()
+        statuses[name] = status
+    return statuses
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# Dependency to get DB session
+def get_db() -> Iterator[Session]:
+    with session_scope() as db:
+        yield db
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,66 @@
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class UnitOfWork:
+    """Collect writes for one logical step and commit them together.
+
+    Rows added here are built from values we already hold (OpenAI ids,
+    timestamps), so they are not refreshed after the commit.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.pending: List[object] = []
+
+    def add(self, *instances) -> None:
+        self.session.add_all(instances)
+        self.pending.extend(instances)
+
+    def commit(self) -> None:
+        if self.pending or self.session.dirty:
+            self.session.commit()
+        self.pending.clear()
+
+    def rollback(self) -> None:
+        self.session.rollback()
+        self.pending.clear()
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+class AsyncUnitOfWork:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.pending: List[object] = []
+
+    def add(self, *instances) -> None:
+        self.session.add_all(instances)
+        self.pending.extend(instances)
+
+    async def commit(self) -> None:
+        if self.pending or self.session.dirty:
+            await self.session.commit()
+        self.pending.clear()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+        self.pending.clear()
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
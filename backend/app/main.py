@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.v1.endpoints import (
     cv,
@@ -8,16 +10,35 @@ from app.api.v1.endpoints import (
     run,
     assessment,
     profile,
+    precompute,
 )
 from app.core.config import settings
+from app.core.metrics import metrics_response, track_requests
+from app.database import pool_status, session_scope
+from app.services.assistant_cache import warm_assistant_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with session_scope() as db:
+        try:
+            warm_assistant_cache(db)
+        except Exception as e:
+            # Tables may not exist yet on a fresh database, lookups fall back to it
+            print(f"Could not warm assistant cache: {e}")
+    yield
+
 
 app = FastAPI(
     title="Applicant Tracking System for Applicants",
     description="A personalized ATS to help applicants optimize their job applications.",
     version="1.0.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
+app.middleware("http")(track_requests)
+
 # Include API routers
 app.include_router(cv.router, prefix=f"{settings.API_V1_STR}/cv", tags=["CV"])
 app.include_router(jobs.router, prefix=f"{settings.API_V1_STR}/jobs", tags=["Jobs"])
@@ -39,8 +60,23 @@ app.include_router(
 app.include_router(
     profile.router, prefix=f"{settings.API_V1_STR}/profiles", tags=["Profiles"]
 )
+app.include_router(
+    precompute.router,
+    prefix=f"{settings.API_V1_STR}/precompute",
+    tags=["Precompute"],
+)
 
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the ATS for Applicants"}
+
+
+@app.get("/health/db")
+def database_health():
+    return {"pool": pool_status()}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
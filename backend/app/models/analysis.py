@@ -1,10 +1,26 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float, String
+from sqlalchemy import (
+    Column,
+    Integer,
+    ForeignKey,
+    Float,
+    String,
+    JSON,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        UniqueConstraint(
+            "cv_id",
+            "job_id",
+            "conversation_id",
+            name="uq_analysis_results_cv_job_conversation",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cv_id = Column(Integer, ForeignKey("cvs.id"), nullable=False)
@@ -17,6 +33,17 @@ class AnalysisResult(Base):
     ner_similarity_score = Column(Float, default=0.0)
     lsa_analysis_score = Column(Float, default=0.0)
     aggregated_score = Column(Float, default=0.0)
+    metric_timings = Column(JSON, nullable=True)  # metric name -> ms, None if skipped
+    # Metric versions, models, weights and both documents' hashes; the result
+    # is reused only while it matches (see metric_registry.analysis_fingerprint);
+    # with metrics skipped by the fast mode, also the fast-mode settings
+    fingerprint = Column(String, nullable=True)
+    metric_fingerprints = Column(JSON, nullable=True)  # metric name -> fingerprint
+    keywords = Column(JSON, nullable=True)  # None for the default keywords
+    # Where the spans of the last computation are stored: its own trace, or the
+    # assistant run it was part of with trace_span_id as the analyze_cv span
+    trace_id = Column(String, nullable=True)
+    trace_span_id = Column(String, nullable=True)
 
     cv = relationship("CV", back_populates="analysis_results")
     job = relationship("Job", back_populates="analysis_results")
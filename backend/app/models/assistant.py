@@ -7,7 +7,7 @@ class Assistant(Base):
     __tablename__ = "assistants"
 
     id = Column(String, primary_key=True, index=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, index=True)
     instructions = Column(String, nullable=False)
     model = Column(String, nullable=False)
 
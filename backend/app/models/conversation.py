@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 from datetime import datetime
@@ -6,6 +6,7 @@ from datetime import datetime
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (Index("ix_conversations_job_id_cv_id", "job_id", "cv_id"),)
 
     id = Column(String, primary_key=True, index=True)
     cv_id = Column(Integer, ForeignKey("cvs.id"), nullable=True)
@@ -14,6 +14,8 @@ class Job(Base):
     company = Column(String, nullable=False)
     location = Column(String, nullable=True)
     posted_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped on every write, keys the cached TF-IDF corpus of all jobs
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     url = Column(String, nullable=True)
 
     analysis_results = relationship("AnalysisResult", back_populates="job")
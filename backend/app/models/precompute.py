@@ -0,0 +1,53 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    Float,
+    JSON,
+    UniqueConstraint,
+)
+from app.models.base import Base
+from datetime import datetime
+
+
+class DocumentFeatures(Base):
+    __tablename__ = "document_features"
+    __table_args__ = (
+        UniqueConstraint("kind", "document_id", name="uq_document_features_kind_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # 'cv' or 'job'
+    document_id = Column(Integer, nullable=False)
+    # SHA-1 of the job description or of the CV source file
+    content_hash = Column(String, nullable=False)
+    text = Column(Text, nullable=False)
+    embedding = Column(JSON, nullable=True)
+    entities = Column(JSON, nullable=True)
+    # Artifact name -> model the embedding / entities were computed with
+    models = Column(JSON, nullable=True)
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class MatchScore(Base):
+    __tablename__ = "match_scores"
+    __table_args__ = (
+        UniqueConstraint("cv_id", "job_id", name="uq_match_scores_cv_job"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    cv_id = Column(Integer, nullable=False, index=True)
+    job_id = Column(Integer, nullable=False)
+    keyword_match_score = Column(Float, default=0.0)
+    jaccard_similarity_score = Column(Float, default=0.0)
+    tfidf_cosine_score = Column(Float, default=0.0)
+    quick_score = Column(Float, default=0.0)
+    # None until both documents have embeddings / entities
+    bert_similarity_score = Column(Float, nullable=True)
+    ner_similarity_score = Column(Float, nullable=True)
+    # quick_score_service.corpus_version() of the jobs the row was scored
+    # against; every TF-IDF cosine moves with the corpus
+    corpus_version = Column(String, nullable=True)
+    computed_at = Column(DateTime, default=datetime.utcnow)
@@ -8,7 +8,9 @@ class Run(Base):
     __tablename__ = "runs"
 
     id = Column(String, primary_key=True, index=True)  # Using Run ID from OpenAI
-    conversation_id = Column(String, ForeignKey("conversations.id"), nullable=False)
+    conversation_id = Column(
+        String, ForeignKey("conversations.id"), nullable=False, index=True
+    )
     status = Column(String, nullable=False)  # e.g., 'pending', 'completed', 'failed'
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
@@ -7,7 +7,9 @@ class Tool(Base):
     __tablename__ = "tools"
 
     id = Column(String, primary_key=True, index=True)
-    assistant_id = Column(String, ForeignKey("assistants.id"), nullable=False)
+    assistant_id = Column(
+        String, ForeignKey("assistants.id"), nullable=False, index=True
+    )
     type = Column(String, nullable=False)  # e.g., 'function', 'code_interpreter'
     function_definition = Column(JSON, nullable=True)  # For function type tools
 
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON
+from app.models.base import Base
+from datetime import datetime
+
+
+class TraceSpan(Base):
+    __tablename__ = "trace_spans"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Run ID for assistant runs, "analysis:<cv>:<job>:<conversation>" for analyses
+    trace_id = Column(String, nullable=False, index=True)
+    span_id = Column(String, nullable=False)
+    parent_id = Column(String, nullable=True)
+    name = Column(String, nullable=False)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    duration_ms = Column(Float, nullable=False)
+    status = Column(String, nullable=False)  # 'ok' or 'error'
+    error = Column(String, nullable=True)
+    attributes = Column(JSON, nullable=True)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Dict, Optional
 
 
 class AnalysisInitiate(BaseModel):
@@ -19,7 +20,29 @@ class AnalysisResponse(BaseModel):
     ner_similarity_score: float
     lsa_analysis_score: float
     aggregated_score: float
+    metric_timings: Optional[Dict[str, Optional[float]]] = None
+    fingerprint: Optional[str] = None
 
     class Config:
         orm_mode = True
         from_attributes = True
+
+
+class QuickScoreResponse(BaseModel):
+    job_id: int
+    title: str
+    company: str
+    keyword_match_score: float
+    jaccard_similarity_score: float
+    tfidf_cosine_score: float
+    quick_score: float
+    # Only in precomputed scores, see PRECOMPUTE_ON_WRITE
+    bert_similarity_score: Optional[float] = None
+    ner_similarity_score: Optional[float] = None
+
+
+class SimilarJobResponse(BaseModel):
+    job_id: int
+    title: str
+    company: str
+    bert_similarity_score: float
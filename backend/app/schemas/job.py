@@ -1,6 +1,6 @@
 from pydantic import BaseModel, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class JobBase(BaseModel):
@@ -41,3 +41,29 @@ class JobResponse(JobBase):
 
     class Config:
         orm_mode = True
+
+
+class JobBulkCreate(BaseModel):
+    urls: List[str]
+    status: Optional[str] = None
+
+
+class JobBulkItem(BaseModel):
+    url: str
+    job_id: int
+    status: str
+    source: Optional[str] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobBulkResponse(BaseModel):
+    id: str
+    created_at: datetime
+    done: bool
+    items: List[JobBulkItem]
+
+    class Config:
+        from_attributes = True
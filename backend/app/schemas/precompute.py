@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class PrecomputeTaskResponse(BaseModel):
+    kind: str
+    target_id: int
+    status: str
+    enqueued_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PrecomputeStatusResponse(BaseModel):
+    enabled: bool
+    workers: int
+    active_cv_id: Optional[int] = None
+    queued: List[PrecomputeTaskResponse]
+    running: List[PrecomputeTaskResponse]
+    completed: int
+    failed: int
+    recent_failures: List[PrecomputeTaskResponse]
+    cv_features: int
+    job_features: int
+    match_scores: int
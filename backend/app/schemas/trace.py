@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class TraceSpanResponse(BaseModel):
+    span_id: str
+    parent_id: Optional[str] = None
+    name: str
+    started_at: datetime
+    duration_ms: float
+    status: str
+    error: Optional[str] = None
+    attributes: Optional[Dict[str, Any]] = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
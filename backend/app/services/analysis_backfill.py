@@ -0,0 +1,352 @@
+"""Recompute every stored analysis, e.g. after changing metric weights or models.
+
+Run from ``backend/``::
+
+    python -m app.services.analysis_backfill --workers 4 --chunk-size 200
+
+Analysis rows are streamed in id order through a server-side cursor, one
+chunk at a time. Rows whose fingerprint still matches the current metrics,
+models, weights and documents are skipped, the others keep the scores of
+their fresh metrics. Each chunk is scored in a process pool: the distinct
+texts of the chunk are embedded and NER-tagged in one batch, then the stale
+metrics run with those artifacts. Results are written back with one bulk
+upsert per chunk. The id of the last written row goes to ``--checkpoint``
+after every chunk, so an interrupted or failed run continues where it
+stopped; the file is removed once the run completes.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.database import session_scope
+
+# Every model, so the mappers' string relationships resolve (see
+# migrations/env.py)
+from app.models import (  # noqa: F401
+    analysis,
+    assessment,
+    assistant,
+    conversation,
+    cv,
+    job,
+    message,
+    precompute,
+    profile,
+    run,
+    tool,
+    trace,
+)
+from app.models.analysis import AnalysisResult
+from app.models.cv import CV
+from app.models.job import Job
+from app.services.analysis_service import (
+    analysis_is_fresh,
+    analysis_values,
+    extract_cv_text,
+    reusable_scores,
+)
+from app.services.document_features import cv_hash, text_hash
+from app.services.metric_registry import (
+    AnalysisContext,
+    MetricRun,
+    enabled_metrics,
+    metric_fingerprints,
+    run_metrics,
+)
+from app.utils.response_cache import response_cache
+
+# (analysis id, cv text, job description, keywords, reused scores)
+ScoringItem = Tuple[int, str, str, Optional[List[str]], Dict[str, float]]
+
+UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def _init_worker() -> None:
+    # Registers the metrics and artifacts in the spawned process; unpickling
+    # this function already imported the module and with it every model
+    import app.services.analysis_service  # noqa: F401
+
+
+def score_chunk(items: List[ScoringItem]) -> List[Tuple[int, MetricRun]]:
+    from app.services import nlp_client
+
+    # Texts whose analyses still need each artifact, the reused metrics
+    # need none
+    texts: Dict[str, Dict[str, None]] = {"embeddings": {}, "entities": {}}
+    for _, cv_text, job_description, _, reuse in items:
+        for spec in enabled_metrics():
+            for name in set(spec.needs) & set(texts):
+                if spec.name not in reuse:
+                    texts[name].update({cv_text: None, job_description: None})
+
+    # One forward pass / nlp.pipe call for the whole chunk instead of two
+    # documents per analysis
+    embeddings = (
+        dict(
+            zip(
+                texts["embeddings"],
+                nlp_client.encode_documents(list(texts["embeddings"])),
+            )
+        )
+        if texts["embeddings"]
+        else {}
+    )
+    entities = (
+        dict(
+            zip(texts["entities"], nlp_client.extract_entities(list(texts["entities"])))
+        )
+        if texts["entities"]
+        else {}
+    )
+
+    results = []
+    for analysis_id, cv_text, job_description, keywords, reuse in items:
+        artifacts = {}
+        if cv_text in embeddings and job_description in embeddings:
+            artifacts["embeddings"] = [embeddings[cv_text], embeddings[job_description]]
+        if cv_text in entities and job_description in entities:
+            artifacts["entities"] = (entities[cv_text], entities[job_description])
+        context = AnalysisContext(cv_text, job_description, keywords, artifacts)
+        results.append((analysis_id, run_metrics(context, reuse=reuse)))
+    return results
+
+
+def upsert_results(db: Session, rows: List[Dict]) -> None:
+    """Write scored rows in one statement, keyed on the analysis id."""
+    dialect = db.get_bind().dialect.name
+    statement = UPSERT_INSERTS[dialect](AnalysisResult).values(rows)
+    updated = {
+        column: statement.excluded[column]
+        for column in rows[0]
+        if column not in ("id", "cv_id", "job_id", "conversation_id")
+    }
+    db.execute(statement.on_conflict_do_update(index_elements=["id"], set_=updated))
+    db.commit()
+
+
+def read_checkpoint(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return json.load(f)["last_id"]
+
+
+def write_checkpoint(path: str, last_id: int, processed: int) -> None:
+    # Replaced atomically, an interrupted write leaves the previous one
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({"last_id": last_id, "processed": processed}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+class Backfill:
+    def __init__(
+        self,
+        chunk_size: int,
+        workers: int,
+        checkpoint: str,
+        cv_id: Optional[int] = None,
+        job_id: Optional[int] = None,
+    ):
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.cv_id = cv_id
+        self.job_id = job_id
+        self.cv_hashes: Dict[int, str] = {}
+        self.cv_texts: Dict[int, str] = {}
+        self.processed = 0
+        self.fresh = 0
+        self.failed = 0
+        self.failures: Deque[Dict] = deque(maxlen=20)
+
+    def _filters(self, after_id: int) -> list:
+        filters = [AnalysisResult.id > after_id]
+        if self.cv_id is not None:
+            filters.append(AnalysisResult.cv_id == self.cv_id)
+        if self.job_id is not None:
+            filters.append(AnalysisResult.job_id == self.job_id)
+        return filters
+
+    def _cv_hash(self, db: Session, cv_id: int) -> str:
+        if cv_id not in self.cv_hashes:
+            self.cv_hashes[cv_id] = cv_hash(db.get(CV, cv_id))
+        return self.cv_hashes[cv_id]
+
+    def _cv_text(self, db: Session, cv_id: int) -> str:
+        if cv_id not in self.cv_texts:
+            self.cv_texts[cv_id] = extract_cv_text(db.get(CV, cv_id))
+        return self.cv_texts[cv_id]
+
+    def _prepare(self, db: Session, rows: list) -> Tuple[List[ScoringItem], Dict]:
+        descriptions = dict(
+            db.execute(
+                select(Job.id, Job.description).where(
+                    Job.id.in_({row.job_id for row in rows})
+                )
+            ).all()
+        )
+        items = []
+        stale = {}
+        for row in rows:
+            try:
+                if row.job_id not in descriptions:
+                    raise LookupError(f"job {row.job_id} no longer exists")
+                job_description = str(descriptions[row.job_id])
+                fingerprints = metric_fingerprints(
+                    self._cv_hash(db, row.cv_id),
+                    text_hash(job_description),
+                    row.keywords,
+                )
+                if analysis_is_fresh(row, fingerprints):
+                    self.fresh += 1
+                    continue
+                reuse = reusable_scores(row, fingerprints)
+                # Only a change of weights needs no text at all
+                cv_text = (
+                    ""
+                    if len(reuse) == len(fingerprints)
+                    else self._cv_text(db, row.cv_id)
+                )
+            except Exception as e:
+                self.failed += 1
+                self.failures.append({"analysis_id": row.id, "error": str(e)})
+                continue
+            items.append((row.id, cv_text, job_description, row.keywords, reuse))
+            stale[row.id] = (row, fingerprints)
+        return items, stale
+
+    def _write(
+        self, db: Session, results: List[Tuple[int, MetricRun]], stale: Dict
+    ) -> None:
+        if not results:
+            return
+        rows = []
+        for analysis_id, metric_run in results:
+            row, fingerprints = stale[analysis_id]
+            rows.append(
+                {
+                    "id": analysis_id,
+                    "cv_id": row.cv_id,
+                    "job_id": row.job_id,
+                    "conversation_id": row.conversation_id,
+                    **analysis_values(metric_run, fingerprints, row.keywords, row),
+                }
+            )
+        upsert_results(db, rows)
+        for cv_id, job_id in {(row["cv_id"], row["job_id"]) for row in rows}:
+            response_cache.invalidate(f"analysis:{cv_id}:{job_id}")
+
+    def run(self, start_after: int = 0) -> Dict:
+        started = time.perf_counter()
+        pending: Deque[Tuple[Future, Dict, int]] = deque()
+        context = multiprocessing.get_context("spawn")
+
+        with session_scope() as reader, session_scope() as writer:
+            total = reader.scalar(
+                select(func.count(AnalysisResult.id)).where(*self._filters(start_after))
+            )
+            print(f"{total} analyses to check")
+            # Plain rows rather than entities, nothing piles up in the session
+            query = (
+                select(*AnalysisResult.__table__.columns)
+                .where(*self._filters(start_after))
+                .order_by(AnalysisResult.id)
+                .execution_options(yield_per=self.chunk_size)
+            )
+
+            def drain(limit: int) -> None:
+                # Chunks are written in submission order, so the checkpoint
+                # never skips over an unfinished chunk
+                while len(pending) > limit:
+                    future, stale, last_id = pending.popleft()
+                    results = future.result()
+                    self._write(writer, results, stale)
+                    self.processed += len(results)
+                    write_checkpoint(self.checkpoint, last_id, self.processed)
+                    checked = self.processed + self.fresh + self.failed
+                    elapsed = time.perf_counter() - started
+                    rate = checked / elapsed if elapsed else 0.0
+                    print(
+                        f"{checked}/{total} analyses ({self.processed} recomputed, "
+                        f"{self.fresh} fresh, {self.failed} failed), {rate:.1f}/s, "
+                        f"last id {last_id}"
+                    )
+
+            with ProcessPoolExecutor(
+                self.workers, mp_context=context, initializer=_init_worker
+            ) as pool:
+                try:
+                    for partition in reader.execute(query).partitions():
+                        items, stale = self._prepare(reader, partition)
+                        pending.append(
+                            (pool.submit(score_chunk, items), stale, partition[-1].id)
+                        )
+                        # Keep every worker busy without reading ahead unboundedly
+                        drain(2 * self.workers)
+                    drain(0)
+                except BaseException:
+                    # The checkpoint stays at the last written chunk
+                    pool.shutdown(cancel_futures=True)
+                    raise
+
+        elapsed = time.perf_counter() - started
+        return {
+            "processed": self.processed,
+            "fresh": self.fresh,
+            "failed": self.failed,
+            # The latest ones, the count above has them all
+            "failures": list(self.failures),
+            "seconds": round(elapsed, 2),
+            "analyses_per_s": round(self.processed / elapsed, 2) if elapsed else 0.0,
+            "workers": self.workers,
+            "chunk_size": self.chunk_size,
+            "metrics": [spec.name for spec in enabled_metrics()],
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", default="analysis_backfill.checkpoint.json")
+    parser.add_argument(
+        "--restart", action="store_true", help="ignore an existing checkpoint"
+    )
+    parser.add_argument("--cv-id", type=int)
+    parser.add_argument("--job-id", type=int)
+    args = parser.parse_args()
+
+    start_after = 0 if args.restart else read_checkpoint(args.checkpoint)
+    if start_after:
+        print(f"Resuming after analysis {start_after} ({args.checkpoint})")
+    backfill = Backfill(
+        args.chunk_size, args.workers, args.checkpoint, args.cv_id, args.job_id
+    )
+    try:
+        summary = backfill.run(start_after)
+    except Exception as e:
+        print(
+            f"Backfill stopped: {e}; run again to resume after analysis "
+            f"{read_checkpoint(args.checkpoint)}"
+        )
+        return 1
+    if os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    print(json.dumps(summary, indent=2))
+    return 1 if backfill.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,119 +1,138 @@
 import json
-import requests
 from datetime import datetime
 
-import spacy
-from bs4 import BeautifulSoup
-from openai.types.beta.threads import Run
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.decomposition import TruncatedSVD
-from sklearn.feature_extraction.text import TfidfVectorizer
-from scipy.spatial.distance import jaccard
-import numpy as np
-import textract
 import os
+from app.core.config import settings
+from app.core.tracing import current_span, span, start_trace, traced
 from app.models.analysis import AnalysisResult
-from app.database import SessionLocal
+from app.database import UnitOfWork, session_scope
 from app.models.cv import CV
 from app.models.job import Job
-from app.models.assistant import Assistant as AssistantModel
 from app.models.conversation import Conversation as ConversationModel
 from app.models.message import Message
 from app.models.profile import Profile
 from app.models.run import Run as RunModel
 from app.schemas.analysis import AnalysisResponse as AnalysisResponseSchema
 from sqlalchemy.orm import Session
-from typing import Tuple, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Tuple, List, Optional
 
+from app.services.assistant_cache import get_assistant_id
 from app.services.cv_service import compile_latex
+from app.services.document_features import (
+    cv_hash,
+    feature_artifacts,
+    get_features,
+    job_hash,
+)
+from app.services.metric_registry import (
+    METRIC_REGISTRY,
+    AnalysisContext,
+    MetricCost,
+    MetricRun,
+    analysis_fingerprint,
+    enabled_metrics,
+    metric_fingerprints,
+    register_artifact,
+    register_metric,
+    run_metrics,
+)
+from app.services import nlp_client
+from app.services.embedding_service import embedding_model_id
 from app.services.openai_assistant_service import OpenAIAssistantService
+from app.services.job_extraction import format_job_posting
+from app.services.page_fetcher import fetch_page
+from app.utils.cache import LRUCache
 from app.utils.file_management import PDF_DIR
+from app.utils.response_cache import response_cache
 
+# Annotations only: sklearn, textract, openai and the models behind embeddings
+# and entities are imported on first use, API workers that never analyse a CV
+# start without them
+if TYPE_CHECKING:
+    import numpy as np
+    from openai.types.beta.threads import Run
 
+cv_text_cache = LRUCache(maxsize=64, name="cv_text")
+
+
+@traced("pre_process")
 def pre_process(
     text: str, ai_service: OpenAIAssistantService, db: Session, cv_id: int, job_id: int
 ) -> str:
-    pre_process_assistant = (
-        db.query(AssistantModel)
-        .filter(AssistantModel.name == "Preprocess Assistant")
-        .first()
-    )
+    pre_process_assistant_id = get_assistant_id(db, "Preprocess Assistant")
+    if not pre_process_assistant_id:
+        raise Exception("Preprocess Assistant not found.")
     pre_process_assistant_thread = ai_service.create_thread()
-    db_conversation = ConversationModel(
-        id=pre_process_assistant_thread.id,
-        cv_id=cv_id,
-        job_id=job_id,
-        assistant_id=pre_process_assistant.id,
-    )
-    db.add(db_conversation)
-    db.commit()
-    db.refresh(db_conversation)
     message = ai_service.add_message_to_thread(
         thread_id=pre_process_assistant_thread.id,
         role="user",
         content=text,
     )
-    db_message = Message(
-        id=message.id,
-        conversation_id=db_conversation.id,
-        role=message.role,
-        content=message.content[0].text.value,
-        timestamp=datetime.fromtimestamp(message.created_at),
-    )
-    db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
+    # Committed before the run, so the thread stays on record if it fails
+    with UnitOfWork(db) as uow:
+        uow.add(
+            ConversationModel(
+                id=pre_process_assistant_thread.id,
+                cv_id=cv_id,
+                job_id=job_id,
+                assistant_id=pre_process_assistant_id,
+            ),
+            Message(
+                id=message.id,
+                conversation_id=pre_process_assistant_thread.id,
+                role=message.role,
+                content=message.content[0].text.value,
+                timestamp=datetime.fromtimestamp(message.created_at),
+            ),
+        )
+
     pre_process_assistant_run = ai_service.run_assistant_on_thread(
         thread_id=pre_process_assistant_thread.id,
-        assistant_id=pre_process_assistant.id,
-    )
-    db_run = RunModel(
-        id=pre_process_assistant_run.id,
-        conversation_id=db_conversation.id,
-        status=pre_process_assistant_run.status,
-        updated_at=datetime.now(),
+        assistant_id=pre_process_assistant_id,
     )
-    db.add(db_run)
-    db.commit()
-    db.refresh(db_run)
+    message_result = None
     if pre_process_assistant_run.status == "completed":
         message_result = ai_service.list_messages_in_thread(
             thread_id=pre_process_assistant_thread.id
         )[0]
-
-        text = json.loads(
-            ai_service.list_messages_in_thread(
-                thread_id=pre_process_assistant_thread.id,
-            )[0]
-            .content[0]
-            .text.value
-        ).get("value")
-
-        db_message_result = Message(
-            id=message_result.id,
-            conversation_id=db_conversation.id,
-            role=message_result.role,
-            content=text,
-            timestamp=datetime.fromtimestamp(message_result.created_at),
+        text = json.loads(message_result.content[0].text.value).get("value")
+
+    # The run and its reply are committed together
+    with UnitOfWork(db) as uow:
+        uow.add(
+            RunModel(
+                id=pre_process_assistant_run.id,
+                conversation_id=pre_process_assistant_thread.id,
+                status=pre_process_assistant_run.status,
+                updated_at=datetime.now(),
+            )
         )
-        db.add(db_message_result)
-        db.commit()
-        db.refresh(db_message_result)
+        if message_result is not None:
+            uow.add(
+                Message(
+                    id=message_result.id,
+                    conversation_id=pre_process_assistant_thread.id,
+                    role=message_result.role,
+                    content=text,
+                    timestamp=datetime.fromtimestamp(message_result.created_at),
+                )
+            )
 
     return text
 
 
 def handle_run(
-    run: Run,
+    run: "Run",
     ai_service: OpenAIAssistantService,
     db: Session,
     conversation_id: str,
 ):
     current_run = run
 
-    while current_run.status == "requires_action":
-        with SessionLocal() as session:
+    # One session for the whole tool-call loop instead of one per iteration;
+    # stage timings are stored under the run ID
+    with start_trace(run.id, "handle_run"), session_scope() as session:
+        while current_run.status == "requires_action":
             try:
                 conversation = (
                     session.query(ConversationModel)
@@ -128,275 +147,260 @@ def handle_run(
                 ) in current_run.required_action.submit_tool_outputs.tool_calls:
                     function_name = tool_call.function.name
 
-                    if (
-                        function_name == "fetch_candidate_cv"
-                        or function_name == "fetch_candidate_cv_1"
-                    ):
-                        cv_entry = (
-                            session.query(CV)
-                            .filter(CV.id == conversation.cv_id)
-                            .first()
-                        )
-                        job_entry = (
-                            session.query(Job)
-                            .filter(Job.id == conversation.job_id)
-                            .first()
-                        )
-
-                        path = None
-
-                        if cv_entry.filepath.endswith(".pdf"):
-                            path = cv_entry.filepath
-                        else:
-                            pdf_file_path = cv_entry.filepath.replace(".tex", ".pdf")
-                            path = PDF_DIR + "/" + os.path.basename(pdf_file_path)
-                            if not os.path.exists(pdf_file_path):
-                                compile_latex(cv_entry.filepath)
-
-                        cv_id = cv_entry.id
-                        job_id = job_entry.id
-                        cv_text = extract_text_from_pdf(path)
-                        cv_text = pre_process(
-                            cv_text, ai_service, session, cv_id, job_id
-                        )
-                        tool_outputs.append(
-                            {
-                                "tool_call_id": tool_call.id,
-                                "output": cv_text,
-                            }
-                        )
-
-                    elif function_name == "fetch_profile":
-                        profile_entry = session.query(Profile).first()
-                        profile_dict = {
-                            key: value
-                            for key, value in profile_entry.__dict__.items()
-                            if not key.startswith("_")
-                        }
-
-                        tool_outputs.append(
-                            {
-                                "tool_call_id": tool_call.id,
-                                "output": json.dumps(profile_dict),
-                            }
-                        )
-
-                    elif (
-                        function_name == "fetch_job_description"
-                        or function_name == "fetch_job_description_1"
-                    ):
-                        cv_entry = (
-                            session.query(CV)
-                            .filter(CV.id == conversation.cv_id)
-                            .first()
-                        )
-                        job_entry = (
-                            session.query(Job)
-                            .filter(Job.id == conversation.job_id)
-                            .first()
-                        )
-
-                        path = None
-
-                        if cv_entry.filepath.endswith(".pdf"):
-                            path = cv_entry.filepath
-                        else:
-                            pdf_file_path = cv_entry.filepath.replace(".tex", ".pdf")
-                            path = PDF_DIR + "/" + os.path.basename(pdf_file_path)
-                            if not os.path.exists(pdf_file_path):
-                                compile_latex(cv_entry.filepath)
-
-                        cv_id = cv_entry.id
-                        job_id = job_entry.id
-                        job_description = job_entry.description
-                        job_description = pre_process(
-                            job_description, ai_service, session, cv_id, job_id
-                        )
-                        tool_outputs.append(
-                            {
-                                "tool_call_id": tool_call.id,
-                                "output": str(job_description),
-                            }
-                        )
-
-                    elif function_name == "fetch_ai_analysis":
-                        analysis_result = (
-                            session.query(AnalysisResult)
-                            .filter(AnalysisResult.id == conversation.analysis_id)
-                            .first()
-                        )
-                        analysis_message = (
-                            session.query(Message)
-                            .filter(
-                                Message.conversation_id
-                                == analysis_result.conversation_id,
-                                Message.role == "assistant",
+                    with span(f"tool.{function_name}", tool_call_id=tool_call.id):
+                        if (
+                            function_name == "fetch_candidate_cv"
+                            or function_name == "fetch_candidate_cv_1"
+                        ):
+                            cv_entry = (
+                                session.query(CV)
+                                .filter(CV.id == conversation.cv_id)
+                                .first()
                             )
-                            .first()
-                        )
-                        tool_outputs.append(
-                            {
-                                "tool_call_id": tool_call.id,
-                                "output": json.dumps(
-                                    {
-                                        "analysis_message": analysis_message.content,
-                                    }
-                                ),
+                            job_entry = (
+                                session.query(Job)
+                                .filter(Job.id == conversation.job_id)
+                                .first()
+                            )
+
+                            cv_id = cv_entry.id
+                            job_id = job_entry.id
+                            cv_text = extract_cv_text(cv_entry)
+                            cv_text = pre_process(
+                                cv_text, ai_service, session, cv_id, job_id
+                            )
+                            tool_outputs.append(
+                                {
+                                    "tool_call_id": tool_call.id,
+                                    "output": cv_text,
+                                }
+                            )
+
+                        elif function_name == "fetch_profile":
+                            profile_entry = session.query(Profile).first()
+                            profile_dict = {
+                                key: value
+                                for key, value in profile_entry.__dict__.items()
+                                if not key.startswith("_")
                             }
-                        )
-
-                    elif function_name == "extract_essential_keywords":
-                        keyword_assistant = (
-                            session.query(AssistantModel)
-                            .filter(AssistantModel.name == "Keyword Assistant")
-                            .first()
-                        )
-                        keyword_thread = ai_service.create_thread()
-                        db_conversation = ConversationModel(
-                            id=keyword_thread.id,
-                            cv_id=conversation.cv_id,
-                            job_id=conversation.job_id,
-                            assistant_id=keyword_assistant.id,
-                        )
-                        session.add(db_conversation)
-                        session.commit()
-                        session.refresh(db_conversation)
-                        message = ai_service.add_message_to_thread(
-                            thread_id=keyword_thread.id,
-                            role="user",
-                            content=tool_call.function.arguments,
-                        )
-                        db_message = Message(
-                            id=message.id,
-                            conversation_id=db_conversation.id,
-                            role=message.role,
-                            content=message.content[0].text.value,
-                            timestamp=datetime.fromtimestamp(message.created_at),
-                        )
-                        session.add(db_message)
-                        session.commit()
-                        session.refresh(db_message)
-                        keyword_run = ai_service.run_assistant_on_thread(
-                            thread_id=keyword_thread.id,
-                            assistant_id=keyword_assistant.id,
-                        )
-                        db_run = RunModel(
-                            id=keyword_run.id,
-                            conversation_id=db_conversation.id,
-                            status=keyword_run.status,
-                            created_at=datetime.fromtimestamp(run.created_at),
-                            updated_at=datetime.now(),
-                        )
-                        session.add(db_run)
-                        session.commit()
-                        session.refresh(db_run)
-
-                        if keyword_run.status == "completed":
-                            message_result = ai_service.list_messages_in_thread(
-                                thread_id=keyword_thread.id
-                            )[0]
-                            keyword_output = json.loads(
-                                ai_service.list_messages_in_thread(
-                                    thread_id=keyword_thread.id
-                                )[0]
-                                .content[0]
-                                .text.value
-                            ).get("strings")
-                            db_message_result = Message(
-                                id=message_result.id,
-                                conversation_id=db_conversation.id,
-                                role=message_result.role,
-                                content=keyword_output,
-                                timestamp=datetime.fromtimestamp(
-                                    message_result.created_at
-                                ),
+
+                            tool_outputs.append(
+                                {
+                                    "tool_call_id": tool_call.id,
+                                    "output": json.dumps(profile_dict),
+                                }
                             )
-                            session.add(db_message_result)
-                            session.commit()
-                            session.refresh(db_message_result)
 
+                        elif (
+                            function_name == "fetch_job_description"
+                            or function_name == "fetch_job_description_1"
+                        ):
+                            cv_entry = (
+                                session.query(CV)
+                                .filter(CV.id == conversation.cv_id)
+                                .first()
+                            )
+                            job_entry = (
+                                session.query(Job)
+                                .filter(Job.id == conversation.job_id)
+                                .first()
+                            )
+
+                            cv_id = cv_entry.id
+                            job_id = job_entry.id
+                            job_description = job_entry.description
+                            job_description = pre_process(
+                                job_description, ai_service, session, cv_id, job_id
+                            )
                             tool_outputs.append(
                                 {
                                     "tool_call_id": tool_call.id,
-                                    "output": json.dumps({"keywords": keyword_output}),
+                                    "output": str(job_description),
                                 }
                             )
-                        else:
-                            raise Exception("Keyword Assistant failed to run.")
-
-                    elif function_name == "start_static_analysis":
-                        keywords = json.loads(tool_call.function.arguments).get(
-                            "essential_keywords"
-                        )
-
-                        try:
-                            # analysis = analyze_cv(
-                            #     cv_id=conversation.cv_id,
-                            #     job_id=conversation.job_id,
-                            #     conversation=conversation,
-                            #     keywords=keywords,
-                            #     session=session,
-                            # )
-
-                            # Convert to dict immediately after creation while session is still active
-                            # analysis_dict = {
-                            #     "id": analysis.id,
-                            #     "cv_id": analysis.cv_id,
-                            #     "job_id": analysis.job_id,
-                            #     "keyword_match_score": float(
-                            #         analysis.keyword_match_score
-                            #     ),
-                            #     "bert_similarity_score": float(
-                            #         analysis.bert_similarity_score
-                            #     ),
-                            #     "cosine_similarity_score": float(
-                            #         analysis.cosine_similarity_score
-                            #     ),
-                            #     "jaccard_similarity_score": float(
-                            #         analysis.jaccard_similarity_score
-                            #     ),
-                            #     "ner_similarity_score": float(
-                            #         analysis.ner_similarity_score
-                            #     ),
-                            #     "lsa_analysis_score": float(
-                            #         analysis.lsa_analysis_score
-                            #     ),
-                            #     "aggregated_score": float(analysis.aggregated_score),
-                            # }
 
+                        elif function_name == "fetch_ai_analysis":
+                            analysis_result = (
+                                session.query(AnalysisResult)
+                                .filter(AnalysisResult.id == conversation.analysis_id)
+                                .first()
+                            )
+                            analysis_message = (
+                                session.query(Message)
+                                .filter(
+                                    Message.conversation_id
+                                    == analysis_result.conversation_id,
+                                    Message.role == "assistant",
+                                )
+                                .first()
+                            )
                             tool_outputs.append(
                                 {
                                     "tool_call_id": tool_call.id,
-                                    "output": "Make up the scores yourself.",
+                                    "output": json.dumps(
+                                        {
+                                            "analysis_message": analysis_message.content,
+                                        }
+                                    ),
                                 }
                             )
 
-                        except Exception as e:
-                            raise Exception(f"Error during analysis: {e}")
+                        elif function_name == "extract_essential_keywords":
+                            keyword_assistant_id = get_assistant_id(
+                                session, "Keyword Assistant"
+                            )
+                            if not keyword_assistant_id:
+                                raise Exception("Keyword Assistant not found.")
+                            keyword_thread = ai_service.create_thread()
+                            message = ai_service.add_message_to_thread(
+                                thread_id=keyword_thread.id,
+                                role="user",
+                                content=tool_call.function.arguments,
+                            )
+                            # Committed before the run, so the thread stays on
+                            # record if it fails
+                            with UnitOfWork(session) as uow:
+                                uow.add(
+                                    ConversationModel(
+                                        id=keyword_thread.id,
+                                        cv_id=conversation.cv_id,
+                                        job_id=conversation.job_id,
+                                        assistant_id=keyword_assistant_id,
+                                    ),
+                                    Message(
+                                        id=message.id,
+                                        conversation_id=keyword_thread.id,
+                                        role=message.role,
+                                        content=message.content[0].text.value,
+                                        timestamp=datetime.fromtimestamp(
+                                            message.created_at
+                                        ),
+                                    ),
+                                )
+
+                            keyword_run = ai_service.run_assistant_on_thread(
+                                thread_id=keyword_thread.id,
+                                assistant_id=keyword_assistant_id,
+                            )
+                            message_result = None
+                            if keyword_run.status == "completed":
+                                message_result = ai_service.list_messages_in_thread(
+                                    thread_id=keyword_thread.id
+                                )[0]
+                                keyword_output = json.loads(
+                                    message_result.content[0].text.value
+                                ).get("strings")
+
+                            # The run and its reply are committed together
+                            with UnitOfWork(session) as uow:
+                                uow.add(
+                                    RunModel(
+                                        id=keyword_run.id,
+                                        conversation_id=keyword_thread.id,
+                                        status=keyword_run.status,
+                                        created_at=datetime.fromtimestamp(
+                                            run.created_at
+                                        ),
+                                        updated_at=datetime.now(),
+                                    )
+                                )
+                                if message_result is not None:
+                                    uow.add(
+                                        Message(
+                                            id=message_result.id,
+                                            conversation_id=keyword_thread.id,
+                                            role=message_result.role,
+                                            content=keyword_output,
+                                            timestamp=datetime.fromtimestamp(
+                                                message_result.created_at
+                                            ),
+                                        )
+                                    )
+
+                            if keyword_run.status == "completed":
+                                tool_outputs.append(
+                                    {
+                                        "tool_call_id": tool_call.id,
+                                        "output": json.dumps(
+                                            {"keywords": keyword_output}
+                                        ),
+                                    }
+                                )
+                            else:
+                                raise Exception("Keyword Assistant failed to run.")
 
-                    elif function_name == "get_job_text":
-                        job_url = (
-                            session.query(Job)
-                            .filter(Job.id == conversation.job_id)
-                            .first()
-                            .url
-                        )
+                        elif function_name == "start_static_analysis":
+                            keywords = json.loads(tool_call.function.arguments).get(
+                                "essential_keywords"
+                            )
 
-                        response = requests.get(job_url)
+                            try:
+                                # analysis = analyze_cv(
+                                #     cv_id=conversation.cv_id,
+                                #     job_id=conversation.job_id,
+                                #     conversation=conversation,
+                                #     keywords=keywords,
+                                #     session=session,
+                                # )
+
+                                # Convert to dict immediately after creation while session is still active
+                                # analysis_dict = {
+                                #     "id": analysis.id,
+                                #     "cv_id": analysis.cv_id,
+                                #     "job_id": analysis.job_id,
+                                #     "keyword_match_score": float(
+                                #         analysis.keyword_match_score
+                                #     ),
+                                #     "bert_similarity_score": float(
+                                #         analysis.bert_similarity_score
+                                #     ),
+                                #     "cosine_similarity_score": float(
+                                #         analysis.cosine_similarity_score
+                                #     ),
+                                #     "jaccard_similarity_score": float(
+                                #         analysis.jaccard_similarity_score
+                                #     ),
+                                #     "ner_similarity_score": float(
+                                #         analysis.ner_similarity_score
+                                #     ),
+                                #     "lsa_analysis_score": float(
+                                #         analysis.lsa_analysis_score
+                                #     ),
+                                #     "aggregated_score": float(analysis.aggregated_score),
+                                # }
+
+                                tool_outputs.append(
+                                    {
+                                        "tool_call_id": tool_call.id,
+                                        "output": "Make up the scores yourself.",
+                                    }
+                                )
 
-                        if response.status_code == 200:
-                            soup = BeautifulSoup(response.content, "html.parser")
-                            text = soup.get_text()
+                            except Exception as e:
+                                raise Exception(f"Error during analysis: {e}")
+
+                        elif function_name == "get_job_text":
+                            job_url = (
+                                session.query(Job)
+                                .filter(Job.id == conversation.job_id)
+                                .first()
+                                .url
+                            )
+
+                            # Cached and revalidated by URL, repeated runs on the same
+                            # job neither download nor parse the page again
+                            page = fetch_page(job_url)
+                            # Structured JobPosting data is far shorter than the page
                             tool_outputs.append(
                                 {
                                     "tool_call_id": tool_call.id,
-                                    "output": text,
+                                    "output": (
+                                        format_job_posting(page.posting)
+                                        if page.posting
+                                        else page.text
+                                    ),
                                 }
                             )
-                        else:
-                            raise Exception(
-                                f"Failed to fetch the URL. Status code: {response.status_code}"
-                            )
 
                 run_entry = (
                     session.query(RunModel)
@@ -416,21 +420,88 @@ def handle_run(
 
                 # Update run entry if it exists
                 if run_entry:
-                    run_entry.status = new_run.status
-                    run_entry.updated_at = datetime.now()
-                    session.commit()
+                    with span("db.update_run"):
+                        run_entry.status = new_run.status
+                        run_entry.updated_at = datetime.now()
+                        session.commit()
 
                 # Update current run for next iteration
                 current_run = new_run
 
             except Exception as e:
                 session.rollback()
-                print("HALLO ERROR: " + e)
+                print(f"HALLO ERROR: {e}")
                 raise e
 
     return current_run
 
 
+def analysis_trace_id(cv_id: int, job_id: int, conversation_id: str) -> str:
+    return f"analysis:{cv_id}:{job_id}:{conversation_id}"
+
+
+def reusable_scores(
+    analysis: Optional[AnalysisResult], fingerprints: Dict[str, str]
+) -> Dict[str, float]:
+    """Stored scores of ``analysis`` whose metric fingerprint still matches."""
+    if analysis is None or not analysis.metric_fingerprints:
+        return {}
+    return {
+        name: getattr(analysis, METRIC_REGISTRY[name].column)
+        for name, fingerprint in fingerprints.items()
+        if analysis.metric_fingerprints.get(name) == fingerprint
+    }
+
+
+def analysis_is_fresh(
+    analysis: Optional[AnalysisResult], fingerprints: Dict[str, str]
+) -> bool:
+    """Whether ``analysis`` can be served as it is.
+
+    Metrics without a stored fingerprint were skipped by the fast mode; the
+    result stays fresh while the fast-mode settings it ran with are unchanged.
+    """
+    if analysis is None or not analysis.fingerprint:
+        return False
+    stored = analysis.metric_fingerprints or {}
+    skipped = [name for name in fingerprints if name not in stored]
+    return analysis.fingerprint == analysis_fingerprint(fingerprints, skipped)
+
+
+def analysis_values(
+    metric_run: MetricRun,
+    fingerprints: Dict[str, str],
+    keywords: Optional[List[str]],
+    previous: Optional[AnalysisResult] = None,
+) -> Dict[str, Any]:
+    """Column values of an analysis result for ``metric_run``.
+
+    Metrics skipped by the fast mode are stored as 0 without a fingerprint;
+    the overall fingerprint covers them and the fast-mode settings, so they
+    run once fast mode is turned off or its threshold changes. Reused scores
+    keep their previous timing.
+    """
+    previous_timings = (previous.metric_timings if previous else None) or {}
+    computed = set(metric_run.scores)
+    skipped = [name for name in fingerprints if name not in computed]
+    return {
+        **{spec.column: 0.0 for spec in enabled_metrics()},
+        **metric_run.columns(),
+        "aggregated_score": float(metric_run.aggregated),
+        "metric_timings": {
+            name: metric_run.timings.get(name, previous_timings.get(name))
+            for name in fingerprints
+        },
+        "fingerprint": analysis_fingerprint(fingerprints, skipped),
+        "metric_fingerprints": {
+            name: fingerprint
+            for name, fingerprint in fingerprints.items()
+            if name in computed
+        },
+        "keywords": keywords,
+    }
+
+
 def analyze_cv(
     cv_id: int,
     job_id: int,
@@ -439,97 +510,118 @@ def analyze_cv(
     session: Optional[Session] = None,
 ) -> Optional[AnalysisResult]:
     if session is None:
-        session = SessionLocal()
-        should_close = True
-    else:
-        should_close = False
+        with session_scope() as session:
+            return analyze_cv(cv_id, job_id, conversation, keywords, session)
+
+    trace_id = analysis_trace_id(cv_id, job_id, conversation.id)
+    with start_trace(trace_id, "analyze_cv", cv_id=cv_id, job_id=job_id) as trace:
+        analysis_span = current_span()
+        try:
+            # Served by uq_analysis_results_cv_job_conversation
+            with span("analyze_cv.lookup"):
+                existing_analysis = (
+                    session.query(AnalysisResult)
+                    .filter(
+                        AnalysisResult.cv_id == cv_id,
+                        AnalysisResult.job_id == job_id,
+                        AnalysisResult.conversation_id == conversation.id,
+                    )
+                    .first()
+                )
 
-    try:
-        cv_entry = session.query(CV).filter(CV.id == cv_id).first()
-        job_entry = session.query(Job).filter(Job.id == job_id).first()
-        conversation_entry = session.query(ConversationModel).filter(
-            ConversationModel.id == conversation.id
-        )
-        existing_analysis = (
-            session.query(AnalysisResult)
-            .filter(
-                AnalysisResult.cv_id == cv_id,
-                AnalysisResult.job_id == job_id,
-                AnalysisResult.conversation_id == conversation.id,
-            )
-            .first()
-        )
+            with span("analyze_cv.load_rows"):
+                cv_entry = session.query(CV).filter(CV.id == cv_id).first()
+                job_entry = session.query(Job).filter(Job.id == job_id).first()
 
-        if existing_analysis:
-            return existing_analysis
-
-        if not cv_entry:
-            raise Exception("CV not found in database.")
-        if not job_entry:
-            raise Exception("Job not found in database.")
-
-        # Extract text from CV
-        path = None
-
-        if cv_entry.filepath.endswith(".pdf"):
-            path = cv_entry.filepath
-        else:
-            pdf_file_path = cv_entry.filepath.replace(".tex", ".pdf")
-            path = PDF_DIR + "/" + os.path.basename(pdf_file_path)
-            if not os.path.exists(pdf_file_path):
-                compile_latex(cv_entry.filepath)
-        extracted_text = extract_text_from_pdf(path)
-
-        # Extract text from Job Description
-        job_description = str(job_entry.description)
-
-        # Perform analysis
-        keyword_score = keyword_matching(extracted_text, job_description, keywords)
-        bert_score = bert_similarity_score(extracted_text, job_description)
-        cosine_score = cosine_similarity_score(extracted_text, job_description)
-        jaccard_score = jaccard_similarity_score(extracted_text, job_description)
-        ner_score = ner_similarity_score(extracted_text, job_description)
-        lsa_score = lsa_analysis_score(extracted_text, job_description)
-
-        # Aggregate scores
-        aggregated = (
-            keyword_score * 0.2
-            + bert_score * 0.2
-            + cosine_score * 0.2
-            + jaccard_score * 0.1
-            + ner_score * 0.2
-            + lsa_score * 0.1
-        )
+            if not cv_entry:
+                raise Exception("CV not found in database.")
+            if not job_entry:
+                raise Exception("Job not found in database.")
 
-        # Create and persist analysis results
-        analysis = AnalysisResult(
-            cv_id=cv_id,
-            job_id=job_id,
-            conversation_id=conversation.id,
-            keyword_match_score=keyword_score,
-            bert_similarity_score=float(bert_score),
-            cosine_similarity_score=float(cosine_score),
-            jaccard_similarity_score=float(jaccard_score),
-            ner_similarity_score=float(ner_score),
-            lsa_analysis_score=float(lsa_score),
-            aggregated_score=float(aggregated),
-        )
-        session.add(analysis)
-        session.commit()
+            if keywords is None and existing_analysis is not None:
+                # e.g. /analysis/start, keep the keywords it was computed with
+                keywords = existing_analysis.keywords
 
-        # Refresh to ensure all attributes are loaded
-        session.refresh(analysis)
-        return analysis
+            with span("analyze_cv.fingerprint"):
+                cv_content_hash = cv_hash(cv_entry)
+                job_content_hash = job_hash(job_entry)
+                fingerprints = metric_fingerprints(
+                    cv_content_hash, job_content_hash, keywords
+                )
 
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        if should_close:
-            session.close()
+            if analysis_is_fresh(existing_analysis, fingerprints):
+                return existing_analysis
+
+            # Scores whose metric, models and documents are unchanged are kept,
+            # only the stale metrics run again
+            reuse = reusable_scores(existing_analysis, fingerprints)
+            if len(reuse) == len(fingerprints):
+                # Only the weights changed, aggregate again
+                metric_run = run_metrics(AnalysisContext("", ""), reuse=reuse)
+            else:
+                # Precomputed on write (PRECOMPUTE_ON_WRITE): the CV text and
+                # the embeddings and entities of both documents
+                with span("analyze_cv.features"):
+                    cv_features = get_features(session, "cv", cv_id, cv_content_hash)
+                    job_features = get_features(
+                        session, "job", job_id, job_content_hash
+                    )
 
+                # Extract text from CV
+                with span("analyze_cv.extract_text"):
+                    if cv_features is not None:
+                        extracted_text = cv_features.text
+                    else:
+                        extracted_text = extract_cv_text(cv_entry)
+
+                # Extract text from Job Description
+                job_description = str(job_entry.description)
+
+                # Perform analysis, on the NLP worker when one is configured
+                with span("analyze_cv.metrics", reused=len(reuse)):
+                    metric_run = nlp_client.score(
+                        extracted_text,
+                        job_description,
+                        keywords,
+                        feature_artifacts(cv_features, job_features),
+                        reuse,
+                    )
+
+            # Create or refresh the analysis result
+            with span("analyze_cv.persist"):
+                values = analysis_values(
+                    metric_run, fingerprints, keywords, existing_analysis
+                )
+                values["trace_id"] = trace.trace_id
+                values["trace_span_id"] = analysis_span.span_id
+                if existing_analysis is None:
+                    analysis = AnalysisResult(
+                        cv_id=cv_id,
+                        job_id=job_id,
+                        conversation_id=conversation.id,
+                        **values,
+                    )
+                    session.add(analysis)
+                else:
+                    analysis = existing_analysis
+                    for column, value in values.items():
+                        setattr(analysis, column, value)
+                session.commit()
+                response_cache.invalidate(f"analysis:{cv_id}:{job_id}")
+
+                # Refresh to ensure all attributes are loaded
+                session.refresh(analysis)
+            return analysis
 
+        except Exception as e:
+            session.rollback()
+            raise e
+
+
+@traced("textract")
 def extract_text_from_pdf(pdf_file_path: str) -> str:
+    import textract
+
     try:
         text = textract.process(pdf_file_path).decode("utf-8")
         return text
@@ -537,65 +629,176 @@ def extract_text_from_pdf(pdf_file_path: str) -> str:
         raise Exception(f"Failed to extract text from PDF: {e}")
 
 
-def keyword_matching(
-    cv_text: str, job_description: str, keywords: Optional[List[str]]
-) -> float:
+def cv_pdf_path(cv_entry: CV) -> str:
+    if cv_entry.filepath.endswith(".pdf"):
+        return cv_entry.filepath
+
+    pdf_file_path = cv_entry.filepath.replace(".tex", ".pdf")
+    path = PDF_DIR + "/" + os.path.basename(pdf_file_path)
+    if not os.path.exists(path):
+        compile_latex(cv_entry.filepath)
+    return path
+
+
+def extract_cv_text(cv_entry: CV) -> str:
+    path = cv_pdf_path(cv_entry)
+    # Keyed on mtime so a recompiled CV is extracted again
+    key = (path, os.path.getmtime(path))
+    text = cv_text_cache.get(key)
+    if text is None:
+        text = extract_text_from_pdf(path)
+        cv_text_cache.set(key, text)
+    return text
+
+
+DEFAULT_ESSENTIAL_KEYWORDS = [
+    "python",
+    "machine learning",
+    "data analysis",
+    "sql",
+    "communication",
+    "teamwork",
+]
+
+
+@register_artifact("tokens")
+def build_tokens(context: AnalysisContext) -> Tuple[set, set]:
+    return (
+        set(context.cv_text.lower().split()),
+        set(context.job_description.lower().split()),
+    )
+
+
+@register_artifact("tfidf")
+def build_tfidf(context: AnalysisContext):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    documents = [context.cv_text, context.job_description]
+    return TfidfVectorizer().fit_transform(documents)
+
+
+@register_artifact("tfidf_ngrams")
+def build_tfidf_ngrams(context: AnalysisContext):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    documents = [context.cv_text, context.job_description]
+    vectorizer = TfidfVectorizer(
+        stop_words="english", ngram_range=(1, 2), max_features=10000
+    )
+    return vectorizer.fit_transform(documents)
+
+
+@register_artifact("embeddings", model=embedding_model_id)
+def build_embeddings(context: AnalysisContext) -> "np.ndarray":
+    return nlp_client.encode_documents([context.cv_text, context.job_description])
+
+
+@register_artifact("entities", model=lambda: settings.SPACY_MODEL)
+def build_entities(context: AnalysisContext) -> Tuple[frozenset, frozenset]:
+    cv_entities, job_entities = nlp_client.extract_entities(
+        [context.cv_text, context.job_description]
+    )
+    return cv_entities, job_entities
+
+
+@register_metric(
+    "keyword_match",
+    column="keyword_match_score",
+    needs=("tokens",),
+    cost=MetricCost.CHEAP,
+    weight=0.2,
+    uses_keywords=True,
+)
+def keyword_match_metric(context: AnalysisContext) -> float:
     # Define essential keywords (could be dynamic or stored in DB)
-    if keywords:
-        essential_keywords = keywords
-    else:
-        essential_keywords = [
-            "python",
-            "machine learning",
-            "data analysis",
-            "sql",
-            "communication",
-            "teamwork",
-        ]
-
-    cv_words = set(cv_text.lower().split())
-    job_words = set(job_description.lower().split())
+    essential_keywords = context.keywords or DEFAULT_ESSENTIAL_KEYWORDS
+    cv_words, job_words = context.get("tokens")
     matched_keywords = cv_words.intersection(job_words).intersection(
         set(essential_keywords)
     )
-    if not essential_keywords:
-        return 0.0
     score = (len(matched_keywords) / len(essential_keywords)) * 100
     return round(score, 2)
 
 
-def bert_similarity_score(cv_text: str, job_description: str) -> float:
-    bert_model = SentenceTransformer("bert-base-nli-mean-tokens")
-    embeddings = bert_model.encode([cv_text, job_description])
-    similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0] * 100
+@register_metric(
+    "jaccard_similarity",
+    column="jaccard_similarity_score",
+    needs=("tokens",),
+    cost=MetricCost.CHEAP,
+    weight=0.1,
+)
+def jaccard_similarity_metric(context: AnalysisContext) -> float:
+    cv_set, job_set = context.get("tokens")
+    if not cv_set or not job_set:
+        return 0.0
+    intersection = cv_set.intersection(job_set)
+    union = cv_set.union(job_set)
+    similarity = (len(intersection) / len(union)) * 100
     return round(similarity, 2)
 
 
-def cosine_similarity_score(cv_text: str, job_description: str) -> float:
-    vectorizer = TfidfVectorizer().fit([cv_text, job_description])
-    vectors = vectorizer.transform([cv_text, job_description])
+@register_metric(
+    "cosine_similarity",
+    column="cosine_similarity_score",
+    needs=("tfidf",),
+    cost=MetricCost.MODERATE,
+    weight=0.2,
+)
+def cosine_similarity_metric(context: AnalysisContext) -> float:
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    vectors = context.get("tfidf")
     similarity = cosine_similarity(vectors[0], vectors[1])[0][0] * 100
     return round(similarity, 2)
 
 
-def jaccard_similarity_score(cv_text: str, job_description: str) -> float:
-    cv_set = set(cv_text.lower().split())
-    job_set = set(job_description.lower().split())
-    if not cv_set or not job_set:
-        return 0.0
-    intersection = cv_set.intersection(job_set)
-    union = cv_set.union(job_set)
-    similarity = (len(intersection) / len(union)) * 100
+@register_metric(
+    "lsa_analysis",
+    column="lsa_analysis_score",
+    needs=("tfidf_ngrams",),
+    cost=MetricCost.MODERATE,
+    weight=0.1,
+)
+def lsa_analysis_metric(context: AnalysisContext, n_components: int = 100) -> float:
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    X = context.get("tfidf_ngrams")
+
+    # Ensure n_components is less than the number of features
+    n_components = min(n_components, X.shape[1] - 1)
+
+    svd = TruncatedSVD(n_components=n_components, random_state=42)
+    X_reduced = svd.fit_transform(X)
+
+    similarity = cosine_similarity([X_reduced[0]], [X_reduced[1]])[0][0] * 100
     return round(similarity, 2)
 
 
-def ner_similarity_score(cv_text: str, job_description: str) -> float:
-    nlp = spacy.load("en_core_web_sm")
-    cv_doc = nlp(cv_text)
-    job_doc = nlp(job_description)
+@register_metric(
+    "bert_similarity",
+    column="bert_similarity_score",
+    needs=("embeddings",),
+    cost=MetricCost.EXPENSIVE,
+    weight=0.2,
+)
+def bert_similarity_metric(context: AnalysisContext) -> float:
+    from sklearn.metrics.pairwise import cosine_similarity
 
-    cv_entities = set([ent.text.lower() for ent in cv_doc.ents])
-    job_entities = set([ent.text.lower() for ent in job_doc.ents])
+    embeddings = context.get("embeddings")
+    similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0] * 100
+    return round(similarity, 2)
+
+
+@register_metric(
+    "ner_similarity",
+    column="ner_similarity_score",
+    needs=("entities",),
+    cost=MetricCost.EXPENSIVE,
+    weight=0.2,
+)
+def ner_similarity_metric(context: AnalysisContext) -> float:
+    cv_entities, job_entities = context.get("entities")
 
     if not job_entities:
         return 0.0
@@ -605,20 +808,31 @@ def ner_similarity_score(cv_text: str, job_description: str) -> float:
     return round(similarity, 2)
 
 
-def lsa_analysis_score(
-    cv_text: str, job_description: str, n_components: int = 100
+def keyword_matching(
+    cv_text: str, job_description: str, keywords: Optional[List[str]]
 ) -> float:
-    documents = [cv_text, job_description]
-    vectorizer = TfidfVectorizer(
-        stop_words="english", ngram_range=(1, 2), max_features=10000
-    )
-    X = vectorizer.fit_transform(documents)
+    return keyword_match_metric(AnalysisContext(cv_text, job_description, keywords))
 
-    # Ensure n_components is less than the number of features
-    n_components = min(n_components, X.shape[1] - 1)
 
-    svd = TruncatedSVD(n_components=n_components, random_state=42)
-    X_reduced = svd.fit_transform(X)
+def bert_similarity_score(cv_text: str, job_description: str) -> float:
+    return bert_similarity_metric(AnalysisContext(cv_text, job_description))
 
-    similarity = cosine_similarity([X_reduced[0]], [X_reduced[1]])[0][0] * 100
-    return round(similarity, 2)
+
+def cosine_similarity_score(cv_text: str, job_description: str) -> float:
+    return cosine_similarity_metric(AnalysisContext(cv_text, job_description))
+
+
+def jaccard_similarity_score(cv_text: str, job_description: str) -> float:
+    return jaccard_similarity_metric(AnalysisContext(cv_text, job_description))
+
+
+def ner_similarity_score(cv_text: str, job_description: str) -> float:
+    return ner_similarity_metric(AnalysisContext(cv_text, job_description))
+
+
+def lsa_analysis_score(
+    cv_text: str, job_description: str, n_components: int = 100
+) -> float:
+    return lsa_analysis_metric(
+        AnalysisContext(cv_text, job_description), n_components=n_components
+    )
@@ -0,0 +1,38 @@
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.assistant import Assistant as AssistantModel
+
+# Assistant name -> OpenAI assistant id. The rows only change through the
+# /assistants endpoints, which invalidate this map.
+_assistant_ids: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def warm_assistant_cache(db: Session) -> None:
+    rows = db.query(AssistantModel.name, AssistantModel.id).all()
+    assistant_ids = {}
+    for name, assistant_id in rows:
+        assistant_ids.setdefault(name, assistant_id)
+    with _lock:
+        _assistant_ids.clear()
+        _assistant_ids.update(assistant_ids)
+
+
+def invalidate_assistant_cache() -> None:
+    with _lock:
+        _assistant_ids.clear()
+
+
+def get_assistant_id(db: Session, name: str) -> Optional[str]:
+    assistant_id = _assistant_ids.get(name)
+    if assistant_id is None:
+        row = db.query(AssistantModel.id).filter(AssistantModel.name == name).first()
+        if row is None:
+            return None
+        assistant_id = row[0]
+        with _lock:
+            _assistant_ids[name] = assistant_id
+    return assistant_id
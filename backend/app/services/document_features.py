@@ -0,0 +1,83 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.cv import CV
+from app.models.job import Job
+from app.models.precompute import DocumentFeatures
+from app.services.metric_registry import artifact_model
+
+FEATURE_ARTIFACTS = ("embeddings", "entities")
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cv_hash(cv_entry: CV) -> str:
+    # The source file, a .tex CV is hashed before it is compiled
+    return file_hash(cv_entry.filepath)
+
+
+def job_hash(job_entry: Job) -> str:
+    return text_hash(str(job_entry.description))
+
+
+def feature_models() -> Dict[str, str]:
+    return {name: artifact_model(name) for name in FEATURE_ARTIFACTS}
+
+
+def get_features(
+    db: Session, kind: str, document_id: int, content_hash: str
+) -> Optional[DocumentFeatures]:
+    """Stored features of a document, None when missing or its content changed.
+
+    The embedding and entities may be from other models, see feature_artifacts.
+    """
+    features = (
+        db.query(DocumentFeatures)
+        .filter(
+            DocumentFeatures.kind == kind,
+            DocumentFeatures.document_id == document_id,
+        )
+        .first()
+    )
+    if features is None or features.content_hash != content_hash:
+        return None
+    return features
+
+
+def feature_artifacts(
+    cv_features: Optional[DocumentFeatures], job_features: Optional[DocumentFeatures]
+) -> Dict[str, Any]:
+    """Analysis artifacts that need no model call given both documents' features.
+
+    Only artifacts computed with the currently configured models are returned.
+    """
+    if cv_features is None or job_features is None:
+        return {}
+    models = feature_models()
+    current = {
+        name
+        for name in FEATURE_ARTIFACTS
+        if (cv_features.models or {}).get(name) == models[name]
+        and (job_features.models or {}).get(name) == models[name]
+    }
+    artifacts: Dict[str, Any] = {}
+    if "embeddings" in current:
+        artifacts["embeddings"] = [cv_features.embedding, job_features.embedding]
+    if "entities" in current:
+        artifacts["entities"] = (
+            frozenset(cv_features.entities),
+            frozenset(job_features.entities),
+        )
+    return artifacts
@@ -0,0 +1,222 @@
+import json
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, List
+
+from app.core.config import settings
+from app.core.tracing import span
+from app.utils.batching import MicroBatcher
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class OnnxSentenceEncoder:
+    """Mean-pooling sentence encoder running an ONNX export on onnxruntime.
+
+    Mirrors the ``SentenceTransformer.encode`` call used here, so it can stand
+    in for the PyTorch model on CPU-only nodes.
+    """
+
+    def __init__(self, model_name: str, export_dir: str, quantize: bool = False):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        model_dir = os.path.join(export_dir, model_name.replace("/", "__"))
+        onnx_path = os.path.join(
+            model_dir, "model.int8.onnx" if quantize else "model.onnx"
+        )
+        if not os.path.exists(onnx_path):
+            export_to_onnx(model_name, model_dir, quantize=quantize)
+
+        with open(os.path.join(model_dir, "encoder.json")) as f:
+            self.max_seq_length = json.load(f)["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = onnxruntime.InferenceSession(
+            onnx_path, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def encode(
+        self, sentences: List[str], batch_size: int = 32, **kwargs
+    ) -> "np.ndarray":
+        import numpy as np
+
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            encoded = self.tokenizer(
+                sentences[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            inputs = {
+                name: value.astype(np.int64)
+                for name, value in encoded.items()
+                if name in self.input_names
+            }
+            token_embeddings = self.session.run(None, inputs)[0]
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            batches.append(
+                (token_embeddings * mask).sum(axis=1)
+                / np.clip(mask.sum(axis=1), 1e-9, None)
+            )
+        return np.concatenate(batches).astype(np.float32)
+
+
+def export_to_onnx(model_name: str, model_dir: str, quantize: bool = False) -> str:
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    transformer = SentenceTransformer(model_name, device="cpu")[0]
+    tokenizer = transformer.tokenizer
+    auto_model = transformer.auto_model.eval()
+
+    os.makedirs(model_dir, exist_ok=True)
+    tokenizer.save_pretrained(model_dir)
+    with open(os.path.join(model_dir, "encoder.json"), "w") as f:
+        json.dump({"max_seq_length": transformer.max_seq_length}, f)
+
+    dummy = tokenizer(["export"], return_tensors="pt")
+    input_names = [
+        name
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in dummy
+    ]
+    fp32_path = os.path.join(model_dir, "model.onnx")
+    torch.onnx.export(
+        auto_model,
+        tuple(dummy[name] for name in input_names),
+        fp32_path,
+        input_names=input_names,
+        output_names=["last_hidden_state"],
+        dynamic_axes={
+            name: {0: "batch", 1: "sequence"}
+            for name in input_names + ["last_hidden_state"]
+        },
+        opset_version=14,
+    )
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = os.path.join(model_dir, "model.int8.onnx")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+@lru_cache(maxsize=None)
+def get_sentence_encoder(model_name: str = None, backend: str = None):
+    model_name = model_name or settings.EMBEDDING_MODEL
+    backend = backend or settings.EMBEDDING_BACKEND
+    if backend == "onnx":
+        return OnnxSentenceEncoder(
+            model_name,
+            settings.EMBEDDING_ONNX_DIR,
+            quantize=settings.EMBEDDING_ONNX_QUANTIZE,
+        )
+    if backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    # Pulls in torch, only paid by the first request that needs embeddings
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def embedding_model_id() -> str:
+    """Everything that changes the vectors: model, backend and chunking."""
+    backend = settings.EMBEDDING_BACKEND
+    if backend == "onnx" and settings.EMBEDDING_ONNX_QUANTIZE:
+        backend = "onnx-int8"
+    return (
+        f"{settings.EMBEDDING_MODEL}/{backend}/"
+        f"{settings.EMBEDDING_CHUNK_WORDS}-{settings.EMBEDDING_CHUNK_OVERLAP}-"
+        f"{settings.EMBEDDING_MAX_CHUNKS}"
+    )
+
+
+def split_into_windows(
+    text: str,
+    window_words: int = None,
+    overlap_words: int = None,
+    max_chunks: int = None,
+) -> List[str]:
+    window_words = window_words or settings.EMBEDDING_CHUNK_WORDS
+    overlap_words = (
+        settings.EMBEDDING_CHUNK_OVERLAP if overlap_words is None else overlap_words
+    )
+    max_chunks = max_chunks or settings.EMBEDDING_MAX_CHUNKS
+
+    words = text.split()
+    if len(words) <= window_words:
+        return [" ".join(words)]
+
+    stride = max(window_words - overlap_words, 1)
+    starts = list(range(0, len(words) - window_words + 1, stride))
+    if starts[-1] + window_words < len(words):
+        # Add a final window ending on the last word so nothing is dropped
+        starts.append(len(words) - window_words)
+
+    if len(starts) > max_chunks:
+        import numpy as np
+
+        # Keep evenly spaced windows (first and last included) to bound latency
+        picks = np.linspace(0, len(starts) - 1, num=max_chunks).round().astype(int)
+        starts = [starts[i] for i in sorted(set(picks))]
+
+    return [" ".join(words[start : start + window_words]) for start in starts]
+
+
+def encode_documents(texts: List[str], batch_size: int = None) -> "np.ndarray":
+    """Embed whole documents, pooling over overlapping windows.
+
+    All windows of all documents go through a single ``encode`` call, so a
+    long job description costs extra batch rows rather than extra model calls.
+    """
+    import numpy as np
+
+    windows = []
+    owners = []
+    for index, text in enumerate(texts):
+        for window in split_into_windows(text):
+            windows.append(window)
+            owners.append(index)
+
+    encoder = get_sentence_encoder()
+    with span("inference.embedding", windows=len(windows)):
+        window_embeddings = encoder.encode(
+            windows,
+            batch_size=batch_size or settings.EMBEDDING_BATCH_SIZE,
+        )
+
+    owners = np.asarray(owners)
+    weights = np.asarray([max(len(window.split()), 1) for window in windows])
+    pooled = np.zeros((len(texts), window_embeddings.shape[1]), dtype=np.float32)
+    for index in range(len(texts)):
+        mask = owners == index
+        pooled[index] = np.average(
+            window_embeddings[mask], axis=0, weights=weights[mask]
+        )
+    return pooled
+
+
+@lru_cache(maxsize=None)
+def get_embedding_batcher() -> MicroBatcher:
+    return MicroBatcher(
+        encode_documents,
+        max_items=settings.EMBEDDING_BATCH_MAX_ITEMS,
+        max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+    )
+
+
+def embed_documents(texts: List[str]) -> "np.ndarray":
+    """``encode_documents`` behind the shared micro-batcher.
+
+    Concurrent analyses each embed a CV and a job; their texts are pooled for
+    up to EMBEDDING_BATCH_MAX_WAIT_MS and encoded in one forward pass.
+    """
+    if settings.EMBEDDING_BATCH_MAX_WAIT_MS <= 0:
+        return encode_documents(texts)
+    return get_embedding_batcher()(texts)
@@ -0,0 +1,132 @@
+"""Rebuild the job embedding matrix from the stored document features.
+
+Run from ``backend/``::
+
+    python -m app.services.job_embeddings
+
+The precompute tasks keep the matrix in sync as jobs are written; a rebuild
+is only needed for jobs precomputed before it existed or after the matrix
+files were lost. Jobs whose features are stale or from another embedding
+model are left out until they are precomputed again.
+"""
+
+import argparse
+import os
+import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+from app.core.config import settings
+from app.database import session_scope
+from app.models.job import Job
+from app.models.precompute import DocumentFeatures
+from app.services.document_features import text_hash
+from app.services.embedding_service import embedding_model_id
+
+if TYPE_CHECKING:
+    from app.utils.embedding_matrix import EmbeddingMatrix
+
+
+@lru_cache(maxsize=None)
+def job_matrix() -> "EmbeddingMatrix":
+    # numpy is only imported once a job is indexed or searched
+    from app.utils.embedding_matrix import EmbeddingMatrix
+
+    return EmbeddingMatrix(
+        settings.JOB_EMBEDDING_MATRIX_PATH,
+        dtype=settings.JOB_EMBEDDING_MATRIX_DTYPE,
+        compact_ratio=settings.JOB_EMBEDDING_MATRIX_COMPACT_RATIO,
+    )
+
+
+def _current_matrix() -> "EmbeddingMatrix":
+    matrix = job_matrix()
+    matrix.refresh()
+    return matrix
+
+
+def store_job_embedding(job_id: int, embedding: Sequence[float]) -> None:
+    """Index a job's embedding, unless the same vector is stored already."""
+    import numpy as np
+
+    matrix = _current_matrix()
+    model = embedding_model_id()
+    if matrix.model == model and job_id in matrix:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if np.allclose(
+            matrix.vector(job_id), vector / np.linalg.norm(vector), atol=1e-3
+        ):
+            return
+    # Vectors of another model are not comparable, put starts over then
+    matrix.put([job_id], [embedding], model=model)
+
+
+def forget_job_embedding(job_id: int) -> None:
+    """Drop a job from the matrix; no-op, without loading numpy, if none exists."""
+    if not os.path.exists(f"{settings.JOB_EMBEDDING_MATRIX_PATH}.json"):
+        return
+    job_matrix().delete([job_id])
+
+
+def job_similarities(cv_embedding: Sequence[float]) -> Dict[int, float]:
+    """BERT similarity of a CV to every indexed job, in one mat-vec."""
+    matrix = _current_matrix()
+    if matrix.model != embedding_model_id():
+        return {}
+    scores, ids = matrix.scores(cv_embedding)
+    return {
+        job_id: round(score * 100, 2)
+        for job_id, score in zip(ids.tolist(), scores.tolist())
+    }
+
+
+def similar_jobs(cv_embedding: Sequence[float], limit: int) -> List[Tuple[int, float]]:
+    """The ``limit`` indexed jobs closest to a CV, with their BERT similarity."""
+    matrix = _current_matrix()
+    if matrix.model != embedding_model_id():
+        return []
+    return [
+        (job_id, round(score * 100, 2))
+        for job_id, score in matrix.search(cv_embedding, limit)
+    ]
+
+
+def rebuild_job_matrix() -> int:
+    """Re-index every job with current features, returns how many."""
+    model = embedding_model_id()
+    with session_scope() as db:
+        rows = (
+            db.query(
+                DocumentFeatures.document_id,
+                DocumentFeatures.embedding,
+                DocumentFeatures.content_hash,
+                DocumentFeatures.models,
+                Job.description,
+            )
+            .join(Job, Job.id == DocumentFeatures.document_id)
+            .filter(DocumentFeatures.kind == "job")
+            .all()
+        )
+    rows = [
+        row
+        for row in rows
+        if row.embedding
+        and (row.models or {}).get("embeddings") == model
+        and row.content_hash == text_hash(str(row.description))
+    ]
+    matrix = job_matrix()
+    matrix.reset(len(rows[0].embedding) if rows else None, model)
+    matrix.put([row.document_id for row in rows], [row.embedding for row in rows])
+    return len(rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    indexed = rebuild_job_matrix()
+    print(f"Indexed {indexed} jobs into {settings.JOB_EMBEDDING_MATRIX_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import json
+from typing import Dict, Iterator, List, Optional
+
+import lxml.html
+from lxml.etree import ParserError
+
+JOB_POSTING_TYPE = "JobPosting"
+REQUIRED_FIELDS = ("title", "company", "description")
+
+
+def parse_html(html: str):
+    try:
+        return lxml.html.fromstring(html)
+    except (ParserError, ValueError):
+        return None
+
+
+BLOCK_TAGS = tuple(
+    "address article br dd div dt footer h1 h2 h3 h4 h5 h6 header li main ol p "
+    "section table td th tr ul".split()
+)
+
+
+def element_to_text(element) -> str:
+    """Text of ``element`` with one line per block element, inline markup
+    such as <b> or <a> stays on its line."""
+    for block in element.iter(*BLOCK_TAGS):
+        block.text = "\n" + (block.text or "")
+        block.tail = "\n" + (block.tail or "")
+    lines = (" ".join(line.split()) for line in element.text_content().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _html_fragment_to_text(fragment: str) -> str:
+    document = parse_html(f"<div>{fragment}</div>")
+    if document is None:
+        return fragment.strip()
+    return element_to_text(document)
+
+
+def _first(value):
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _name(value) -> Optional[str]:
+    value = _first(value)
+    if isinstance(value, dict):
+        value = value.get("name")
+    return str(value).strip() if value else None
+
+
+def _location(value) -> Optional[str]:
+    locations = value if isinstance(value, list) else [value]
+    parts = []
+    for location in locations:
+        address = location.get("address") if isinstance(location, dict) else None
+        if isinstance(address, str):
+            parts.append(address)
+            continue
+        if not isinstance(address, dict):
+            continue
+        fields = [
+            _name(address.get(key))
+            for key in ("addressLocality", "addressRegion", "addressCountry")
+        ]
+        parts.append(", ".join(field for field in fields if field))
+    return "; ".join(part for part in dict.fromkeys(parts) if part) or None
+
+
+def _json_ld_nodes(data) -> Iterator[dict]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _json_ld_nodes(data["@graph"])
+
+
+def _is_job_posting(node: dict) -> bool:
+    node_type = node.get("@type")
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return JOB_POSTING_TYPE in types
+
+
+def _from_json_ld(document) -> Optional[Dict[str, Optional[str]]]:
+    for script in document.xpath('//script[@type="application/ld+json"]'):
+        try:
+            data = json.loads(script.text_content(), strict=False)
+        except ValueError:
+            continue
+        for node in _json_ld_nodes(data):
+            if not _is_job_posting(node):
+                continue
+            location = _location(node.get("jobLocation"))
+            if not location and node.get("jobLocationType") == "TELECOMMUTE":
+                location = "Remote"
+            return {
+                "title": _name(node.get("title")),
+                "company": _name(node.get("hiringOrganization")),
+                "location": location,
+                "description": _html_fragment_to_text(
+                    str(node.get("description") or "")
+                ),
+            }
+    return None
+
+
+def _itemprop(scope, name: str) -> List:
+    # Direct properties only, not those of nested items
+    return [
+        element
+        for element in scope.xpath(f'.//*[@itemprop="{name}"]')
+        if element.xpath("ancestor::*[@itemscope][1]")[0] is scope
+    ]
+
+
+def _itemprop_text(scope, name: str) -> Optional[str]:
+    for element in _itemprop(scope, name):
+        value = element.get("content") or element.text_content()
+        if value and value.strip():
+            return value.strip()
+    return None
+
+
+def _from_microdata(document) -> Optional[Dict[str, Optional[str]]]:
+    scopes = document.xpath(
+        f'//*[@itemscope][contains(@itemtype, "schema.org/{JOB_POSTING_TYPE}")]'
+    )
+    if not scopes:
+        return None
+    scope = scopes[0]
+
+    company = None
+    for organization in _itemprop(scope, "hiringOrganization"):
+        company = (
+            _itemprop_text(organization, "name")
+            if organization.get("itemscope") is not None
+            else organization.text_content().strip()
+        )
+        if company:
+            break
+
+    location = None
+    for place in _itemprop(scope, "jobLocation"):
+        addresses = _itemprop(place, "address") or [place]
+        fields = [
+            _itemprop_text(addresses[0], key)
+            for key in ("addressLocality", "addressRegion", "addressCountry")
+        ]
+        location = ", ".join(field for field in fields if field) or None
+        if location:
+            break
+
+    description = _itemprop(scope, "description")
+    return {
+        "title": _itemprop_text(scope, "title"),
+        "company": company,
+        "location": location,
+        "description": element_to_text(description[0]) if description else None,
+    }
+
+
+def extract_job_posting(html: str) -> Optional[Dict[str, Optional[str]]]:
+    """Read a schema.org JobPosting from JSON-LD or microdata.
+
+    Returns title, company, location and description, or None when the page
+    has no posting with at least a title, company and description.
+    """
+    document = parse_html(html) if html else None
+    if document is None:
+        return None
+    return job_posting_from_document(document)
+
+
+def job_posting_from_document(document) -> Optional[Dict[str, Optional[str]]]:
+    for extract in (_from_json_ld, _from_microdata):
+        posting = extract(document)
+        if posting and all(posting.get(key) for key in REQUIRED_FIELDS):
+            return posting
+    return None
+
+
+def format_job_posting(posting: Dict[str, Optional[str]]) -> str:
+    return "\n".join(
+        f"{key.capitalize()}: {posting[key]}"
+        for key in ("title", "company", "location", "description")
+        if posting.get(key)
+    )
@@ -0,0 +1,99 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from app.core.config import settings
+from app.database import session_scope
+from app.models.job import Job
+from app.services.job_service import fill_job_from_url
+from app.services.openai_assistant_service import OpenAIAssistantService
+from app.services.precompute_service import enqueue_job
+from app.services.page_fetcher import (
+    FetchedPage,
+    HostLimiter,
+    create_async_client,
+    fetch_page_async,
+)
+from app.utils.cache import LRUCache
+
+ai_service = OpenAIAssistantService()
+
+# Bounds how many Job Assistant runs are in flight across all bulk imports
+import_executor = ThreadPoolExecutor(
+    max_workers=settings.JOB_IMPORT_WORKERS, thread_name_prefix="job-import"
+)
+
+# Progress of recent imports, only kept for polling
+bulk_imports = LRUCache(maxsize=64, ttl=24 * 3600)
+
+
+@dataclass
+class BulkImportItem:
+    url: str
+    job_id: int
+    status: str = "queued"  # queued, fetching, extracting, completed, failed
+    # "structured_data" when the page had JobPosting markup, else "assistant"
+    source: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkImport:
+    items: List[BulkImportItem]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def done(self) -> bool:
+        return all(item.status in ("completed", "failed") for item in self.items)
+
+
+def create_bulk_import(items: List[BulkImportItem]) -> BulkImport:
+    bulk_import = BulkImport(items=items)
+    bulk_imports.set(bulk_import.id, bulk_import)
+    return bulk_import
+
+
+def get_bulk_import(import_id: str) -> Optional[BulkImport]:
+    return bulk_imports.get(import_id)
+
+
+def _extract_job(item: BulkImportItem, page: FetchedPage) -> None:
+    with session_scope() as db:
+        db_job = db.query(Job).filter(Job.id == item.job_id).first()
+        if not db_job:
+            raise Exception("Job not found in database.")
+        run = fill_job_from_url(db, ai_service, db_job, page=page)
+        item.source = "structured_data" if run is None else "assistant"
+        if run is not None and run.status != "completed":
+            raise Exception(f"Job Assistant run ended with status {run.status}.")
+    enqueue_job(item.job_id)
+
+
+async def _import_item(client, limiter: HostLimiter, item: BulkImportItem) -> None:
+    try:
+        item.status = "fetching"
+        page = await fetch_page_async(client, limiter, item.url)
+        item.status = "extracting"
+        await asyncio.get_running_loop().run_in_executor(
+            import_executor, _extract_job, item, page
+        )
+        item.status = "completed"
+    except Exception as e:
+        item.status = "failed"
+        item.error = str(e)
+
+
+async def run_bulk_import(bulk_import: BulkImport) -> None:
+    """Fetch every page concurrently, then hand each one to the worker pool
+    as soon as it arrives."""
+    limiter = HostLimiter(
+        settings.JOB_FETCH_PER_HOST_LIMIT, settings.JOB_FETCH_HOST_INTERVAL
+    )
+    async with create_async_client() as client:
+        await asyncio.gather(
+            *(_import_item(client, limiter, item) for item in bulk_import.items)
+        )
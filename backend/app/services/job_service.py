@@ -0,0 +1,135 @@
+import json
+from typing import TYPE_CHECKING, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import UnitOfWork
+from app.models.conversation import Conversation as ConversationModel
+from app.models.job import Job
+from app.models.message import Message
+from app.models.run import Run as RunModel
+from app.services.analysis_service import handle_run
+from app.services.assistant_cache import get_assistant_id
+from app.services.openai_assistant_service import OpenAIAssistantService
+from app.services.page_fetcher import FetchedPage, fetch_page
+from app.utils.response_cache import response_cache
+
+if TYPE_CHECKING:
+    from openai.types.beta.threads import Run
+
+
+def run_job_assistant(
+    db: Session, ai_service: OpenAIAssistantService, db_job: Job
+) -> "Run":
+    """Fill title, description, company and location of a URL-only job.
+
+    The Job Assistant reads the page through the ``get_job_text`` tool; the
+    job is only updated when its run completes, the final run is returned.
+    """
+    job_id = db_job.id
+    assistant_id = get_assistant_id(db, "Job Assistant")
+    if not assistant_id:
+        raise Exception("Job Assistant not found.")
+
+    thread = ai_service.create_thread()
+
+    openai_message = ai_service.add_message_to_thread(
+        thread_id=thread.id,
+        role="user",
+        content="Follow your instructions.",
+    )
+    # Committed before the run, so the thread stays on record if it fails
+    with UnitOfWork(db) as uow:
+        uow.add(
+            ConversationModel(
+                id=thread.id,
+                job_id=job_id,
+                assistant_id=assistant_id,
+            ),
+            Message(
+                id=openai_message.id,
+                conversation_id=thread.id,
+                role="user",
+                content="Follow your instructions.",
+            ),
+        )
+
+    run = ai_service.run_assistant_on_thread(
+        thread_id=thread.id,
+        assistant_id=assistant_id,
+    )
+    # handle_run works on its own session, so the run must be committed
+    # before it starts
+    with UnitOfWork(db) as uow:
+        uow.add(
+            RunModel(
+                id=run.id,
+                conversation_id=thread.id,
+                status=run.status,
+            )
+        )
+
+    run = handle_run(
+        run=run,
+        ai_service=ai_service,
+        db=db,
+        conversation_id=thread.id,
+    )
+
+    if run.status == "completed":
+        message_result = ai_service.list_messages_in_thread(thread_id=thread.id)[0]
+        job_output = json.loads(message_result.content[0].text.value)
+
+        with UnitOfWork(db) as uow:
+            uow.add(
+                Message(
+                    id=message_result.id,
+                    conversation_id=thread.id,
+                    role=message_result.role,
+                    content=message_result.content[0].text.value,
+                )
+            )
+
+            db_job.title = job_output["job_title"]
+            db_job.description = job_output["job_description"]
+            db_job.company = job_output["job_company"]
+            db_job.location = job_output["job_location"]
+        response_cache.invalidate("job", job_id)
+
+    return run
+
+
+def apply_job_posting(db: Session, db_job: Job, posting: Dict[str, str]) -> None:
+    job_id = db_job.id
+    with UnitOfWork(db):
+        db_job.title = posting["title"]
+        db_job.description = posting["description"]
+        db_job.company = posting["company"]
+        db_job.location = posting.get("location")
+    response_cache.invalidate("job", job_id)
+
+
+def fill_job_from_url(
+    db: Session,
+    ai_service: OpenAIAssistantService,
+    db_job: Job,
+    page: Optional[FetchedPage] = None,
+) -> Optional["Run"]:
+    """Fill a URL-only job, from the page's JobPosting data when it has one.
+
+    Only pages without structured data go to the Job Assistant, whose run is
+    returned; None means no assistant was needed.
+    """
+    if page is None:
+        try:
+            page = fetch_page(db_job.url)
+        except Exception as e:
+            # The assistant's get_job_text tool retries the download
+            print(f"Could not fetch job page: {e}")
+
+    if page and page.posting:
+        apply_job_posting(db, db_job, page.posting)
+        return None
+
+    # get_job_text is served from the page cache filled by fetch_page
+    return run_job_assistant(db, ai_service, db_job)
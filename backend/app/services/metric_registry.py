@@ -0,0 +1,233 @@
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.tracing import span
+
+
+class MetricCost(IntEnum):
+    CHEAP = 1
+    MODERATE = 2
+    EXPENSIVE = 3
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    name: str
+    column: str
+    func: Callable[["AnalysisContext"], float]
+    needs: Tuple[str, ...]
+    cost: MetricCost
+    weight: float
+    # Bump when the metric's output changes, stored results become stale
+    version: int = 1
+    uses_keywords: bool = False
+
+
+METRIC_REGISTRY: Dict[str, MetricSpec] = {}
+ARTIFACT_BUILDERS: Dict[str, Callable[["AnalysisContext"], Any]] = {}
+# Artifact name -> identity of the model behind it, e.g. the embedding model
+ARTIFACT_MODELS: Dict[str, Callable[[], str]] = {}
+
+
+def register_metric(
+    name: str,
+    column: str,
+    needs: Tuple[str, ...] = (),
+    cost: MetricCost = MetricCost.CHEAP,
+    weight: float = 0.0,
+    version: int = 1,
+    uses_keywords: bool = False,
+):
+    def decorator(func: Callable[["AnalysisContext"], float]):
+        METRIC_REGISTRY[name] = MetricSpec(
+            name=name,
+            column=column,
+            func=func,
+            needs=tuple(needs),
+            cost=cost,
+            weight=weight,
+            version=version,
+            uses_keywords=uses_keywords,
+        )
+        return func
+
+    return decorator
+
+
+def register_artifact(name: str, model: Optional[Callable[[], str]] = None):
+    def decorator(func: Callable[["AnalysisContext"], Any]):
+        ARTIFACT_BUILDERS[name] = func
+        if model is not None:
+            ARTIFACT_MODELS[name] = model
+        return func
+
+    return decorator
+
+
+def artifact_model(name: str) -> str:
+    return ARTIFACT_MODELS[name]() if name in ARTIFACT_MODELS else ""
+
+
+class AnalysisContext:
+    """Inputs of one CV/job comparison plus lazily built shared artifacts.
+
+    Artifacts (tokens, TF-IDF vectors, embeddings, entities, ...) are computed
+    on first use and reused by every metric that declares them.
+    """
+
+    def __init__(
+        self,
+        cv_text: str,
+        job_description: str,
+        keywords: Optional[List[str]] = None,
+        artifacts: Optional[Dict[str, Any]] = None,
+    ):
+        self.cv_text = cv_text
+        self.job_description = job_description
+        self.keywords = keywords
+        self._artifacts: Dict[str, Any] = dict(artifacts or {})
+
+    def get(self, name: str) -> Any:
+        if name not in self._artifacts:
+            with span(f"artifact.{name}"):
+                self._artifacts[name] = ARTIFACT_BUILDERS[name](self)
+        return self._artifacts[name]
+
+
+@dataclass
+class MetricRun:
+    scores: Dict[str, float] = field(default_factory=dict)
+    # Milliseconds per metric, including artifacts it was first to need;
+    # None marks a metric skipped by the fast-mode early exit.
+    timings: Dict[str, Optional[float]] = field(default_factory=dict)
+    aggregated: float = 0.0
+
+    def columns(self) -> Dict[str, float]:
+        return {
+            METRIC_REGISTRY[name].column: float(score)
+            for name, score in self.scores.items()
+        }
+
+
+def metric_weight(spec: MetricSpec) -> float:
+    return settings.ANALYSIS_METRIC_WEIGHTS.get(spec.name, spec.weight)
+
+
+def enabled_metrics() -> List[MetricSpec]:
+    enabled = settings.ANALYSIS_ENABLED_METRICS
+    specs = [
+        spec
+        for spec in METRIC_REGISTRY.values()
+        if (enabled is None or spec.name in enabled) and metric_weight(spec) > 0
+    ]
+    return sorted(specs, key=lambda spec: (spec.cost, spec.name))
+
+
+def weighted_mean(scores: Dict[str, float]) -> float:
+    total_weight = sum(metric_weight(METRIC_REGISTRY[name]) for name in scores)
+    if not total_weight:
+        return 0.0
+    return (
+        sum(
+            score * metric_weight(METRIC_REGISTRY[name])
+            for name, score in scores.items()
+        )
+        / total_weight
+    )
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def metric_fingerprints(
+    cv_hash: str, job_hash: str, keywords: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """Per enabled metric: its version, the models behind its artifacts, both
+    documents and, where used, the keywords. A stored score is reusable while
+    its fingerprint is unchanged."""
+    fingerprints = {}
+    for spec in enabled_metrics():
+        fingerprints[spec.name] = _digest(
+            {
+                "metric": spec.name,
+                "version": spec.version,
+                "models": {name: artifact_model(name) for name in spec.needs},
+                "keywords": (
+                    sorted(keywords) if spec.uses_keywords and keywords else None
+                ),
+                "cv": cv_hash,
+                "job": job_hash,
+            }
+        )
+    return fingerprints
+
+
+def analysis_fingerprint(
+    fingerprints: Dict[str, str], skipped: Iterable[str] = ()
+) -> str:
+    """Covers every metric fingerprint plus the weights of the aggregate.
+
+    A result cut short by the fast mode also covers the metrics it skipped and
+    the fast-mode settings: it stays fresh until fast mode is turned off or
+    the threshold changes, then the skipped metrics run.
+    """
+    value: Dict[str, Any] = {
+        "metrics": fingerprints,
+        "weights": {
+            name: metric_weight(METRIC_REGISTRY[name]) for name in fingerprints
+        },
+    }
+    skipped = sorted(skipped)
+    if skipped:
+        value["fast_mode"] = {
+            "skipped": skipped,
+            "enabled": settings.ANALYSIS_FAST_MODE,
+            "threshold": settings.ANALYSIS_EARLY_EXIT_THRESHOLD,
+        }
+    return _digest(value)
+
+
+def run_metrics(
+    context: AnalysisContext,
+    fast_mode: Optional[bool] = None,
+    threshold: Optional[float] = None,
+    reuse: Optional[Dict[str, float]] = None,
+) -> MetricRun:
+    """Run the enabled metrics, taking the scores in ``reuse`` as they are."""
+    if fast_mode is None:
+        fast_mode = settings.ANALYSIS_FAST_MODE
+    if threshold is None:
+        threshold = settings.ANALYSIS_EARLY_EXIT_THRESHOLD
+
+    result = MetricRun()
+    skip_rest = False
+    for spec in enabled_metrics():
+        if reuse and spec.name in reuse:
+            result.scores[spec.name] = reuse[spec.name]
+            continue
+        if (
+            fast_mode
+            and not skip_rest
+            and spec.cost > MetricCost.CHEAP
+            and result.scores
+            and weighted_mean(result.scores) < threshold
+        ):
+            # Cheap metrics already rule the match out, don't pay for the rest
+            skip_rest = True
+        if skip_rest:
+            result.timings[spec.name] = None
+            continue
+
+        started = time.perf_counter()
+        with span(f"metric.{spec.name}", cost=spec.cost.name):
+            result.scores[spec.name] = spec.func(context)
+        result.timings[spec.name] = round((time.perf_counter() - started) * 1000, 3)
+
+    result.aggregated = weighted_mean(result.scores)
+    return result
@@ -0,0 +1,59 @@
+import hashlib
+from functools import lru_cache
+from typing import FrozenSet, List
+
+from app.core.config import settings
+from app.core.tracing import span
+from app.utils.cache import LRUCache
+
+# Only doc.ents is read, so skip everything the NER component does not need
+NER_EXCLUDED_COMPONENTS = [
+    "tagger",
+    "morphologizer",
+    "parser",
+    "senter",
+    "attribute_ruler",
+    "lemmatizer",
+]
+
+entity_cache = LRUCache(maxsize=settings.NER_CACHE_SIZE, name="entities")
+
+
+@lru_cache(maxsize=None)
+def get_ner_pipeline(model_name: str = None):
+    import spacy
+
+    return spacy.load(
+        model_name or settings.SPACY_MODEL, exclude=NER_EXCLUDED_COMPONENTS
+    )
+
+
+def _document_key(text: str) -> str:
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return f"{settings.SPACY_MODEL}:{digest}"
+
+
+def extract_entities(texts: List[str]) -> List[FrozenSet[str]]:
+    """Lower-cased entity texts per document, cached by document hash."""
+    keys = [_document_key(text) for text in texts]
+    entities = {key: entity_cache.get(key) for key in keys}
+
+    pending = {}
+    for key, text in zip(keys, texts):
+        if entities[key] is None:
+            pending[key] = text
+
+    if pending:
+        nlp = get_ner_pipeline()
+        # pipe() is lazy, the documents are processed while being consumed
+        with span("inference.ner", documents=len(pending)):
+            docs = nlp.pipe(
+                pending.values(),
+                batch_size=settings.NER_BATCH_SIZE,
+                n_process=settings.NER_N_PROCESS,
+            )
+            for key, doc in zip(pending.keys(), docs):
+                entities[key] = frozenset(ent.text.lower() for ent in doc.ents)
+                entity_cache.set(key, entities[key])
+
+    return [entities[key] for key in keys]
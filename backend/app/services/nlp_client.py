@@ -0,0 +1,144 @@
+import queue
+from functools import lru_cache
+from multiprocessing.connection import Client, Connection
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.core.tracing import span
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from app.services.metric_registry import MetricRun
+
+# Set in the worker process itself, its calls must not loop back to it
+_serving = False
+
+
+def mark_worker_process() -> None:
+    global _serving
+    _serving = True
+
+
+def worker_enabled() -> bool:
+    return bool(settings.NLP_WORKER_ADDRESS) and not _serving
+
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    """``host:port`` for TCP, anything else is a Unix socket path."""
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+class NLPWorkerError(Exception):
+    pass
+
+
+class NLPWorkerClient:
+    """Pooled connections to the NLP worker, safe to share between threads."""
+
+    def __init__(self, address: str, authkey: str, timeout: float):
+        self.address = parse_address(address)
+        self.authkey = authkey.encode("utf-8")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Connection]" = queue.LifoQueue()
+
+    def _connect(self) -> Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return Client(self.address, authkey=self.authkey)
+
+    def _drop_idle(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def call(self, operation: str, *args: Any) -> Any:
+        # Pooled connections die with a worker restart; drop them all and
+        # retry once on a fresh one
+        for attempt in range(2):
+            connection = None
+            try:
+                connection = self._connect()
+                connection.send((operation, args))
+                answered = connection.poll(self.timeout)
+                if answered:
+                    status, result = connection.recv()
+            except (EOFError, OSError) as e:
+                if connection is not None:
+                    connection.close()
+                self._drop_idle()
+                if attempt:
+                    raise NLPWorkerError(f"NLP worker unreachable: {e}")
+                continue
+            if not answered:
+                # A late reply would be read by the next caller, don't reuse it
+                connection.close()
+                raise NLPWorkerError(
+                    f"NLP worker did not answer {operation} within {self.timeout}s"
+                )
+            self._idle.put(connection)
+            if status == "error":
+                raise NLPWorkerError(result)
+            return result
+
+
+@lru_cache(maxsize=None)
+def get_client() -> NLPWorkerClient:
+    if not settings.NLP_WORKER_AUTHKEY:
+        raise NLPWorkerError("NLP_WORKER_ADDRESS is set but NLP_WORKER_AUTHKEY is not")
+    return NLPWorkerClient(
+        settings.NLP_WORKER_ADDRESS,
+        settings.NLP_WORKER_AUTHKEY,
+        settings.NLP_WORKER_TIMEOUT,
+    )
+
+
+def encode_documents(texts: List[str]) -> "np.ndarray":
+    if worker_enabled():
+        with span("nlp_worker.embed", documents=len(texts)):
+            return get_client().call("embed", list(texts))
+
+    from app.services.embedding_service import embed_documents
+
+    return embed_documents(texts)
+
+
+def extract_entities(texts: List[str]) -> List[FrozenSet[str]]:
+    if worker_enabled():
+        with span("nlp_worker.entities", documents=len(texts)):
+            return get_client().call("entities", list(texts))
+
+    from app.services.ner_service import extract_entities as extract_locally
+
+    return extract_locally(texts)
+
+
+def score(
+    cv_text: str,
+    job_description: str,
+    keywords: Optional[List[str]] = None,
+    artifacts: Optional[Dict[str, Any]] = None,
+    reuse: Optional[Dict[str, float]] = None,
+) -> "MetricRun":
+    """All enabled metrics for one CV/job pair, on the worker when configured.
+
+    ``artifacts`` already computed (e.g. stored embeddings) are not rebuilt,
+    metrics with a score in ``reuse`` do not run.
+    """
+    if worker_enabled():
+        with span("nlp_worker.score"):
+            return get_client().call(
+                "score", cv_text, job_description, keywords, artifacts, reuse
+            )
+
+    from app.services.metric_registry import AnalysisContext, run_metrics
+
+    return run_metrics(
+        AnalysisContext(cv_text, job_description, keywords, artifacts), reuse=reuse
+    )
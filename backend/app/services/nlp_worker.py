@@ -0,0 +1,112 @@
+"""Standalone NLP worker: loads the models once and serves the API workers.
+
+Run from ``backend/``::
+
+    python -m app.services.nlp_worker --address 127.0.0.1:8765
+
+API processes send ``embed``, ``entities`` and ``score`` requests when
+``NLP_WORKER_ADDRESS`` is set (see ``app.services.nlp_client``), so BERT and
+spaCy live in this process only. Every connection is served by its own
+thread; concurrent requests share embedding forward passes and entity
+requests share ``nlp.pipe`` calls.
+"""
+
+import argparse
+import os
+import sys
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, Listener
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.services import analysis_service  # registers the metrics
+from app.services.embedding_service import embed_documents, get_sentence_encoder
+from app.services.metric_registry import AnalysisContext, run_metrics
+from app.services.ner_service import extract_entities, get_ner_pipeline
+from app.services.nlp_client import mark_worker_process, parse_address
+from app.utils.batching import MicroBatcher
+
+# Embeddings are batched by embed_documents itself, which also covers the
+# embeddings built by "score" requests
+entity_batcher = MicroBatcher(
+    extract_entities,
+    max_items=settings.NLP_WORKER_BATCH_MAX_ITEMS,
+    max_wait_ms=settings.NLP_WORKER_BATCH_MAX_WAIT_MS,
+)
+
+
+def score(
+    cv_text: str, job_description: str, keywords=None, artifacts=None, reuse=None
+):
+    return run_metrics(
+        AnalysisContext(cv_text, job_description, keywords, artifacts), reuse=reuse
+    )
+
+
+OPERATIONS: Dict[str, Callable[..., Any]] = {
+    "embed": embed_documents,
+    "entities": entity_batcher,
+    "score": score,
+    "ping": lambda: "pong",
+}
+
+
+def handle_connection(connection: Connection) -> None:
+    with connection:
+        while True:
+            try:
+                operation, args = connection.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                response = ("ok", OPERATIONS[operation](*args))
+            except KeyError:
+                response = ("error", f"Unknown operation: {operation}")
+            except Exception as e:
+                response = ("error", f"{type(e).__name__}: {e}")
+            connection.send(response)
+
+
+def serve(address: str, authkey: Optional[str], preload: bool = True) -> None:
+    if not authkey:
+        raise ValueError("NLP_WORKER_AUTHKEY must be set to start the NLP worker")
+    mark_worker_process()
+    if preload:
+        get_sentence_encoder()
+        get_ner_pipeline()
+
+    bind_address = parse_address(address)
+    if isinstance(bind_address, str) and os.path.exists(bind_address):
+        os.unlink(bind_address)  # left behind by a worker that was killed
+    with Listener(bind_address, authkey=authkey.encode("utf-8")) as listener:
+        print(f"NLP worker listening on {address}")
+        while True:
+            try:
+                connection = listener.accept()
+            except AuthenticationError as e:
+                print(f"Rejected NLP worker connection: {e}")
+                continue
+            threading.Thread(
+                target=handle_connection, args=(connection,), daemon=True
+            ).start()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--address", default=settings.NLP_WORKER_ADDRESS or "127.0.0.1:8765"
+    )
+    parser.add_argument(
+        "--no-preload", action="store_true", help="load models on first request"
+    )
+    args = parser.parse_args()
+    if not settings.NLP_WORKER_AUTHKEY:
+        print("NLP_WORKER_AUTHKEY must be set to start the NLP worker")
+        return 1
+    serve(args.address, settings.NLP_WORKER_AUTHKEY, preload=not args.no_preload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
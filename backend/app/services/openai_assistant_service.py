@@ -1,19 +1,29 @@
-import openai
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
-from openai.types.beta import Assistant, Thread
-from openai.types.beta.threads import Message, Run
 from pydantic import BaseModel
 
 from app.services.ai_base import AIBase
 from app.core.config import settings
+from app.core.tracing import traced
 import time
 
+if TYPE_CHECKING:
+    from openai.types.beta import Assistant, Thread
+    from openai.types.beta.threads import Message, Run
+
+
+def _openai():
+    # The SDK and its generated types take over a second to import; load them
+    # on the first API call rather than when the endpoints are imported
+    import openai
+
+    openai.api_key = settings.OPEN_AI_API_KEY
+    return openai
+
 
 class OpenAIAssistantService(AIBase):
-    def __init__(self):
-        openai.api_key = settings.OPEN_AI_API_KEY
 
+    @traced("openai.create_assistant")
     def create_assistant(
         self,
         name: str,
@@ -21,8 +31,8 @@ class OpenAIAssistantService(AIBase):
         model: str,
         tools: Optional[List[Dict[str, Any]]] = None,
         response_format: Optional[Dict[str, Any]] = None,
-    ) -> Assistant:
-        assistant = openai.beta.assistants.create(
+    ) -> "Assistant":
+        assistant = _openai().beta.assistants.create(
             name=name,
             instructions=instructions,
             model=model,
@@ -32,22 +42,28 @@ class OpenAIAssistantService(AIBase):
         return assistant
 
     @staticmethod
-    def list_assistants() -> List[Assistant]:
-        assistants = openai.beta.assistants.list()
+    @traced("openai.list_assistants")
+    def list_assistants() -> "List[Assistant]":
+        assistants = _openai().beta.assistants.list()
         return assistants
 
-    def create_thread(self) -> Thread:
-        thread = openai.beta.threads.create()
+    @traced("openai.create_thread")
+    def create_thread(self) -> "Thread":
+        thread = _openai().beta.threads.create()
         return thread
 
-    def add_message_to_thread(self, thread_id: str, role: str, content: str) -> Message:
-        message = openai.beta.threads.messages.create(
+    @traced("openai.add_message_to_thread")
+    def add_message_to_thread(
+        self, thread_id: str, role: str, content: str
+    ) -> "Message":
+        message = _openai().beta.threads.messages.create(
             thread_id=thread_id,
             role=role,
             content=content,
         )
         return message
 
+    @traced("openai.run_assistant_on_thread")
     def run_assistant_on_thread(
         self,
         thread_id: str,
@@ -55,15 +71,15 @@ class OpenAIAssistantService(AIBase):
         run_id: Optional[str] = None,
         instructions: Optional[str] = None,
         tool_outputs: Optional[List[Dict[str, Any]]] = None,
-    ) -> Run:
+    ) -> "Run":
         if tool_outputs:
-            run = openai.beta.threads.runs.submit_tool_outputs_and_poll(
+            run = _openai().beta.threads.runs.submit_tool_outputs_and_poll(
                 thread_id=thread_id,
                 run_id=run_id,  # Ensure run_id is passed correctly
                 tool_outputs=tool_outputs,
             )
         else:
-            run = openai.beta.threads.runs.create_and_poll(
+            run = _openai().beta.threads.runs.create_and_poll(
                 thread_id=thread_id,
                 assistant_id=assistant_id,
                 instructions=instructions,
@@ -71,16 +87,18 @@ class OpenAIAssistantService(AIBase):
         return run
 
     @staticmethod
+    @traced("openai.cancel_run")
     def cancel_run(run_id: str, thread_id: str):
         try:
-            openai.beta.threads.runs.cancel(run_id=run_id, thread_id=thread_id)
+            _openai().beta.threads.runs.cancel(run_id=run_id, thread_id=thread_id)
         except Exception as e:
             print(f"Error cancelling run: {e}")
 
-    def list_messages_in_thread(self, thread_id: str) -> List[Message]:
-        messages = openai.beta.threads.messages.list(
-            thread_id=thread_id
-        ).data  # NOTE: This might return this weird ass SyncCursorPage so we need to
+    @traced("openai.list_messages_in_thread")
+    def list_messages_in_thread(self, thread_id: str) -> "List[Message]":
+        messages = (
+            _openai().beta.threads.messages.list(thread_id=thread_id).data
+        )  # NOTE: This might return this weird ass SyncCursorPage so we need to
         # type
         # cast it
         return messages
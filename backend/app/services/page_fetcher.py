@@ -0,0 +1,215 @@
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.services.job_extraction import (
+    element_to_text,
+    job_posting_from_document,
+    parse_html,
+)
+from app.utils.cache import LRUCache
+
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+REQUEST_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+NON_CONTENT_TAGS = ("script", "style", "noscript", "template", "svg", "iframe")
+BOILERPLATE_TAGS = ("nav", "header", "footer", "aside", "form")
+MAIN_CONTENT_XPATH = '//main | //*[@role="main"] | //article'
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    text: str  # main content only
+    posting: Optional[Dict[str, Optional[str]]]  # schema.org JobPosting fields
+    etag: Optional[str]
+    last_modified: Optional[str]
+    validated_at: float
+    truncated: bool = False
+
+
+# Parsed pages by URL. Entries do not expire, they are revalidated with
+# If-None-Match / If-Modified-Since once older than JOB_PAGE_FRESH_SECONDS.
+page_cache = LRUCache(maxsize=settings.JOB_PAGE_CACHE_SIZE, name="job_pages")
+
+_session = requests.Session()
+_session.headers.update(REQUEST_HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=settings.JOB_FETCH_MAX_CONNECTIONS,
+    pool_maxsize=settings.JOB_FETCH_MAX_CONNECTIONS,
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
+def _main_text(document) -> str:
+    for element in document.xpath("|".join(f"//{tag}" for tag in NON_CONTENT_TAGS)):
+        element.drop_tree()
+    main = document.xpath(MAIN_CONTENT_XPATH)
+    root = main[0] if main else document
+    for element in root.xpath("|".join(f".//{tag}" for tag in BOILERPLATE_TAGS)):
+        element.drop_tree()
+    return element_to_text(root)
+
+
+def _charset(content_type: str) -> str:
+    match = re.search(r"charset=[\"']?([\w.:-]+)", content_type or "", re.I)
+    return match.group(1) if match else "utf-8"
+
+
+def _conditional_headers(cached: Optional[FetchedPage]) -> Dict[str, str]:
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+def _fresh(cached: Optional[FetchedPage]) -> bool:
+    return (
+        cached is not None
+        and time.monotonic() - cached.validated_at < settings.JOB_PAGE_FRESH_SECONDS
+    )
+
+
+def _store_page(
+    url: str,
+    status_code: int,
+    headers,
+    body: bytes,
+    truncated: bool,
+    cached: Optional[FetchedPage],
+) -> FetchedPage:
+    """Shared by the sync and async fetchers: revalidate or parse once."""
+    if status_code == 304 and cached is not None:
+        cached.validated_at = time.monotonic()
+        return cached
+    if status_code != 200:
+        raise Exception(f"Failed to fetch the URL. Status code: {status_code}")
+
+    html = body.decode(_charset(headers.get("content-type")), errors="replace")
+    document = parse_html(html)
+    posting = job_posting_from_document(document) if document is not None else None
+    page = FetchedPage(
+        url=url,
+        text=_main_text(document) if document is not None else "",
+        posting=posting,
+        etag=headers.get("etag"),
+        last_modified=headers.get("last-modified"),
+        validated_at=time.monotonic(),
+        truncated=truncated,
+    )
+    page_cache.set(url, page)
+    return page
+
+
+def fetch_page(url: str) -> FetchedPage:
+    cached = page_cache.get(url)
+    if _fresh(cached):
+        return cached
+
+    body = bytearray()
+    truncated = False
+    with _session.get(
+        url,
+        headers=_conditional_headers(cached),
+        timeout=settings.JOB_FETCH_TIMEOUT,
+        stream=True,
+    ) as response:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) >= settings.JOB_PAGE_MAX_BYTES:
+                truncated = True
+                break
+        return _store_page(
+            url,
+            response.status_code,
+            response.headers,
+            bytes(body[: settings.JOB_PAGE_MAX_BYTES]),
+            truncated,
+            cached,
+        )
+
+
+class HostLimiter:
+    """Caps concurrent requests per host and spaces out their start times."""
+
+    def __init__(self, concurrency: int, interval: float):
+        self.concurrency = concurrency
+        self.interval = interval
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._semaphores.setdefault(
+            host, asyncio.Semaphore(self.concurrency)
+        )
+        async with semaphore:
+            async with self._locks.setdefault(host, asyncio.Lock()):
+                now = asyncio.get_running_loop().time()
+                wait = self._next_start.get(host, now) - now
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start[host] = max(now, now + wait) + self.interval
+            yield
+
+
+def create_async_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        headers=REQUEST_HEADERS,
+        timeout=settings.JOB_FETCH_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=settings.JOB_FETCH_MAX_CONNECTIONS),
+    )
+
+
+async def fetch_page_async(
+    client: httpx.AsyncClient, limiter: HostLimiter, url: str
+) -> FetchedPage:
+    cached = page_cache.get(url)
+    if _fresh(cached):
+        return cached
+
+    body = bytearray()
+    truncated = False
+    async with limiter.slot(url):
+        async with client.stream(
+            "GET", url, headers=_conditional_headers(cached)
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) >= settings.JOB_PAGE_MAX_BYTES:
+                    truncated = True
+                    break
+    # Parsing is CPU-bound, keep it off the event loop
+    return await asyncio.to_thread(
+        _store_page,
+        url,
+        response.status_code,
+        response.headers,
+        bytes(body[: settings.JOB_PAGE_MAX_BYTES]),
+        truncated,
+        cached,
+    )
@@ -0,0 +1,361 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tracing import span
+from app.database import session_scope
+from app.models.cv import CV
+from app.models.job import Job
+from app.models.precompute import DocumentFeatures, MatchScore
+from app.services import nlp_client
+from app.services.analysis_service import extract_cv_text
+from app.services.document_features import (
+    cv_hash,
+    feature_artifacts,
+    feature_models,
+    get_features,
+    job_hash,
+    text_hash,
+)
+from app.services.job_embeddings import (
+    forget_job_embedding,
+    job_similarities,
+    similar_jobs,
+    store_job_embedding,
+)
+from app.services.metric_registry import METRIC_REGISTRY, AnalysisContext
+from app.services.quick_score_service import corpus_version, quick_scores
+
+precompute_executor = ThreadPoolExecutor(
+    max_workers=settings.PRECOMPUTE_WORKERS, thread_name_prefix="precompute"
+)
+
+
+@dataclass
+class PrecomputeTask:
+    kind: str  # job, cv or scores (the quick scores of one CV)
+    target_id: int
+    status: str = "queued"  # queued, running, completed, failed
+    enqueued_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+_lock = threading.Lock()
+# Waiting tasks by (kind, target_id); a write while one is waiting adds nothing
+_queued: Dict[Tuple[str, int], PrecomputeTask] = {}
+_running: Dict[int, PrecomputeTask] = {}
+_recent_failures: Deque[PrecomputeTask] = deque(maxlen=20)
+_totals = {"completed": 0, "failed": 0}
+
+
+def active_cv_id(db: Session) -> Optional[int]:
+    """The CV jobs are scored against: the configured one or the latest upload."""
+    if settings.PRECOMPUTE_ACTIVE_CV_ID is not None:
+        return settings.PRECOMPUTE_ACTIVE_CV_ID
+    return (
+        db.query(CV.id).order_by(CV.uploaded_at.desc(), CV.id.desc()).limit(1).scalar()
+    )
+
+
+def store_features(
+    db: Session, kind: str, document_id: int, content_hash: str, text: str
+) -> DocumentFeatures:
+    features = get_features(db, kind, document_id, content_hash)
+    models = feature_models()
+    if features is not None and features.models == models:
+        return features
+
+    embedding = nlp_client.encode_documents([text])[0]
+    (entities,) = nlp_client.extract_entities([text])
+    features = (
+        db.query(DocumentFeatures)
+        .filter(
+            DocumentFeatures.kind == kind,
+            DocumentFeatures.document_id == document_id,
+        )
+        .first()
+    )
+    if features is None:
+        features = DocumentFeatures(kind=kind, document_id=document_id)
+        db.add(features)
+    features.content_hash = content_hash
+    features.text = text
+    features.embedding = [float(value) for value in embedding]
+    features.entities = sorted(entities)
+    features.models = models
+    features.computed_at = datetime.utcnow()
+    db.commit()
+    return features
+
+
+def precompute_job(job_id: int) -> None:
+    with session_scope() as db:
+        job_entry = db.query(Job).filter(Job.id == job_id).first()
+        if not job_entry:
+            return  # deleted in the meantime
+        with span("precompute.job_features"):
+            features = store_features(
+                db, "job", job_id, job_hash(job_entry), str(job_entry.description)
+            )
+        store_job_embedding(job_id, features.embedding)
+        cv_id = active_cv_id(db)
+    # Every job's TF-IDF cosine moves with the corpus, rescore the whole row
+    if cv_id is not None:
+        enqueue("scores", cv_id)
+
+
+def precompute_cv(cv_id: int) -> None:
+    with session_scope() as db:
+        cv_entry = db.query(CV).filter(CV.id == cv_id).first()
+        if not cv_entry:
+            return
+        with span("precompute.cv_features"):
+            store_features(
+                db, "cv", cv_id, cv_hash(cv_entry), extract_cv_text(cv_entry)
+            )
+    score_cv(cv_id)
+
+
+def score_cv(cv_id: int) -> None:
+    """Store the quick scores of one CV against every job, plus the BERT and
+    NER similarities where both documents have precomputed features."""
+    with session_scope() as db:
+        cv_entry = db.query(CV).filter(CV.id == cv_id).first()
+        if not cv_entry:
+            return
+        # Read first, a job written while scoring leaves the rows stale
+        version = corpus_version(db)
+        # Also refits and caches the job corpus TF-IDF vectors
+        with span("precompute.quick_scores"):
+            results = quick_scores(db, cv_entry)
+
+        cv_features = get_features(db, "cv", cv_id, cv_hash(cv_entry))
+        job_features = {}
+        similarities = {}
+        if cv_features is not None:
+            # BERT similarity to every indexed job in one mat-vec
+            similarities = job_similarities(cv_features.embedding)
+            descriptions = dict(db.query(Job.id, Job.description))
+            job_features = {
+                features.document_id: features
+                for features in db.query(DocumentFeatures).filter(
+                    DocumentFeatures.kind == "job"
+                )
+                if features.document_id in descriptions
+                and features.content_hash
+                == text_hash(str(descriptions[features.document_id]))
+            }
+
+        existing = {
+            row.job_id: row
+            for row in db.query(MatchScore).filter(MatchScore.cv_id == cv_id)
+        }
+        with span("precompute.store_scores", jobs=len(results)):
+            for result in results:
+                row = existing.pop(result["job_id"], None)
+                if row is None:
+                    row = MatchScore(cv_id=cv_id, job_id=result["job_id"])
+                    db.add(row)
+                row.keyword_match_score = result["keyword_match_score"]
+                row.jaccard_similarity_score = result["jaccard_similarity_score"]
+                row.tfidf_cosine_score = result["tfidf_cosine_score"]
+                row.quick_score = result["quick_score"]
+                row.corpus_version = version
+                row.bert_similarity_score = None
+                row.ner_similarity_score = None
+                row.computed_at = datetime.utcnow()
+
+                artifacts = feature_artifacts(
+                    cv_features, job_features.get(result["job_id"])
+                )
+                if artifacts:
+                    context = AnalysisContext("", "", artifacts=artifacts)
+                    if "embeddings" in artifacts:
+                        row.bert_similarity_score = similarities.get(result["job_id"])
+                        if row.bert_similarity_score is None:
+                            row.bert_similarity_score = METRIC_REGISTRY[
+                                "bert_similarity"
+                            ].func(context)
+                    if "entities" in artifacts:
+                        row.ner_similarity_score = METRIC_REGISTRY[
+                            "ner_similarity"
+                        ].func(context)
+            # Scores of jobs deleted since the last run
+            for row in existing.values():
+                db.delete(row)
+            db.commit()
+
+
+TASKS: Dict[str, Callable[[int], None]] = {
+    "job": precompute_job,
+    "cv": precompute_cv,
+    "scores": score_cv,
+}
+
+
+def _run(task: PrecomputeTask) -> None:
+    with _lock:
+        _queued.pop((task.kind, task.target_id), None)
+        task.status = "running"
+        _running[id(task)] = task
+    try:
+        TASKS[task.kind](task.target_id)
+        task.status = "completed"
+    except Exception as e:
+        print(f"Precompute {task.kind} {task.target_id} failed: {e}")
+        task.status = "failed"
+        task.error = str(e)
+    task.finished_at = datetime.utcnow()
+    with _lock:
+        _running.pop(id(task), None)
+        _totals[task.status] += 1
+        if task.status == "failed":
+            _recent_failures.append(task)
+
+
+def enqueue(kind: str, target_id: int) -> Optional[PrecomputeTask]:
+    """Schedule a precompute task unless the same one is already waiting.
+
+    No-op unless ``PRECOMPUTE_ON_WRITE`` is set.
+    """
+    if not settings.PRECOMPUTE_ON_WRITE:
+        return None
+    key = (kind, target_id)
+    with _lock:
+        task = _queued.get(key)
+        if task is not None:
+            return task
+        task = _queued[key] = PrecomputeTask(kind=kind, target_id=target_id)
+    precompute_executor.submit(_run, task)
+    return task
+
+
+def enqueue_job(job_id: int) -> Optional[PrecomputeTask]:
+    return enqueue("job", job_id)
+
+
+def enqueue_cv(cv_id: int) -> Optional[PrecomputeTask]:
+    return enqueue("cv", cv_id)
+
+
+def forget_job(db: Session, job_id: int) -> None:
+    """Drop the precomputed data of a deleted job, the caller commits."""
+    db.query(DocumentFeatures).filter(
+        DocumentFeatures.kind == "job", DocumentFeatures.document_id == job_id
+    ).delete(synchronize_session=False)
+    db.query(MatchScore).filter(MatchScore.job_id == job_id).delete(
+        synchronize_session=False
+    )
+
+
+def unindex_job(job_id: int) -> None:
+    """Drop a deleted job from the embedding matrix, once the delete committed.
+
+    A failure is only logged: the dead row is skipped by every search, since
+    its job no longer exists, and goes away on the next rebuild.
+    """
+    try:
+        forget_job_embedding(job_id)
+    except Exception as e:
+        print(f"Failed to unindex job {job_id}: {e}")
+
+
+def stored_quick_scores(db: Session, cv_id: int) -> Optional[List[Dict]]:
+    """Precomputed quick scores of a CV, best match first.
+
+    None unless precompute is enabled and every job has a row scored against
+    the current jobs, the caller then scores live. Rows go stale on any job
+    write until the queued rescore has run.
+    """
+    if not settings.PRECOMPUTE_ON_WRITE:
+        return None
+    version = corpus_version(db)
+    rows = (
+        db.query(MatchScore, Job.title, Job.company)
+        .join(Job, Job.id == MatchScore.job_id)
+        .filter(MatchScore.cv_id == cv_id)
+        .order_by(MatchScore.quick_score.desc())
+        .all()
+    )
+    if not rows or len(rows) != db.query(func.count(Job.id)).scalar():
+        return None
+    if any(row.corpus_version != version for row, _, _ in rows):
+        return None
+    return [
+        {
+            "job_id": row.job_id,
+            "title": title,
+            "company": company,
+            "keyword_match_score": row.keyword_match_score,
+            "jaccard_similarity_score": row.jaccard_similarity_score,
+            "tfidf_cosine_score": row.tfidf_cosine_score,
+            "quick_score": row.quick_score,
+            "bert_similarity_score": row.bert_similarity_score,
+            "ner_similarity_score": row.ner_similarity_score,
+        }
+        for row, title, company in rows
+    ]
+
+
+def cv_embedding(db: Session, cv_entry: CV) -> List[float]:
+    """The stored embedding of a CV, computed first if missing or stale."""
+    content_hash = cv_hash(cv_entry)
+    features = get_features(db, "cv", cv_entry.id, content_hash)
+    if features is None or features.models != feature_models():
+        features = store_features(
+            db, "cv", cv_entry.id, content_hash, extract_cv_text(cv_entry)
+        )
+    return features.embedding
+
+
+def similar_job_scores(db: Session, cv_entry: CV, limit: int) -> List[Dict]:
+    """Indexed jobs closest to a CV by BERT similarity, best match first."""
+    ranked = similar_jobs(cv_embedding(db, cv_entry), limit)
+    jobs = {
+        job.id: job
+        for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in ranked]))
+    }
+    return [
+        {
+            "job_id": job_id,
+            "title": jobs[job_id].title,
+            "company": jobs[job_id].company,
+            "bert_similarity_score": score,
+        }
+        for job_id, score in ranked
+        if job_id in jobs
+    ]
+
+
+def precompute_status(db: Session) -> Dict:
+    with _lock:
+        queued = list(_queued.values())
+        running = list(_running.values())
+        failures = list(_recent_failures)
+        totals = dict(_totals)
+    features = dict(
+        db.query(DocumentFeatures.kind, func.count(DocumentFeatures.id)).group_by(
+            DocumentFeatures.kind
+        )
+    )
+    return {
+        "enabled": settings.PRECOMPUTE_ON_WRITE,
+        "workers": settings.PRECOMPUTE_WORKERS,
+        "active_cv_id": active_cv_id(db),
+        "queued": queued,
+        "running": running,
+        "completed": totals["completed"],
+        "failed": totals["failed"],
+        "recent_failures": failures,
+        "cv_features": features.get("cv", 0),
+        "job_features": features.get("job", 0),
+        "match_scores": db.query(func.count(MatchScore.id)).scalar(),
+    }
@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.cv import CV
+from app.models.job import Job
+from app.services.analysis_service import (
+    DEFAULT_ESSENTIAL_KEYWORDS,
+    extract_cv_text,
+)
+from app.services.metric_registry import weighted_mean
+from app.utils.cache import LRUCache
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+@dataclass
+class JobCorpus:
+    job_ids: List[int]
+    titles: List[str]
+    companies: List[str]
+    token_sets: List[set]
+    vectorizer: "TfidfVectorizer"
+    matrix: object  # sparse, L2-normalised TF-IDF rows, one per job
+
+
+# Only the latest corpus matters, a couple of entries covers concurrent edits
+corpus_cache = LRUCache(maxsize=4, name="job_corpus")
+
+
+def corpus_version(db: Session) -> str:
+    """Changes whenever a job is created, updated or deleted.
+
+    One aggregate query instead of hashing every description: a write bumps
+    ``updated_at``, a new job the max id and a delete the count.
+    """
+    count, max_id, last_update = db.query(
+        func.count(Job.id), func.max(Job.id), func.max(Job.updated_at)
+    ).one()
+    return f"{count}:{max_id}:{last_update.isoformat() if last_update else ''}"
+
+
+def get_job_corpus(db: Session) -> Optional[JobCorpus]:
+    key = corpus_version(db)
+    corpus = corpus_cache.get(key)
+    if corpus is None:
+        rows = (
+            db.query(Job.id, Job.title, Job.company, Job.description)
+            .order_by(Job.id)
+            .all()
+        )
+        if not rows:
+            return None
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        descriptions = [str(row[3]) for row in rows]
+        vectorizer = TfidfVectorizer()
+        corpus = JobCorpus(
+            job_ids=[row[0] for row in rows],
+            titles=[row[1] for row in rows],
+            companies=[row[2] for row in rows],
+            token_sets=[set(text.lower().split()) for text in descriptions],
+            vectorizer=vectorizer,
+            matrix=vectorizer.fit_transform(descriptions),
+        )
+        corpus_cache.set(key, corpus)
+    return corpus
+
+
+def quick_scores(db: Session, cv_entry: CV) -> List[Dict]:
+    """Lexical-only match of one CV against every job, best match first.
+
+    Uses keyword matching, Jaccard and a corpus-level TF-IDF cosine. Nothing is
+    persisted and neither BERT nor spaCy is loaded.
+    """
+    corpus = get_job_corpus(db)
+    if corpus is None:
+        return []
+
+    cv_text = extract_cv_text(cv_entry)
+    cv_words = set(cv_text.lower().split())
+    keywords = set(DEFAULT_ESSENTIAL_KEYWORDS)
+    # Rows are L2-normalised, so one sparse mat-vec gives every cosine
+    cosines = (corpus.matrix @ corpus.vectorizer.transform([cv_text]).T).toarray()[:, 0]
+
+    results = []
+    for index, job_id in enumerate(corpus.job_ids):
+        job_words = corpus.token_sets[index]
+        shared = cv_words.intersection(job_words)
+        keyword_score = round(len(shared & keywords) / len(keywords) * 100, 2)
+        union = cv_words.union(job_words)
+        jaccard_score = round(len(shared) / len(union) * 100, 2) if union else 0.0
+        cosine_score = round(float(cosines[index]) * 100, 2)
+        results.append(
+            {
+                "job_id": job_id,
+                "title": corpus.titles[index],
+                "company": corpus.companies[index],
+                "keyword_match_score": keyword_score,
+                "jaccard_similarity_score": jaccard_score,
+                "tfidf_cosine_score": cosine_score,
+                "quick_score": round(
+                    weighted_mean(
+                        {
+                            "keyword_match": keyword_score,
+                            "jaccard_similarity": jaccard_score,
+                            "cosine_similarity": cosine_score,
+                        }
+                    ),
+                    2,
+                ),
+            }
+        )
+
+    results.sort(key=lambda item: item["quick_score"], reverse=True)
+    return results
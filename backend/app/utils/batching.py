@@ -0,0 +1,82 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Sequence, Tuple
+
+
+class MicroBatcher:
+    """Merge concurrent calls of a list -> list function into one call.
+
+    Each call queues its items and blocks; a background thread collects
+    requests until ``max_items`` items are pending or ``max_wait_ms`` passed
+    since the first one, runs ``func`` once on all of them and hands every
+    caller its own slice of the result.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[List[Any]], Sequence[Any]],
+        max_items: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.func = func
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue[Tuple[List[Any], Future]]" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def __call__(self, items: Sequence[Any]) -> Sequence[Any]:
+        items = list(items)
+        if not items:
+            return self.func(items)
+        self._ensure_thread()
+        future: Future = Future()
+        self._queue.put((items, future))
+        return future.result()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="micro-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            pending = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while pending < self.max_items:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                pending += len(request[0])
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[List[Any], Future]]) -> None:
+        items = [item for request_items, _ in batch for item in request_items]
+        try:
+            results = self.func(items)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.items += len(items)
+        offset = 0
+        for request_items, future in batch:
+            future.set_result(results[offset : offset + len(request_items)])
+            offset += len(request_items)
@@ -0,0 +1,297 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DTYPES = ("float32", "float16")
+
+
+class EmbeddingMatrix:
+    """Unit-normalised embeddings in a memory-mapped file, one row per id.
+
+    ``{path}.json`` holds the dimension, dtype, model tag and the id of every
+    row (``None`` for deleted rows); the vectors live in ``{path}.{n}.bin``
+    with ``n`` the compaction generation. Rows are only ever appended: a
+    ``put`` of a known id tombstones its old row, and ``compact`` rewrites the
+    file once too many rows are dead. The metadata is replaced atomically
+    after the vectors are flushed, so a reader never sees a half-written row.
+
+    Any number of processes can open the same path read-only; the rows are
+    mapped, not loaded, so they share the page cache instead of each holding
+    a copy. Writers serialise on ``{path}.lock`` and may live in several
+    processes. Readers pick up writes on ``refresh``, which ``search`` calls.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dtype: str = "float32",
+        readonly: bool = False,
+        compact_ratio: float = 0.25,
+    ):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.path = path
+        self.dtype = dtype
+        self.readonly = readonly
+        self.compact_ratio = compact_ratio
+        self.meta: Dict = self._empty_meta(None, None)
+        self._meta_stamp: Optional[Tuple[int, int, int]] = None
+        # (row vectors, row ids, live row mask, id -> row), swapped as a whole
+        self._view = (np.zeros((0, 0), dtype=dtype), np.zeros(0, np.int64), None, {})
+        self._lock = threading.Lock()
+        self.refresh()
+
+    @property
+    def meta_path(self) -> str:
+        return f"{self.path}.json"
+
+    def _data_path(self, generation: int) -> str:
+        return f"{self.path}.{generation}.bin"
+
+    def _empty_meta(self, dim: Optional[int], model: Optional[str]) -> Dict:
+        return {
+            "dim": dim,
+            "dtype": self.dtype,
+            "model": model,
+            "generation": 0,
+            "ids": [],
+        }
+
+    def _stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.meta_path)
+        except FileNotFoundError:
+            return None
+        # A replaced file can get the inode of the one before, hence the rest
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _write_meta(self, meta: Dict) -> None:
+        with open(f"{self.meta_path}.tmp", "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{self.meta_path}.tmp", self.meta_path)
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        if self.readonly:
+            raise PermissionError(f"{self.path} is opened read-only")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another process may have written since the last refresh
+                self.refresh()
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _map(self, meta: Dict, rows: int, mode: str = "r") -> np.ndarray:
+        if not rows:
+            return np.zeros((0, meta["dim"] or 0), dtype=meta["dtype"])
+        return np.memmap(
+            self._data_path(meta["generation"]),
+            dtype=meta["dtype"],
+            mode=mode,
+            shape=(rows, meta["dim"]),
+        )
+
+    def refresh(self) -> bool:
+        """Reload the metadata and remap the rows if the files changed."""
+        stamp = self._stamp()
+        if stamp == self._meta_stamp:
+            return False
+        for _ in range(3):
+            if stamp is None:
+                meta = self._empty_meta(None, None)
+                vectors = self._map(meta, 0)
+                break
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            try:
+                vectors = self._map(meta, len(meta["ids"]))
+                break
+            except FileNotFoundError:
+                # Compacted between reading the metadata and mapping the file
+                stamp = self._stamp()
+        else:
+            raise RuntimeError(f"{self.path} keeps changing, cannot open it")
+        if meta["dtype"] != self.dtype:
+            raise ValueError(
+                f"{self.path} stores {meta['dtype']}, opened as {self.dtype}"
+            )
+
+        ids = np.asarray([-1 if i is None else i for i in meta["ids"]], np.int64)
+        alive = ids >= 0
+        rows = {int(i): row for row, i in enumerate(ids) if i >= 0}
+        self.meta = meta
+        self._meta_stamp = stamp
+        self._view = (vectors, ids, None if alive.all() else alive, rows)
+        return True
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.meta["dim"]
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.meta["model"]
+
+    @property
+    def tombstones(self) -> int:
+        return len(self.meta["ids"]) - len(self._view[3])
+
+    def __len__(self) -> int:
+        return len(self._view[3])
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._view[3]
+
+    def ids(self) -> List[int]:
+        return list(self._view[3])
+
+    def vector(self, item_id: int) -> np.ndarray:
+        vectors, _, _, rows = self._view
+        return np.asarray(vectors[rows[item_id]], dtype=np.float32)
+
+    def scores(self, query: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine similarity of ``query`` to every live row, with the row ids.
+
+        One matrix-vector product over the mapped rows. float16 rows are cast
+        and accumulated in float32, which skips BLAS and is several times
+        slower.
+        """
+        vectors, ids, alive, _ = self._view
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not len(ids) or not norm:
+            return np.zeros(0, np.float32), np.zeros(0, np.int64)
+        scores = np.matmul(vectors, query / norm, dtype=np.float32)
+        if alive is None:
+            return scores, ids
+        return scores[alive], ids[alive]
+
+    def search(self, query: Sequence[float], k: int = 10) -> List[Tuple[int, float]]:
+        """The ``k`` most similar ids to ``query``, best first."""
+        self.refresh()
+        scores, ids = self.scores(query)
+        if k <= 0:
+            return []
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[row]), float(scores[row])) for row in top]
+
+    def reset(self, dim: Optional[int], model: Optional[str] = None) -> None:
+        """Drop every row, e.g. when the embedding model changed."""
+        with self._write_lock():
+            self._reset(dim, model)
+
+    def _reset(self, dim: Optional[int], model: Optional[str]) -> None:
+        previous = self.meta["generation"]
+        meta = self._empty_meta(dim, model)
+        meta["generation"] = previous + 1
+        self._write_meta(meta)
+        self._remove_data(previous)
+        self.refresh()
+
+    def put(
+        self,
+        item_ids: Sequence[int],
+        vectors: Sequence[Sequence[float]],
+        model: Optional[str] = None,
+    ) -> None:
+        """Append or replace the vectors of ``item_ids``.
+
+        With ``model`` given, rows stored under another model tag are dropped
+        first, under the same lock as the append.
+        """
+        if not len(item_ids):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(item_ids), -1)
+        # The last vector wins when an id is given twice
+        latest = {int(item_id): index for index, item_id in enumerate(item_ids)}
+        item_ids = list(latest)
+        vectors = vectors[list(latest.values())]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1)
+
+        with self._write_lock():
+            if model is not None and model != self.meta["model"]:
+                self._reset(None, model)
+            meta = dict(self.meta, ids=list(self.meta["ids"]))
+            if meta["dim"] is None:
+                meta["dim"] = vectors.shape[1]
+            if vectors.shape[1] != meta["dim"]:
+                raise ValueError(
+                    f"Expected {meta['dim']}-dimensional vectors, "
+                    f"got {vectors.shape[1]}"
+                )
+            rows = self._view[3]
+            for item_id in item_ids:
+                if item_id in rows:
+                    meta["ids"][rows[item_id]] = None
+
+            start = len(meta["ids"])
+            end = start + len(item_ids)
+            itemsize = np.dtype(self.dtype).itemsize
+            with open(self._data_path(meta["generation"]), "ab") as f:
+                f.truncate(end * meta["dim"] * itemsize)
+            data = self._map(meta, end, mode="r+")
+            data[start:end] = vectors
+            data.flush()
+            del data
+            meta["ids"].extend(item_ids)
+            self._write_meta(meta)
+            self.refresh()
+            if self.tombstones > self.compact_ratio * len(meta["ids"]):
+                self._compact()
+
+    def delete(self, item_ids: Iterable[int]) -> int:
+        """Tombstone the rows of ``item_ids``, returns how many were stored."""
+        with self._write_lock():
+            rows = self._view[3]
+            dead = [rows[item_id] for item_id in item_ids if item_id in rows]
+            if not dead:
+                return 0
+            meta = dict(self.meta, ids=list(self.meta["ids"]))
+            for row in dead:
+                meta["ids"][row] = None
+            self._write_meta(meta)
+            self.refresh()
+            if self.tombstones > self.compact_ratio * len(meta["ids"]):
+                self._compact()
+        return len(dead)
+
+    def compact(self) -> None:
+        """Rewrite the file without its tombstoned rows."""
+        with self._write_lock():
+            self._compact()
+
+    def _compact(self) -> None:
+        vectors, ids, alive, _ = self._view
+        meta = dict(self.meta, generation=self.meta["generation"] + 1)
+        keep = np.flatnonzero(alive) if alive is not None else np.arange(len(ids))
+        meta["ids"] = [int(ids[row]) for row in keep]
+        data = self._map(meta, len(keep), mode="w+")
+        if len(keep):
+            data[:] = vectors[keep]
+            data.flush()
+        del data
+        self._write_meta(meta)
+        # Readers that still map the old file keep it until they refresh
+        self._remove_data(meta["generation"] - 1)
+        self.refresh()
+
+    def _remove_data(self, generation: int) -> None:
+        try:
+            os.remove(self._data_path(generation))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,70 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(jsonable_encoder(list(values)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _cursor_value(value: Any, kind: type) -> Any:
+    if kind is datetime and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if kind is int and isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if kind is str and isinstance(value, str):
+        return value
+    raise ValueError(f"Expected {kind.__name__}, got {value!r}")
+
+
+def decode_cursor(cursor: str, *kinds: type) -> List[Any]:
+    """The values of an ``encode_cursor`` cursor, one per type in ``kinds``.
+
+    Only ``int``, ``str`` and ``datetime`` (ISO strings) are supported; a
+    cursor of another shape is a 400, not a failed query.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(kinds):
+            raise ValueError("Wrong number of values")
+        return [_cursor_value(value, kind) for value, kind in zip(values, kinds)]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+def parse_fields(
+    fields: Optional[str], allowed: Sequence[str], required: Sequence[str] = ("id",)
+) -> Optional[List[str]]:
+    """Validate a ``fields=a,b`` projection; the keyset columns are always kept."""
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. "
+            f"Allowed: {', '.join(allowed)}.",
+        )
+    return list(dict.fromkeys([*required, *selected]))
+
+
+def project(row: Any, fields: List[str]) -> Dict[str, Any]:
+    return {field: getattr(row, field) for field in fields}
+
+
+def etag_response(
+    request: Request, payload: Any, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":"))
+    etag = f'W/"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+    headers = {**(headers or {}), "ETag": etag}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
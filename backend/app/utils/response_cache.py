@@ -0,0 +1,133 @@
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Optional, Set
+
+from app.core.config import settings
+from app.utils.cache import LRUCache, register_cache
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int, ttl: Optional[float]):
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl, on_evict=self._unindex)
+        # Only keys still in the cache, so the index is bounded by its size
+        self._namespaces: Dict[str, Set[str]] = defaultdict(set)
+        self._key_namespaces: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _unindex(self, key: str) -> None:
+        with self._lock:
+            namespace = self._key_namespaces.pop(key, None)
+            keys = self._namespaces.get(namespace)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._namespaces[namespace]
+
+    def get(self, key: str) -> Any:
+        return self.cache.get(key, _MISSING)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        # Indexed first, so an eviction right after the insert unindexes it
+        with self._lock:
+            self._namespaces[namespace].add(key)
+            self._key_namespaces[key] = namespace
+        self.cache.set(key, value)
+
+    def delete(self, key: str) -> None:
+        self.cache.pop(key)
+        self._unindex(key)
+
+    def delete_namespace(self, namespace: str) -> None:
+        with self._lock:
+            keys = self._namespaces.pop(namespace, set())
+            for key in keys:
+                self._key_namespaces.pop(key, None)
+        for key in keys:
+            self.cache.pop(key)
+
+
+class RedisBackend:
+    """Shares entries between workers. Values are stored as JSON, so only
+    JSON-compatible payloads can be cached."""
+
+    prefix = "response-cache:"
+
+    def __init__(self, url: str, ttl: Optional[float]):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = int(ttl) if ttl else None
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.prefix + key)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        index = f"{self.prefix}ns:{namespace}"
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+        pipe.sadd(index, key)
+        if self.ttl:
+            pipe.expire(index, self.ttl)
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def delete_namespace(self, namespace: str) -> None:
+        index = f"{self.prefix}ns:{namespace}"
+        keys = [self.prefix + key.decode() for key in self.client.smembers(index)]
+        self.client.delete(index, *keys)
+
+
+class ResponseCache:
+    """Read-through cache for serialised GET responses.
+
+    Entries are grouped by namespace (usually the route) and keyed by the
+    route params; writers invalidate a single key or a whole namespace.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(namespace: str, key: Hashable) -> str:
+        return f"{namespace}|{key}"
+
+    def get(self, namespace: str, key: Hashable = "") -> Optional[Any]:
+        value = self.backend.get(self._key(namespace, key))
+        if value is _MISSING:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        self.backend.set(namespace, self._key(namespace, key), value)
+
+    def invalidate(self, namespace: str, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self.backend.delete_namespace(namespace)
+        else:
+            self.backend.delete(self._key(namespace, key))
+
+
+def create_response_cache() -> ResponseCache:
+    if settings.RESPONSE_CACHE_REDIS_URL:
+        backend = RedisBackend(
+            settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_TTL
+        )
+    else:
+        backend = MemoryBackend(
+            settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL
+        )
+    return ResponseCache(backend)
+
+
+response_cache = create_response_cache()
+register_cache("response", response_cache)
@@ -0,0 +1,421 @@
+"""Benchmark the CV/job analysis engine.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_analysis --output before.json
+    python -m benchmarks.bench_analysis --compare before.json --output after.json
+
+Times every registered artifact and metric, ``analyze_cv`` end to end on a
+scratch SQLite database, one CV scored against a batch of jobs, and cold
+versus warm model loads. Corpora are synthetic texts of several sizes plus
+the CV/job files in ``benchmarks/fixtures`` (``cv_*.txt|pdf``, ``job_*.txt``).
+Text extraction is only timed for PDF fixtures; otherwise ``analyze_cv``
+starts with the CV text already in ``cv_text_cache``.
+
+Results are median/p95 milliseconds keyed ``<corpus>/<stage>/<name>``.
+``--compare`` prints the change against a previous run and exits non-zero
+when a median got slower by more than ``--max-regression`` percent.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.base import Base
+from app.models import (
+    conversation,
+    assistant,
+    analysis,
+    cv,
+    job,
+    message,
+    run,
+    tool,
+    assessment,
+    precompute,
+    trace,
+)
+from app.models.analysis import AnalysisResult
+from app.models.conversation import Conversation
+from app.models.cv import CV
+from app.models.job import Job
+from app.models.precompute import DocumentFeatures, MatchScore
+from app.models.trace import TraceSpan
+from app.services import analysis_service
+from app.services.metric_registry import (
+    ARTIFACT_BUILDERS,
+    AnalysisContext,
+    enabled_metrics,
+    run_metrics,
+)
+from app.services.quick_score_service import corpus_cache, quick_scores
+from benchmarks.bench_embedding_backends import synthetic_texts
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+# Words per (CV, job description)
+SIZES = {"small": (250, 120), "medium": (800, 400), "large": (2500, 1200)}
+STAGES = ("artifacts", "metrics", "analyze_cv", "batch", "model_load")
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "runs": len(ordered),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+def record(results: Dict, key: str, func: Callable[[], Dict]) -> None:
+    """Run one measurement; a missing model or package fails only its key."""
+    try:
+        results[key] = func()
+    except Exception as e:
+        results[key] = {"error": f"{type(e).__name__}: {e}"}
+        print(f"{key}: {results[key]['error']}", file=sys.stderr)
+
+
+def load_corpora(sizes: List[str], batch_jobs: int, fixtures: bool) -> Dict:
+    corpora = {}
+    for size in sizes:
+        cv_words, job_words = SIZES[size]
+        cv_text = synthetic_texts(1, cv_words, seed=1)[0]
+        jobs = synthetic_texts(batch_jobs, job_words, seed=2)
+        corpora[f"synthetic-{size}"] = (cv_text, jobs, {})
+
+    if fixtures:
+        jobs = [path.read_text() for path in sorted(FIXTURE_DIR.glob("job_*.txt"))]
+        for path in sorted(FIXTURE_DIR.glob("cv_*")):
+            extraction = {}
+            if path.suffix == ".pdf":
+                started = time.perf_counter()
+                cv_text = analysis_service.extract_text_from_pdf(str(path))
+                extraction["text_extraction"] = (time.perf_counter() - started) * 1000
+            else:
+                cv_text = path.read_text()
+            corpora[f"fixture-{path.stem}"] = (cv_text, jobs, extraction)
+    return corpora
+
+
+def bench_artifacts(results: Dict, cv_text: str, job_text: str, repeat: int) -> None:
+    # Built in registration order on the same contexts, so each timing
+    # excludes the artifacts it depends on
+    contexts = [AnalysisContext(cv_text, job_text) for _ in range(repeat)]
+    for name in ARTIFACT_BUILDERS:
+        iterator = iter(contexts)
+        record(results, name, lambda: measure(lambda: next(iterator).get(name), repeat))
+
+
+def bench_metrics(results: Dict, cv_text: str, job_text: str, repeat: int) -> None:
+    context = AnalysisContext(cv_text, job_text)
+    for spec in enabled_metrics():
+
+        def warm_measure(spec=spec):
+            for name in spec.needs:
+                context.get(name)
+            return measure(lambda: spec.func(context), repeat)
+
+        record(results, spec.name, warm_measure)
+    # Everything a single analysis pays, artifacts included
+    record(
+        results,
+        "total_cold",
+        lambda: measure(
+            lambda: run_metrics(AnalysisContext(cv_text, job_text)), repeat
+        ),
+    )
+
+
+class ScratchDatabase:
+    def __init__(self, workdir: str):
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+        Base.metadata.create_all(
+            engine,
+            tables=[
+                CV.__table__,
+                Job.__table__,
+                Conversation.__table__,
+                AnalysisResult.__table__,
+                # Read by analyze_cv for precomputed features
+                DocumentFeatures.__table__,
+                MatchScore.__table__,
+                TraceSpan.__table__,
+            ],
+        )
+        self.session = sessionmaker(bind=engine)()
+        # Traces are saved through the app's own sessions, keep them here too
+        SessionLocal.configure(bind=engine)
+        self.workdir = workdir
+
+    def add_cv(self, cv_text: str) -> CV:
+        # Placeholder PDF whose text is seeded into the extraction cache
+        path = os.path.join(self.workdir, f"{uuid.uuid4().hex}.pdf")
+        Path(path).touch()
+        analysis_service.cv_text_cache.set((path, os.path.getmtime(path)), cv_text)
+        cv_entry = CV(filename=os.path.basename(path), filepath=path)
+        self.session.add(cv_entry)
+        self.session.commit()
+        return cv_entry
+
+    def add_jobs(self, texts: List[str]) -> List[int]:
+        jobs = [
+            Job(title="Benchmark", status="benchmark", description=text, company="-")
+            for text in texts
+        ]
+        self.session.add_all(jobs)
+        self.session.commit()
+        return [job.id for job in jobs]
+
+    def add_conversations(self, cv_id: int, job_id: int, count: int) -> List:
+        conversations = [
+            Conversation(
+                id=uuid.uuid4().hex, cv_id=cv_id, job_id=job_id, assistant_id="-"
+            )
+            for _ in range(count)
+        ]
+        self.session.add_all(conversations)
+        self.session.commit()
+        return conversations
+
+
+def bench_analyze_cv(
+    results: Dict,
+    database: ScratchDatabase,
+    cv_text: str,
+    job_text: str,
+    repeat: int,
+) -> None:
+    cv_id = database.add_cv(cv_text).id
+    (job_id,) = database.add_jobs([job_text])
+    # A new conversation per run, otherwise the stored result is returned
+    conversations = iter(database.add_conversations(cv_id, job_id, repeat))
+
+    def analyze():
+        analysis_service.analyze_cv(
+            cv_id, job_id, next(conversations), session=database.session
+        )
+
+    record(results, "end_to_end", lambda: measure(analyze, repeat))
+
+
+def bench_batch(
+    results: Dict,
+    database: ScratchDatabase,
+    cv_text: str,
+    jobs: List[str],
+    repeat: int,
+) -> None:
+    cv_entry = database.add_cv(cv_text)
+    database.session.query(Job).delete()
+    database.add_jobs(jobs)
+
+    def quick_cold():
+        corpus_cache.clear()
+        quick_scores(database.session, cv_entry)
+
+    record(
+        results,
+        f"run_metrics_x{len(jobs)}",
+        lambda: measure(
+            lambda: [run_metrics(AnalysisContext(cv_text, text)) for text in jobs],
+            repeat,
+        ),
+    )
+    record(
+        results,
+        f"quick_scores_cold_x{len(jobs)}",
+        lambda: measure(quick_cold, repeat),
+    )
+    record(
+        results,
+        f"quick_scores_warm_x{len(jobs)}",
+        lambda: measure(lambda: quick_scores(database.session, cv_entry), repeat),
+    )
+
+
+MODEL_LOADERS = {
+    "sentence_encoder": (
+        "app.services.embedding_service",
+        "get_sentence_encoder",
+    ),
+    "ner_pipeline": ("app.services.ner_service", "get_ner_pipeline"),
+}
+
+
+def bench_model_load(repeat: int) -> Dict[str, Dict]:
+    import importlib
+
+    results = {}
+    for name, (module_name, loader_name) in MODEL_LOADERS.items():
+        # Fresh interpreter: imports, weights from disk, nothing cached
+        snippet = (
+            "import time; started = time.perf_counter(); "
+            f"from {module_name} import {loader_name}; {loader_name}(); "
+            "print((time.perf_counter() - started) * 1000)"
+        )
+
+        def process_cold():
+            completed = subprocess.run(
+                [sys.executable, "-c", snippet],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=Path(__file__).resolve().parents[1],
+            )
+            return float(completed.stdout.strip().splitlines()[-1])
+
+        record(
+            results,
+            f"{name}/process_cold",
+            lambda: summarize([process_cold() for _ in range(repeat)]),
+        )
+
+        loader = getattr(importlib.import_module(module_name), loader_name)
+
+        def reload():
+            loader.cache_clear()
+            loader()
+
+        record(results, f"{name}/in_process_reload", lambda: measure(reload, repeat))
+        record(results, f"{name}/warm", lambda: measure(loader, repeat))
+    return results
+
+
+def run_benchmarks(args) -> Dict[str, Dict]:
+    corpora = load_corpora(args.sizes, args.batch_jobs, not args.no_fixtures)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench-analysis-") as workdir:
+        database = ScratchDatabase(workdir)
+        for corpus_name, (cv_text, jobs, extraction) in corpora.items():
+            job_text = jobs[0]
+            for name, elapsed in extraction.items():
+                results[f"{corpus_name}/extraction/{name}"] = summarize([elapsed])
+
+            stages = {
+                "artifacts": lambda out: bench_artifacts(
+                    out, cv_text, job_text, args.repeat
+                ),
+                "metrics": lambda out: bench_metrics(
+                    out, cv_text, job_text, args.repeat
+                ),
+                "analyze_cv": lambda out: bench_analyze_cv(
+                    out, database, cv_text, job_text, args.repeat
+                ),
+                "batch": lambda out: bench_batch(
+                    out, database, cv_text, jobs, args.repeat
+                ),
+            }
+            for stage, func in stages.items():
+                if stage not in args.stages:
+                    continue
+                stage_results = {}
+                func(stage_results)
+                for name, result in stage_results.items():
+                    results[f"{corpus_name}/{stage}/{name}"] = result
+
+    if "model_load" in args.stages:
+        for name, result in bench_model_load(args.model_repeat).items():
+            results[f"models/model_load/{name}"] = result
+    return results
+
+
+def metadata() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "embedding_model": settings.EMBEDDING_MODEL,
+        "embedding_backend": settings.EMBEDDING_BACKEND,
+        "spacy_model": settings.SPACY_MODEL,
+        "fast_mode": settings.ANALYSIS_FAST_MODE,
+    }
+
+
+def compare(baseline: Dict, current: Dict, max_regression: float) -> List[str]:
+    regressions = []
+    print(f"{'benchmark':<64} {'before':>10} {'after':>10} {'change':>8}")
+    for key in sorted(set(baseline) & set(current)):
+        before = baseline[key].get("median_ms")
+        after = current[key].get("median_ms")
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > max_regression:
+            regressions.append(key)
+            flag = "  slower"
+        print(f"{key:<64} {before:>10.2f} {after:>10.2f} {change:>+7.1f}%{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES))
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--batch-jobs", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--model-repeat", type=int, default=1)
+    parser.add_argument("--no-fixtures", action="store_true")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument("--max-regression", type=float, default=10.0)
+    args = parser.parse_args()
+    args.sizes = [size for size in args.sizes.split(",") if size]
+    args.stages = [stage for stage in args.stages.split(",") if stage]
+
+    report = {"meta": metadata(), "results": run_benchmarks(args)}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(
+            baseline["results"], report["results"], args.max_regression
+        )
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower by >{args.max_regression}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
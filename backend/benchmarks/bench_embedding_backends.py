@@ -0,0 +1,99 @@
+"""Compare the PyTorch and ONNX sentence-encoder backends.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_embedding_backends --texts 64 --quantize
+
+Reports encode latency for each backend and the cosine similarity between
+the PyTorch embeddings and every ONNX variant. Exits non-zero when an ONNX
+variant falls below ``--min-cosine`` (``--min-cosine-int8`` for int8), so it doubles as the parity check.
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_service import OnnxSentenceEncoder, get_sentence_encoder
+
+VOCABULARY = (
+    "python sql machine learning data analysis communication teamwork docker "
+    "kubernetes backend frontend api design testing cloud aws azure gcp "
+    "leadership agile scrum product stakeholder reporting statistics pipeline"
+).split()
+
+
+def synthetic_texts(count: int, words: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(VOCABULARY, k=words)) for _ in range(count)]
+
+
+def time_encode(encoder, texts, batch_size: int, repeat: int) -> float:
+    encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encoder.encode(texts, batch_size=batch_size)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def row_cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--texts", type=int, default=64)
+    parser.add_argument("--words", type=int, default=80)
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quantize", action="store_true", help="also run int8")
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    parser.add_argument("--min-cosine-int8", type=float, default=0.95)
+    parser.add_argument("--export-dir", default=None)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.texts, args.words)
+    export_dir = args.export_dir or tempfile.mkdtemp(prefix="onnx-export-")
+
+    encoders = {"torch": get_sentence_encoder(args.model, "torch")}
+    encoders["onnx-fp32"] = OnnxSentenceEncoder(args.model, export_dir)
+    if args.quantize:
+        encoders["onnx-int8"] = OnnxSentenceEncoder(
+            args.model, export_dir, quantize=True
+        )
+
+    reference = np.asarray(encoders["torch"].encode(texts, batch_size=args.batch_size))
+    results = {}
+    failed = False
+    for name, encoder in encoders.items():
+        results[name] = {
+            "ms_per_run": round(
+                time_encode(encoder, texts, args.batch_size, args.repeat), 2
+            )
+        }
+        if name != "torch":
+            cosines = row_cosines(
+                reference, encoder.encode(texts, batch_size=args.batch_size)
+            )
+            results[name]["min_cosine"] = round(float(cosines.min()), 5)
+            results[name]["mean_cosine"] = round(float(cosines.mean()), 5)
+            # int8 trades a little accuracy for speed, so it gets a looser bound
+            bound = args.min_cosine_int8 if name == "onnx-int8" else args.min_cosine
+            if cosines.min() < bound:
+                print(f"{name} embeddings diverge from PyTorch (< {bound})")
+                failed = True
+
+    print(json.dumps({"model": args.model, "texts": args.texts, **results}, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Embedding throughput under concurrent load, with and without micro-batching.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_embedding_batching --threads 16 --requests 128
+
+Every request embeds a CV/job pair, as the ``embeddings`` artifact does.
+``direct`` calls ``encode_documents`` from each thread, ``batched`` goes
+through a ``MicroBatcher`` set up like the one behind ``embed_documents``,
+once per ``--max-wait-ms`` value. Prints throughput, latency percentiles and
+the mean number of documents per forward pass as JSON.
+
+``--stand-in`` replaces the model with a sleep that allows one forward pass
+at a time (``--stand-in-ms`` per call plus 1 ms per text), so the batching
+itself can be measured without sentence-transformers or a model download.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from app.core.config import settings
+from app.services.embedding_service import encode_documents, get_sentence_encoder
+from app.utils.batching import MicroBatcher
+from benchmarks.bench_embedding_backends import synthetic_texts
+
+
+class StandInEncoder:
+    """Sleeps like a forward pass; one call at a time, as on a single device."""
+
+    def __init__(self, call_ms: float, text_ms: float = 1.0, dim: int = 768):
+        self.call_ms = call_ms
+        self.text_ms = text_ms
+        self.dim = dim
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: List[str]):
+        import numpy as np
+
+        with self._lock:
+            time.sleep((self.call_ms + self.text_ms * len(texts)) / 1000)
+        return np.zeros((len(texts), self.dim), dtype=np.float32)
+
+
+def run_load(
+    embed: Callable[[List[str]], object], pairs: List[List[str]], threads: int
+) -> Dict[str, float]:
+    def timed(pair: List[str]) -> float:
+        started = time.perf_counter()
+        embed(pair)
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        latencies = sorted(pool.map(timed, pairs))
+    elapsed = time.perf_counter() - started
+    return {
+        "documents_per_s": round(2 * len(pairs) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=128)
+    parser.add_argument("--words", type=int, default=80)
+    parser.add_argument("--max-items", type=int, default=64)
+    parser.add_argument("--max-wait-ms", default="2,5,10")
+    parser.add_argument(
+        "--stand-in", action="store_true", help="time a sleep instead of the model"
+    )
+    parser.add_argument("--stand-in-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(2 * args.requests, args.words)
+    pairs = [texts[i : i + 2] for i in range(0, len(texts), 2)]
+    if args.stand_in:
+        encode = StandInEncoder(args.stand_in_ms)
+    else:
+        encode = encode_documents
+        get_sentence_encoder()  # load outside of the timings
+        encode(pairs[0])
+
+    results = {"direct": run_load(encode, pairs, args.threads)}
+    for wait in args.max_wait_ms.split(","):
+        batcher = MicroBatcher(
+            encode, max_items=args.max_items, max_wait_ms=float(wait)
+        )
+        result = run_load(batcher, pairs, args.threads)
+        result["documents_per_pass"] = round(batcher.items / batcher.batches, 1)
+        results[f"batched_{wait}ms"] = result
+
+    print(
+        json.dumps(
+            {
+                "model": "stand-in" if args.stand_in else settings.EMBEDDING_MODEL,
+                "backend": "stand-in" if args.stand_in else settings.EMBEDDING_BACKEND,
+                "threads": args.threads,
+                "requests": args.requests,
+                **results,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Search latency of the memory-mapped job embedding matrix.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_job_matrix --jobs 20000 --dim 768
+
+Indexes ``--jobs`` random unit vectors into a temporary ``EmbeddingMatrix``
+per dtype and times a top-``--k`` search, i.e. one mat-vec over the mapped
+rows. ``lists`` is the baseline of job embeddings kept as Python lists (as in
+the ``document_features`` JSON column): they are converted to an array on
+every search. Prints build time, file size, p50 latency and the recall of
+float16 against float32 as JSON.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.utils.embedding_matrix import EmbeddingMatrix
+
+
+def timed(search: Callable[[np.ndarray], List], queries: np.ndarray) -> float:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(latencies), 3)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.jobs, args.dim)).astype(np.float32)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+    ids = list(range(1, args.jobs + 1))
+
+    lists = vectors.tolist()
+
+    def search_lists(query: np.ndarray) -> List:
+        matrix = np.asarray(lists, dtype=np.float32)
+        scores = matrix @ query / np.linalg.norm(matrix, axis=1)
+        return np.argsort(-scores)[: args.k].tolist()
+
+    results: Dict[str, Dict] = {
+        "lists": {"search_p50_ms": timed(search_lists, queries)}
+    }
+    top: Dict[str, List] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for dtype in ("float32", "float16"):
+            path = os.path.join(directory, dtype)
+            matrix = EmbeddingMatrix(path, dtype=dtype)
+            started = time.perf_counter()
+            for start in range(0, args.jobs, args.batch):
+                end = start + args.batch
+                matrix.put(ids[start:end], vectors[start:end])
+            build = time.perf_counter() - started
+
+            reader = EmbeddingMatrix(path, dtype=dtype, readonly=True)
+            top[dtype] = [
+                {job_id for job_id, _ in reader.search(query, args.k)}
+                for query in queries
+            ]
+            results[dtype] = {
+                "build_s": round(build, 2),
+                "file_mb": round(
+                    os.path.getsize(reader._data_path(reader.meta["generation"]))
+                    / 2**20,
+                    1,
+                ),
+                "search_p50_ms": timed(lambda q: reader.search(q, args.k), queries),
+            }
+
+    results["float16"]["recall_at_k"] = round(
+        statistics.mean(
+            len(low & full) / args.k
+            for low, full in zip(top["float16"], top["float32"])
+        ),
+        4,
+    )
+    print(
+        json.dumps(
+            {"jobs": args.jobs, "dim": args.dim, "k": args.k, **results}, indent=2
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
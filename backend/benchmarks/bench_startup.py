@@ -0,0 +1,146 @@
+"""Measure the cold import time of the API and guard it with a budget.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_startup --repeat 5 --budget-ms 2000
+
+Each sample imports ``--module`` (``app.main`` by default) in a fresh
+interpreter. Reports the median and max wall time, the slowest imports from
+``-X importtime`` and any heavy library that got loaded. Exits non-zero when
+the median exceeds ``--budget-ms`` or a heavy library is imported at startup,
+so it can run in CI next to the other checks.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Only the analysis paths need these, they must load on first use
+HEAVY_MODULES = (
+    "numpy",
+    "scipy",
+    "sklearn",
+    "spacy",
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "onnxruntime",
+    "textract",
+    "openai",
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+heavy = {heavy!r}
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "heavy": sorted(name for name in heavy if name in sys.modules),
+}}))
+"""
+
+
+def sample(module: str) -> Tuple[float, List[str], List[Tuple[int, str]]]:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            PROBE.format(module=module, heavy=HEAVY_MODULES),
+        ],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        errors = [
+            line
+            for line in completed.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        raise RuntimeError(errors[-1] if errors else "import failed")
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    imports = []
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports.append((int(cumulative), name.rstrip()))
+    return result["ms"], result["heavy"], imports
+
+
+def top_level(imports: List[Tuple[int, str]], count: int) -> List[Tuple[int, str]]:
+    # Names are indented by two spaces per nesting level, keep the first three
+    # levels so the list shows which of our modules pull in what
+    shallow = [
+        (cumulative, name.strip())
+        for cumulative, name in imports
+        if len(name) - len(name.lstrip()) <= 5
+    ]
+    return sorted(shallow, reverse=True)[:count]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2000.0)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    timings = []
+    heavy: Dict[str, int] = {}
+    imports: List[Tuple[int, str]] = []
+    for _ in range(args.repeat):
+        elapsed, loaded, imports = sample(args.module)
+        timings.append(elapsed)
+        for name in loaded:
+            heavy[name] = heavy.get(name, 0) + 1
+
+    median = statistics.median(timings)
+    print(
+        f"import {args.module}: median {median:.0f} ms, max {max(timings):.0f} ms "
+        f"over {args.repeat} runs (budget {args.budget_ms:.0f} ms)"
+    )
+    print("slowest imports (cumulative):")
+    for cumulative, name in top_level(imports, args.top):
+        print(f"  {cumulative / 1000:9.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "module": args.module,
+                    "timings_ms": timings,
+                    "median_ms": median,
+                    "budget_ms": args.budget_ms,
+                    "heavy_modules": sorted(heavy),
+                },
+                f,
+                indent=2,
+            )
+
+    failed = False
+    if heavy:
+        print(f"FAIL heavy modules imported at startup: {', '.join(sorted(heavy))}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL median {median:.0f} ms exceeds {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Smoke run of the analysis backfill CLI against a scratch SQLite database.
+
+Run from ``backend/``::
+
+    python -m benchmarks.check_analysis_backfill --analyses 5
+
+Seeds a CV (a one-page PDF), a job and ``--analyses`` unscored analysis
+rows, then runs ``python -m app.services.analysis_backfill`` twice in a
+fresh interpreter, as a user would. Only the lexical metrics are enabled, so
+no model is needed. The first run must recompute every row, the second must
+find them all fresh. Exits non-zero otherwise.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models import (
+    conversation,
+    assistant,
+    analysis,
+    cv,
+    job,
+    message,
+    run,
+    tool,
+    assessment,
+    precompute,
+    trace,
+)
+from app.models.analysis import AnalysisResult
+from app.models.assistant import Assistant
+from app.models.conversation import Conversation
+from app.models.cv import CV
+from app.models.job import Job
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+LEXICAL_METRICS = ["keyword_match", "jaccard_similarity", "cosine_similarity"]
+
+
+def minimal_pdf(text: str) -> bytes:
+    """A one-page PDF showing ``text``, enough for pdftotext."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return pdf
+
+
+def seed(database_url: str, workdir: str, analyses: int) -> None:
+    engine = create_engine(database_url)
+    # profiles uses ARRAY columns, which SQLite cannot create
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            table for name, table in Base.metadata.tables.items() if name != "profiles"
+        ],
+    )
+    cv_path = os.path.join(workdir, "cv.pdf")
+    Path(cv_path).write_bytes(minimal_pdf("python sql teamwork communication"))
+    with sessionmaker(bind=engine)() as db:
+        db.add(CV(filename="cv.pdf", filepath=cv_path))
+        db.add(Assistant(id="check", name="Check", model="-", instructions="-"))
+        db.add(
+            Job(title="Check", status="check", description="python sql", company="-")
+        )
+        db.commit()
+        for index in range(analyses):
+            db.add(
+                Conversation(
+                    id=f"check-{index}", cv_id=1, job_id=1, assistant_id="check"
+                )
+            )
+            db.add(AnalysisResult(cv_id=1, job_id=1, conversation_id=f"check-{index}"))
+        db.commit()
+
+
+def run_backfill(database_url: str, workdir: str) -> Dict:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "app.services.analysis_backfill",
+            "--workers",
+            "1",
+            "--checkpoint",
+            os.path.join(workdir, "checkpoint.json"),
+        ],
+        cwd=BACKEND_DIR,
+        env={
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "ANALYSIS_ENABLED_METRICS": json.dumps(LEXICAL_METRICS),
+            "TRACING_ENABLED": "false",
+        },
+        capture_output=True,
+        text=True,
+    )
+    output = completed.stdout
+    if completed.returncode or "\n{" not in output:
+        raise RuntimeError(
+            f"exit code {completed.returncode}:\n{output}{completed.stderr[-2000:]}"
+        )
+    return json.loads(output[output.index("\n{") :])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analyses", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = f"sqlite:///{os.path.join(workdir, 'check.db')}"
+        seed(database_url, workdir, args.analyses)
+
+        failures = 0
+        for label, expected in (
+            ("first run recomputes every analysis", {"processed": args.analyses}),
+            ("second run finds them fresh", {"processed": 0, "fresh": args.analyses}),
+        ):
+            try:
+                summary = run_backfill(database_url, workdir)
+                ok = all(summary.get(key) == value for key, value in expected.items())
+                detail = json.dumps(summary)
+            except RuntimeError as e:
+                ok, detail = False, str(e)
+            failures += not ok
+            print(f"[{'ok' if ok else 'FAIL'}] {label}")
+            if not ok:
+                print(f"    expected {expected}, got:\n    {detail}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""EXPLAIN-based regression check for the hot lookup paths.
+
+Run from ``backend/``::
+
+    python -m benchmarks.check_query_plans                      # SQLite
+    python -m benchmarks.check_query_plans --database-url postgresql://...
+
+Creates the schema from the models (use a scratch database), explains each
+hot query and fails when the planner no longer picks the expected index.
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import create_engine, select, text
+
+from app.models.base import Base
+from app.models import (
+    conversation,
+    assistant,
+    analysis,
+    cv,
+    job,
+    message,
+    run,
+    tool,
+    assessment,
+)
+from app.models.analysis import AnalysisResult
+from app.models.assistant import Assistant
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.run import Run
+from app.models.tool import Tool
+
+# (label, statement, index expected in the plan); SQLite names the index
+# backing a unique constraint sqlite_autoindex_<table>_<n>
+HOT_QUERIES = [
+    (
+        "analysis exists for cv/job/conversation",
+        select(AnalysisResult.id).where(
+            AnalysisResult.cv_id == 1,
+            AnalysisResult.job_id == 1,
+            AnalysisResult.conversation_id == "thread",
+        ),
+        ("uq_analysis_results_cv_job_conversation", "sqlite_autoindex_analysis"),
+    ),
+    (
+        "analyses for cv/job",
+        select(AnalysisResult.id).where(
+            AnalysisResult.cv_id == 1, AnalysisResult.job_id == 1
+        ),
+        ("uq_analysis_results_cv_job_conversation", "sqlite_autoindex_analysis"),
+    ),
+    (
+        "messages of a conversation by time",
+        select(Message)
+        .where(Message.conversation_id == "thread")
+        .order_by(Message.timestamp),
+        ("ix_messages_conversation_id_timestamp",),
+    ),
+    (
+        "runs of a conversation",
+        select(Run).where(Run.conversation_id == "thread"),
+        ("ix_runs_conversation_id",),
+    ),
+    (
+        "conversations for job/cv",
+        select(Conversation).where(Conversation.job_id == 1, Conversation.cv_id == 1),
+        ("ix_conversations_job_id_cv_id",),
+    ),
+    (
+        "tools of an assistant",
+        select(Tool).where(Tool.assistant_id == "assistant"),
+        ("ix_tools_assistant_id",),
+    ),
+    (
+        "assistant by name",
+        select(Assistant.id).where(Assistant.name == "Job Assistant"),
+        ("ix_assistants_name",),
+    ),
+]
+
+
+def explain(connection, statement) -> str:
+    compiled = statement.compile(
+        dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+    )
+    prefix = "EXPLAIN QUERY PLAN" if connection.dialect.name == "sqlite" else "EXPLAIN"
+    rows = connection.execute(text(f"{prefix} {compiled}")).fetchall()
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    # profiles uses ARRAY columns, which SQLite cannot create; it has no hot path
+    tables = [
+        table for name, table in Base.metadata.tables.items() if name != "profiles"
+    ]
+    Base.metadata.create_all(engine, tables=tables)
+
+    failures = 0
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # Empty tables make a sequential scan look free; force the
+            # planner to show which index it would use on real data
+            connection.execute(text("SET enable_seqscan = off"))
+        for label, statement, expected in HOT_QUERIES:
+            plan = explain(connection, statement)
+            ok = any(index in plan for index in expected)
+            failures += not ok
+            print(f"[{'ok' if ok else 'FAIL'}] {label}")
+            if not ok:
+                print(f"    expected one of {expected}, got:\n    {plan}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
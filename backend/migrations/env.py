@@ -17,6 +17,8 @@ from app.models import (
     tool,
     assessment,
     profile,
+    trace,
+    precompute,
 )
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,95 @@
+"""Add composite indexes for hot lookup paths
+
+Revision ID: 8f3d61a0c2be
+Revises: 5b2e9c41d7a3
+Create Date: 2026-10-19 10:03:17.540912
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f3d61a0c2be"
+down_revision: Union[str, None] = "5b2e9c41d7a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Collapse duplicate analyses onto the oldest row so the unique constraint
+    # can be created; assessments of a duplicate are re-pointed before it goes,
+    # the others are left alone.
+    op.execute(
+        """
+        UPDATE assessments
+        SET analysis_id = (
+            SELECT MIN(keep.id)
+            FROM analysis_results AS dup
+            JOIN analysis_results AS keep
+              ON keep.cv_id = dup.cv_id
+             AND keep.job_id = dup.job_id
+             AND keep.conversation_id = dup.conversation_id
+            WHERE dup.id = assessments.analysis_id
+        )
+        WHERE analysis_id IN (
+            SELECT id
+            FROM analysis_results
+            WHERE id NOT IN (
+                SELECT MIN(id)
+                FROM analysis_results
+                GROUP BY cv_id, job_id, conversation_id
+            )
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM analysis_results
+        WHERE id NOT IN (
+            SELECT MIN(id)
+            FROM analysis_results
+            GROUP BY cv_id, job_id, conversation_id
+        )
+        """
+    )
+    with op.batch_alter_table("analysis_results") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_analysis_results_cv_job_conversation",
+            ["cv_id", "job_id", "conversation_id"],
+        )
+
+    op.create_index(
+        "ix_messages_conversation_id_timestamp",
+        "messages",
+        ["conversation_id", "timestamp"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_runs_conversation_id"), "runs", ["conversation_id"], unique=False
+    )
+    op.create_index(
+        "ix_conversations_job_id_cv_id",
+        "conversations",
+        ["job_id", "cv_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_tools_assistant_id"), "tools", ["assistant_id"], unique=False
+    )
+    op.create_index(op.f("ix_assistants_name"), "assistants", ["name"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_assistants_name"), table_name="assistants")
+    op.drop_index(op.f("ix_tools_assistant_id"), table_name="tools")
+    op.drop_index("ix_conversations_job_id_cv_id", table_name="conversations")
+    op.drop_index(op.f("ix_runs_conversation_id"), table_name="runs")
+    op.drop_index("ix_messages_conversation_id_timestamp", table_name="messages")
+    with op.batch_alter_table("analysis_results") as batch_op:
+        batch_op.drop_constraint(
+            "uq_analysis_results_cv_job_conversation", type_="unique"
+        )
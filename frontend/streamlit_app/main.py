@@ -56,7 +56,10 @@ def get_analysis(cv_id: int, job_id: int):
 
 def get_jobs():
     try:
-        response = requests.get(f"{API_BASE_URL}/jobs/")
+        # Only what the selectboxes need, descriptions can be kilobytes each
+        response = requests.get(
+            f"{API_BASE_URL}/jobs/", params={"fields": "id,title,company"}
+        )
         if response.status_code == 200:
             return response.json()
         else:
@@ -67,6 +70,19 @@ def get_jobs():
         return []
 
 
+def get_quick_scores(cv_id: int):
+    try:
+        response = requests.get(f"{API_BASE_URL}/analysis/quick/{cv_id}")
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Failed to fetch match scores: {response.text}")
+            return []
+    except Exception as e:
+        st.error(f"An error occurred while fetching match scores: {e}")
+        return []
+
+
 def get_assistants():
     try:
         response = requests.get(f"{API_BASE_URL}/assistants/")
@@ -871,8 +887,32 @@ elif choice == "Job Management":
                 if not jobs:
                     st.info("No job postings available.")
                 else:
+                    quick_scores = {}
+                    cvs = get_cvs()
+                    if cvs:
+                        cv_options = {"None": None}
+                        for cv in cvs:
+                            cv_options[f"{cv['filename']} (ID: {cv['id']})"] = cv["id"]
+                        selected_cv = st.selectbox(
+                            "Instant match against CV", list(cv_options.keys())
+                        )
+                        if cv_options[selected_cv] is not None:
+                            quick_scores = {
+                                item["job_id"]: item
+                                for item in get_quick_scores(cv_options[selected_cv])
+                            }
+                            jobs.sort(
+                                key=lambda job: quick_scores.get(job["id"], {}).get(
+                                    "quick_score", 0
+                                ),
+                                reverse=True,
+                            )
                     for job in jobs:
                         st.markdown(f"### {job['title']}")
+                        if job["id"] in quick_scores:
+                            st.markdown(
+                                f"**Instant Match:** {quick_scores[job['id']]['quick_score']}%"
+                            )
                         st.markdown(f"**Company:** {job['company']}")
                         st.markdown(f"**Location:** {job.get('location', 'N/A')}")
                         st.markdown(f"**Description:** {job['description']}")